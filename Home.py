@@ -1,11 +1,20 @@
+import pandas as pd
 import streamlit as st
 
+from dados import aquecedor, telemetria
+
+pd.set_option('mode.copy_on_write', True)
+
 st.set_page_config(
     page_title="Painel Acadêmico Brasileiro",
     page_icon="🎓",
     layout="wide"
 )
 
+# Aquece o cache das consultas em segundo plano (uma vez por processo)
+aquecedor.iniciar_em_segundo_plano()
+telemetria.iniciar_servidor_metricas()
+
 st.markdown("""
 # 🎓 Painel Acadêmico Brasileiro
 
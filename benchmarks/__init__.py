@@ -0,0 +1,13 @@
+"""Benchmarks da camada de dados e das páginas, com respostas SPARQL gravadas
+
+Este pacote não importa ``dados`` ao ser carregado: ``benchmarks.executar``
+precisa configurar o ambiente (cache temporário, endpoint local) antes disso.
+"""
+
+import os
+
+# Respostas gravadas por ``benchmarks.gravar`` e servidas pelo endpoint local
+DIRETORIO_RESPOSTAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'respostas')
+
+# Consulta, chave e arquivo de cada resposta gravada
+ARQUIVO_INDICE = 'indice.json'
@@ -0,0 +1,181 @@
+"""Endpoint SPARQL local que responde com respostas gravadas
+
+Atende ``GET /sparql?query=...`` e ``POST /sparql`` (formulário com
+``query``) no formato ``application/sparql-results+json`` com a resposta
+gravada (por ``benchmarks.gravar``) para aquela consulta,
+identificada pelo texto normalizado, como no cache em disco. Consultas
+paginadas (``ORDER BY ... LIMIT n OFFSET m`` ao final) são respondidas a
+partir da gravação da consulta sem paginação.
+
+Com ``escala`` maior que 1, as respostas das tabelas de fatos são replicadas:
+a cópia ``k`` recebe o sufixo ``-k`` na coluna de entidade (quando há uma),
+de modo que o número de cursos distintos cresce junto com o de linhas.
+"""
+
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from dados.cache import chave
+
+from benchmarks import ARQUIVO_INDICE
+
+TIPO_INTEIRO = 'http://www.w3.org/2001/XMLSchema#integer'
+TIPO_DECIMAL = 'http://www.w3.org/2001/XMLSchema#double'
+
+_PAGINACAO = re.compile(
+    r'\s+ORDER\s+BY\s+(?P<ordem>.+?)\s+LIMIT\s+(?P<limite>\d+)\s+OFFSET\s+(?P<deslocamento>\d+)\s*$',
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def escalar(df, escala, entidade=None):
+    """Replica as linhas ``escala`` vezes, com sufixo na coluna de entidade"""
+    if escala <= 1:
+        return df
+    copias = []
+    for k in range(escala):
+        copia = df
+        if entidade is not None and k > 0:
+            copia = df.assign(**{entidade: df[entidade].astype('string') + f'-{k}'})
+        copias.append(copia)
+    return pd.concat(copias, ignore_index=True)
+
+
+def para_json(df):
+    """Resultado SPARQL em JSON: URIs, literais e números com o tipo XSD"""
+    colunas = []
+    for coluna in df.columns:
+        valores = df[coluna]
+        if pd.api.types.is_integer_dtype(valores):
+            termos = [{'type': 'literal', 'datatype': TIPO_INTEIRO, 'value': str(v)} for v in valores]
+        elif pd.api.types.is_float_dtype(valores):
+            termos = [None if np.isnan(v) else {'type': 'literal', 'datatype': TIPO_DECIMAL, 'value': repr(v)}
+                      for v in valores]
+        else:
+            termos = [
+                None if v is None or v is pd.NA or (isinstance(v, float) and np.isnan(v))
+                else {'type': 'uri' if str(v).startswith('http') else 'literal', 'value': str(v)}
+                for v in valores
+            ]
+        colunas.append(termos)
+
+    nomes = list(df.columns)
+    bindings = [
+        {nome: termo for nome, termo in zip(nomes, linha) if termo is not None}
+        for linha in zip(*colunas)
+    ]
+    return json.dumps({'head': {'vars': nomes}, 'results': {'bindings': bindings}}).encode('utf-8')
+
+
+class Respostas:
+    """Respostas gravadas em um diretório, já escaladas e serializadas sob demanda"""
+
+    def __init__(self, diretorio, escala=1):
+        self.diretorio = diretorio
+        self.escala = escala
+        with open(os.path.join(diretorio, ARQUIVO_INDICE), encoding='utf-8') as arquivo:
+            self._indice = {item['chave']: item for item in json.load(arquivo)}
+        self._tabelas = {}
+        self._lock = threading.Lock()
+
+    def _tabela(self, chave_consulta):
+        with self._lock:
+            item = self._tabelas.get((chave_consulta, self.escala))
+            if item is None:
+                gravado = self._indice[chave_consulta]
+                df = pd.read_parquet(os.path.join(self.diretorio, gravado['arquivo']))
+                if gravado['escalavel']:
+                    df = escalar(df, self.escala, gravado.get('entidade'))
+                # Só as tabelas da escala atual ficam em memória
+                self._tabelas = {c: v for c, v in self._tabelas.items() if c[1] == self.escala}
+                item = self._tabelas[(chave_consulta, self.escala)] = {'df': df, 'json': None, 'ordenadas': {}}
+            return item
+
+    def responder(self, sparql_query):
+        """Corpo da resposta JSON para a consulta; KeyError se não houver gravação"""
+        pagina = _PAGINACAO.search(sparql_query)
+        base = sparql_query[:pagina.start()] if pagina else sparql_query
+        item = self._tabela(chave(base, None))
+
+        if not pagina:
+            if item['json'] is None:
+                item['json'] = para_json(item['df'])
+            return item['json']
+
+        # Ordenada uma vez por ORDER BY; não vinculados primeiro, como no SPARQL
+        variaveis = [v.lstrip('?$') for v in pagina.group('ordem').split()]
+        ordenada = item['ordenadas'].get(tuple(variaveis))
+        if ordenada is None:
+            df = item['df']
+            presentes = [v for v in variaveis if v in df.columns]
+            ordenada = df.sort_values(presentes, na_position='first', kind='stable') if presentes else df
+            item['ordenadas'][tuple(variaveis)] = ordenada
+
+        inicio = int(pagina.group('deslocamento'))
+        return para_json(ordenada.iloc[inicio:inicio + int(pagina.group('limite'))])
+
+
+class _Tratador(BaseHTTPRequestHandler):
+    respostas = None
+
+    def do_GET(self):
+        self._responder(parse_qs(urlparse(self.path).query).get('query', [''])[0])
+
+    def do_POST(self):
+        tamanho = int(self.headers.get('Content-Length', 0))
+        corpo = self.rfile.read(tamanho).decode('utf-8')
+        self._responder(parse_qs(corpo).get('query', [''])[0])
+
+    def _responder(self, consulta):
+        try:
+            corpo = self.respostas.responder(consulta)
+        except KeyError:
+            self.send_error(404, 'Consulta sem resposta gravada')
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/sparql-results+json')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+class EndpointLocal:
+    """Servidor HTTP em segundo plano com as respostas de ``diretorio``"""
+
+    def __init__(self, diretorio, porta=0, escala=1):
+        self.respostas = Respostas(diretorio, escala)
+        tratador = type('Tratador', (_Tratador,), {'respostas': self.respostas})
+        self._servidor = ThreadingHTTPServer(('127.0.0.1', porta), tratador)
+        self._thread = None
+
+    @property
+    def url(self):
+        host, porta = self._servidor.server_address[:2]
+        return f'http://{host}:{porta}/sparql'
+
+    @property
+    def escala(self):
+        return self.respostas.escala
+
+    @escala.setter
+    def escala(self, valor):
+        self.respostas.escala = valor
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._servidor.serve_forever, daemon=True, name='endpoint-local')
+        self._thread.start()
+        return self
+
+    def __exit__(self, *excecao):
+        self._servidor.shutdown()
+        self._servidor.server_close()
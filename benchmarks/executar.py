@@ -0,0 +1,194 @@
+"""Executa os benchmarks com um endpoint SPARQL local e grava o resultado em JSON
+
+    python -m benchmarks.executar                               # escalas 1, 10 e 100
+    python -m benchmarks.executar --escalas 1 10 --repeticoes 3
+    python -m benchmarks.executar --comparar benchmarks/resultados/base.json
+    python -m benchmarks.executar --respostas benchmarks/respostas
+
+Por padrão as respostas são geradas por ``benchmarks.sinteticas`` (semente
+fixa, sem rede); com ``--respostas`` vêm de uma pasta gravada por
+``benchmarks.gravar``. Elas são servidas por ``benchmarks.endpoint`` e
+replicadas em cada escala. Para cada escala são medidas, nesta ordem:
+
+- ``busca``: tabelas base consultadas a frio (HTTP, JSON, junções, paginação)
+- ``transformacao``: agregações das páginas, incluindo o cubo de gênero
+- ``regioes``: classificação de universidades em regiões
+- ``pagina`` / ``pagina_primeira``: cada opção das páginas, com os gráficos
+
+O cache em disco (e as respostas sintéticas) ficam em uma pasta temporária,
+apagada ao final. Com
+``--comparar``, as etapas cuja mediana passou da tolerância em relação ao
+JSON anterior são listadas e o comando termina com código 1.
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+
+from benchmarks import ARQUIVO_INDICE
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRETORIO_RESULTADOS = os.path.join(RAIZ, 'benchmarks', 'resultados')
+
+ESCALAS = [1, 10, 100]
+REPETICOES = 5
+
+# Regressão: mediana acima de (1 + TOLERANCIA) x anterior e mais lenta que DIFERENCA_MINIMA_MS
+TOLERANCIA = 0.25
+DIFERENCA_MINIMA_MS = 5.0
+
+GRUPOS = ['buscas', 'transformacoes', 'regioes', 'paginas']
+
+
+def _porta_livre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _configurar_ambiente(porta):
+    """Cache temporário e consultas no endpoint local; precisa vir antes de importar ``dados``"""
+    diretorio_cache = tempfile.mkdtemp(prefix='dbacademic-benchmark-')
+    url = f'http://127.0.0.1:{porta}/sparql'
+    os.environ.update({
+        'DBACADEMIC_CACHE_DIR': diretorio_cache,
+        'DBACADEMIC_SPARQL_ENDPOINT': url,
+        'DBACADEMIC_DBPEDIA_ENDPOINT': url,
+        'DBACADEMIC_OFFLINE': '0',
+        'DBACADEMIC_AQUECEDOR': '0',
+    })
+    return diretorio_cache
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executar(respostas, escalas, repeticoes, grupos):
+    """Mede todos os grupos em cada escala e devolve o documento do resultado
+
+    ``respostas`` é a pasta gravada por ``benchmarks.gravar``; com None, as
+    respostas sintéticas são geradas antes da primeira escala.
+    """
+    porta = _porta_livre()
+    diretorio_cache = _configurar_ambiente(porta)
+    os.chdir(RAIZ)
+    sys.path.insert(0, RAIZ)
+
+    import pandas as pd
+    pd.set_option('mode.copy_on_write', True)
+
+    from benchmarks import medicoes, sinteticas
+    from benchmarks.endpoint import EndpointLocal
+
+    resultados = []
+    try:
+        pasta = respostas
+        if pasta is None:
+            pasta = os.path.join(diretorio_cache, 'respostas')
+            sinteticas.gerar(pasta)
+        with EndpointLocal(pasta, porta=porta) as endpoint:
+            for escala in escalas:
+                endpoint.escala = escala
+                medicoes.limpar_disco()
+                for grupo in grupos:
+                    logging.info("Escala %dx: %s", escala, grupo)
+                    resultados.extend(getattr(medicoes, grupo)(escala, repeticoes))
+    finally:
+        shutil.rmtree(diretorio_cache, ignore_errors=True)
+
+    return {
+        'criado_em': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'respostas': respostas or f'sinteticas-{sinteticas.SEMENTE}',
+        'escalas': escalas,
+        'repeticoes': repeticoes,
+        'resultados': resultados,
+    }
+
+
+def comparar(atual, anterior, tolerancia=TOLERANCIA, diferenca_minima=DIFERENCA_MINIMA_MS):
+    """Pares (atual, anterior) das etapas que ficaram mais lentas que a tolerância"""
+    base = {(r['etapa'], r['nome'], r['escala']): r for r in anterior['resultados']}
+    regressoes = []
+    for registro in atual['resultados']:
+        antes = base.get((registro['etapa'], registro['nome'], registro['escala']))
+        if antes is None:
+            continue
+        diferenca = registro['mediana_ms'] - antes['mediana_ms']
+        if registro['mediana_ms'] > antes['mediana_ms'] * (1 + tolerancia) and diferenca > diferenca_minima:
+            regressoes.append((registro, antes))
+    return regressoes
+
+
+def _imprimir(documento):
+    print(f"{'etapa':<16} {'nome':<58} {'escala':>6} {'linhas':>9} {'mediana ms':>11} {'mín ms':>9}")
+    for r in documento['resultados']:
+        linhas = '' if r['linhas'] is None else r['linhas']
+        print(f"{r['etapa']:<16} {r['nome'][:58]:<58} {r['escala']:>6} {linhas:>9} "
+              f"{r['mediana_ms']:>11.1f} {r['minimo_ms']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks da camada de dados e das páginas")
+    parser.add_argument('--respostas',
+                        help="pasta gravada por benchmarks.gravar (padrão: respostas sintéticas)")
+    parser.add_argument('--escalas', type=int, nargs='+', default=ESCALAS,
+                        help="fatores de replicação das tabelas de fatos (padrão: %(default)s)")
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES,
+                        help="execuções por etapa (padrão: %(default)s)")
+    parser.add_argument('--grupos', nargs='+', choices=GRUPOS, default=GRUPOS,
+                        help="grupos de etapas a medir (padrão: todos)")
+    parser.add_argument('--saida', help="arquivo JSON do resultado (padrão: benchmarks/resultados/<data>.json)")
+    parser.add_argument('--comparar', help="JSON de uma execução anterior, para apontar regressões")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA,
+                        help="aumento relativo da mediana aceito na comparação (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    if args.respostas and not os.path.exists(os.path.join(args.respostas, ARQUIVO_INDICE)):
+        parser.error(f"nenhuma resposta gravada em {args.respostas}; rode antes python -m benchmarks.gravar")
+
+    respostas = os.path.abspath(args.respostas) if args.respostas else None
+    documento = executar(respostas, args.escalas, args.repeticoes, args.grupos)
+
+    saida = args.saida or os.path.join(
+        DIRETORIO_RESULTADOS, f"{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as arquivo:
+        json.dump(documento, arquivo, ensure_ascii=False, indent=2)
+
+    _imprimir(documento)
+    print(f"\nResultado gravado em {saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            anterior = json.load(arquivo)
+        if anterior.get('respostas') != documento['respostas']:
+            print(f"Aviso: respostas diferentes ({anterior.get('respostas')} -> {documento['respostas']})")
+        regressoes = comparar(documento, anterior, args.tolerancia)
+        for atual, antes in regressoes:
+            print(f"REGRESSÃO {atual['etapa']} {atual['nome']} {atual['escala']}x: "
+                  f"{antes['mediana_ms']:.1f} ms -> {atual['mediana_ms']:.1f} ms")
+        if regressoes:
+            raise SystemExit(1)
+        print(f"Sem regressões em relação a {args.comparar}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Grava as respostas das consultas dos painéis para os benchmarks
+
+    python -m benchmarks.gravar                      # grava em benchmarks/respostas
+    python -m benchmarks.gravar --destino OUTRA/PASTA
+
+As consultas rodam pelo caminho normal da camada de dados: data.world,
+``DBACADEMIC_SPARQL_ENDPOINT`` ou o modo offline (``DBACADEMIC_OFFLINE=1``).
+Cada resposta é gravada em Parquet, e ``indice.json`` guarda a consulta, a
+chave e se a tabela é de fatos (replicada nas escalas maiores).
+
+Sem acesso ao dataset, ``benchmarks.sinteticas`` gera respostas no mesmo
+formato, e é com elas que ``benchmarks.executar`` roda por padrão.
+"""
+
+import argparse
+import json
+import logging
+import os
+
+from dados import cache
+from dados.cursos import SPARQL_FATOS_CURSOS
+from dados.dataset import executar_consulta
+from dados.dbpedia import SPARQL_UNIVERSIDADES, consultar_dbpedia, consultas_dbpedia
+from dados.docentes import SPARQL_FATOS_DOCENTES
+
+from benchmarks import ARQUIVO_INDICE, DIRETORIO_RESPOSTAS
+
+# Consulta, se é tabela de fatos e a coluna que identifica cada entidade
+CONSULTAS_DBACADEMIC = [
+    (SPARQL_FATOS_DOCENTES, True, None),
+    (SPARQL_FATOS_CURSOS, True, 'cursos'),
+    (SPARQL_UNIVERSIDADES, False, None),
+]
+
+logger = logging.getLogger(__name__)
+
+
+def guardar(destino, indice, sparql_query, df, escalavel, entidade=None):
+    """Grava a resposta de ``sparql_query`` em ``destino`` e a acrescenta ao índice"""
+    chave_consulta = cache.chave(sparql_query, None)
+    arquivo = f'{chave_consulta}.parquet'
+    df.to_parquet(os.path.join(destino, arquivo), index=False)
+    indice.append({
+        'chave': chave_consulta,
+        'arquivo': arquivo,
+        'consulta': cache.normalizar_sparql(sparql_query),
+        'escalavel': escalavel,
+        'entidade': entidade,
+        'linhas': len(df),
+    })
+    logger.info("%s: %d linhas", arquivo, len(df))
+    return df
+
+
+def gravar_indice(destino, indice):
+    with open(os.path.join(destino, ARQUIVO_INDICE), 'w', encoding='utf-8') as arquivo:
+        json.dump(indice, arquivo, ensure_ascii=False, indent=2)
+
+
+def gravar(destino=DIRETORIO_RESPOSTAS):
+    """Executa as consultas e grava as respostas em ``destino``"""
+    os.makedirs(destino, exist_ok=True)
+    indice = []
+
+    for sparql_query, escalavel, entidade in CONSULTAS_DBACADEMIC:
+        df = guardar(destino, indice, sparql_query, executar_consulta(sparql_query, usar_cache=False),
+                     escalavel, entidade)
+        if sparql_query is SPARQL_UNIVERSIDADES:
+            links = df
+
+    # As consultas ao DBpedia dependem das universidades encontradas
+    for sparql_query in consultas_dbpedia(links):
+        guardar(destino, indice, sparql_query, consultar_dbpedia(sparql_query), False)
+
+    gravar_indice(destino, indice)
+    return indice
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grava as respostas SPARQL usadas pelos benchmarks")
+    parser.add_argument('--destino', default=DIRETORIO_RESPOSTAS,
+                        help="pasta das respostas gravadas (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    indice = gravar(args.destino)
+    print(f"{len(indice)} respostas gravadas em {args.destino}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""Medições dos benchmarks
+
+Cada função mede um grupo de etapas em uma escala e devolve um registro por
+etapa, com mediana, mínimo e máximo em milissegundos. As cargas a frio
+descartam antes os resultados em memória e ignoram o cache em disco.
+"""
+
+import os
+import shutil
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from dados import busca, cache, cursos, docentes, paginacao
+from dados.dbpedia import construir_snapshot, get_universidades
+from dados.geografia import ESTADOS_BRASIL
+from dados.nomes_cursos import canonizar
+from dados.regioes import PALAVRAS_POR_REGIAO, ClassificadorRegiao, mapear_regioes_brasil
+from dados.rotulos import rotular_graus, rotular_sexos
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGINAS = ['pages/Docentes.py', 'pages/Cursos.py', 'Home.py']
+
+# Consulta usada para medir a busca por trecho
+CONSULTA_BUSCA = 'computacao'
+
+
+def _linhas(resultado):
+    if isinstance(resultado, (pd.DataFrame, pd.Series, np.ndarray)):
+        return len(resultado)
+    if isinstance(resultado, str) and resultado.endswith('.parquet'):
+        return pq.ParquetFile(resultado).metadata.num_rows
+    return None
+
+
+def medir(etapa, nome, escala, funcao, repeticoes, antes=None):
+    """Executa ``funcao`` ``repeticoes`` vezes e resume os tempos (``antes`` fica fora da medida)"""
+    tempos = []
+    resultado = None
+    for _ in range(repeticoes):
+        if antes is not None:
+            antes()
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+
+    return {
+        'etapa': etapa,
+        'nome': nome,
+        'escala': escala,
+        'linhas': _linhas(resultado),
+        'repeticoes': repeticoes,
+        'mediana_ms': round(statistics.median(tempos), 3),
+        'minimo_ms': round(min(tempos), 3),
+        'maximo_ms': round(max(tempos), 3),
+    }
+
+
+def limpar_disco():
+    """Apaga as respostas em disco (as da escala anterior teriam a mesma chave)"""
+    cache.limpar()
+    shutil.rmtree(paginacao.DIRETORIO_LISTAGENS, ignore_errors=True)
+
+
+def buscas(escala, repeticoes):
+    """Tabelas base consultadas a frio no endpoint local"""
+    def a_frio(funcao):
+        def executar():
+            with cache.ignorando_disco():
+                return funcao()
+        return executar
+
+    def sem_listagem():
+        cache.limpar_memoria()
+        shutil.rmtree(paginacao.DIRETORIO_LISTAGENS, ignore_errors=True)
+
+    # A dimensão de universidades tem medida própria; as demais já a encontram pronta
+    get_universidades()
+    return [
+        medir('busca', 'universidades_dbpedia', escala, a_frio(construir_snapshot), repeticoes),
+        medir('busca', 'fatos_docentes', escala, a_frio(docentes.get_fatos_docentes), repeticoes,
+              antes=cache.limpar_memoria),
+        medir('busca', 'fatos_cursos', escala, a_frio(cursos.get_fatos_cursos), repeticoes,
+              antes=cache.limpar_memoria),
+        medir('busca', 'listagem_cursos_paginada', escala, cursos.listagem_completa, repeticoes,
+              antes=sem_listagem),
+    ]
+
+
+def transformacoes(escala, repeticoes):
+    """Agregações derivadas das tabelas base, sem reaproveitar resultados memorizados"""
+    fatos_docentes = docentes.get_fatos_docentes()
+    fatos_cursos = cursos.get_fatos_cursos()
+    ranking = cursos.por_nome(fatos_cursos)
+    indice = busca.IndiceBusca(ranking['name'])
+
+    etapas = [
+        ('docentes.rotular_graus', lambda: rotular_graus(fatos_docentes['GrauFormacao'])),
+        ('docentes.rotular_sexos', lambda: rotular_sexos(fatos_docentes['Sexo'])),
+        ('docentes.por_estado', lambda: docentes.por_estado(fatos_docentes)),
+        ('docentes.por_grau', lambda: docentes.por_grau(fatos_docentes)),
+        ('docentes.por_estado_grau', lambda: docentes.por_estado_grau(fatos_docentes)),
+        ('docentes.por_estado_sexo', lambda: docentes.por_estado_sexo(fatos_docentes)),
+        ('docentes.cubo_estado_sexo', lambda: docentes.cubo_estado_sexo(fatos_docentes)),
+        ('cursos.canonizar', lambda: canonizar(fatos_cursos['name'])[0]),
+        ('cursos.quantidade', lambda: cursos.quantidade(fatos_cursos)),
+        ('cursos.por_universidade', lambda: cursos.por_universidade(fatos_cursos)),
+        ('cursos.por_nome', lambda: cursos.por_nome(fatos_cursos)),
+        ('cursos.familias_por_chave', lambda: cursos.familias_por_chave(fatos_cursos)),
+        ('cursos.engenharia_computacao', lambda: cursos.engenharia_computacao(fatos_cursos)),
+        ('cursos.engenharia_por_estados', lambda: cursos.engenharia_por_estados(fatos_cursos, ESTADOS_BRASIL)),
+        ('busca.indice', lambda: busca.IndiceBusca(ranking['name'])),
+    ]
+    # limpar_memoria também descarta os derivados intermediários (ex.: famílias)
+    registros = [
+        medir('transformacao', nome, escala, funcao, repeticoes, antes=cache.limpar_memoria)
+        for nome, funcao in etapas
+    ]
+    registros.append(medir('transformacao', 'busca.consulta', escala,
+                           lambda: indice.contem(CONSULTA_BUSCA), repeticoes,
+                           antes=indice.contem.cache_clear))
+    return registros
+
+
+def regioes(escala, repeticoes):
+    """Classificação de nomes de universidades em regiões, a frio e com memória"""
+    nomes = get_universidades()['Universidade'].dropna()
+    nomes = pd.concat(
+        [nomes] + [nomes + f' {k}' for k in range(1, escala)],
+        ignore_index=True
+    )
+    mapear_regioes_brasil(nomes)
+    return [
+        medir('regioes', 'classificar_a_frio', escala,
+              lambda: ClassificadorRegiao(PALAVRAS_POR_REGIAO).classificar_serie(nomes), repeticoes),
+        medir('regioes', 'mapear_regioes_brasil', escala,
+              lambda: mapear_regioes_brasil(nomes), repeticoes),
+    ]
+
+
+def paginas(escala, repeticoes):
+    """Cada opção das páginas: primeira execução e reruns (dados e gráficos)"""
+    from streamlit.testing.v1 import AppTest
+
+    registros = []
+    cache.limpar_memoria()
+    for arquivo in PAGINAS:
+        at = AppTest.from_file(os.path.join(RAIZ, arquivo), default_timeout=600)
+        registros.append(medir('pagina_primeira', arquivo, escala, at.run, 1))
+        opcoes = at.sidebar.radio[0].options if at.sidebar.radio else [None]
+
+        for opcao in opcoes:
+            nome = f'{arquivo}:{opcao}' if opcao else arquivo
+
+            def rerun(opcao=opcao, nome=nome):
+                if opcao is not None:
+                    at.sidebar.radio[0].set_value(opcao)
+                at.run()
+                if at.exception:
+                    raise RuntimeError(f"{nome}: {at.exception[0].value}")
+
+            registros.append(medir('pagina', nome, escala, rerun, repeticoes))
+    return registros
@@ -0,0 +1,167 @@
+"""Respostas sintéticas para os benchmarks, sem rede nem dataset
+
+    python -m benchmarks.sinteticas                      # grava em benchmarks/respostas
+    python -m benchmarks.sinteticas --destino OUTRA/PASTA --cursos 50000
+
+Gera as mesmas consultas gravadas por ``benchmarks.gravar`` (fatos de
+docentes e de cursos, universidades e os lotes do DBpedia), com o mesmo
+índice. Os valores vêm de um gerador com semente fixa: a mesma semente e os
+mesmos tamanhos produzem sempre as mesmas respostas, o que permite comparar
+execuções em máquinas diferentes e na integração contínua.
+
+As tabelas imitam o que os painéis encontram no dataset real: grafias
+diferentes do mesmo curso, cursos sem nome ou sem universidade, docentes sem
+grau ou sem sexo e universidades cujo estado só vem de ``dbp:state``.
+"""
+
+import argparse
+import logging
+import os
+import random
+
+import pandas as pd
+
+from dados.cursos import SPARQL_FATOS_CURSOS
+from dados.dbpedia import SPARQL_UNIVERSIDADES, TAMANHO_LOTE, consultas_dbpedia
+from dados.docentes import SPARQL_FATOS_DOCENTES
+from dados.geografia import ESTADOS_BRASIL
+from dados.rotulos import ROTULOS_GRAU
+
+from benchmarks import DIRETORIO_RESPOSTAS
+from benchmarks.gravar import guardar, gravar_indice
+
+SEMENTE = 20240501
+UNIVERSIDADES = 200
+CURSOS = 20000
+
+RECURSO = 'http://dbacademic.tech/resource'
+DBPEDIA = 'http://dbpedia.org/resource'
+
+# Grafias encontradas para o mesmo curso, como no dataset
+NOMES_CURSOS = [
+    'ENGENHARIA DE COMPUTAÇÃO', 'Engenharia da Computação', 'ENG. COMPUTACAO',
+    'Engenharia Civil', 'ENGENHARIA CIVIL', 'Engenharia Elétrica', 'Engenharia Eletrica',
+    'Engenharia Mecânica', 'Engenharia de Produção', 'Engenharia Química', 'Engenharia Ambiental',
+    'Ciência da Computação', 'CIENCIA DA COMPUTACAO', 'Sistemas de Informação',
+    'Análise e Desenvolvimento de Sistemas', 'Medicina', 'MEDICINA', 'Enfermagem', 'Odontologia',
+    'Direito', 'DIREITO', 'Administração', 'Ciências Contábeis', 'Economia', 'Pedagogia',
+    'Letras - Português', 'Licenciatura em Matemática', 'Física', 'Química', 'Ciências Biológicas',
+    'Agronomia', 'Zootecnia', 'Arquitetura e Urbanismo', 'Psicologia', 'História', 'Geografia',
+]
+
+TIPOS_UNIVERSIDADE = [
+    ('Universidade Federal de {estado}', 'Federal University of {estado}'),
+    ('Universidade Estadual de {estado}', 'State University of {estado}'),
+    ('Instituto Federal de {estado}', 'Federal Institute of {estado}'),
+    ('Universidade Tecnológica de {estado}', 'Technological University of {estado}'),
+]
+
+SEXOS = ['M', 'F', None]
+
+
+def _recurso_dbpedia(nome):
+    return f"{DBPEDIA}/{nome.replace(' ', '_')}"
+
+
+def tabela_universidades(aleatorio, quantidade):
+    """Ligações DbAcademic → DBpedia e as linhas que o DBpedia devolve para cada uma"""
+    links, dbpedia = [], []
+    for i in range(quantidade):
+        estado = ESTADOS_BRASIL[i % len(ESTADOS_BRASIL)]
+        nome_pt, nome_en = TIPOS_UNIVERSIDADE[(i // len(ESTADOS_BRASIL)) % len(TIPOS_UNIVERSIDADE)]
+        numero = i // (len(ESTADOS_BRASIL) * len(TIPOS_UNIVERSIDADE))
+        sufixo = f' {numero + 1}' if numero else ''
+        url_eng = _recurso_dbpedia(nome_en.format(estado=estado) + sufixo)
+        links.append({'url_pt': f'{RECURSO}/universidade/{i}', 'url_eng': url_eng})
+
+        nome = (nome_pt if aleatorio.random() < 0.5 else nome_en).format(estado=estado) + sufixo
+        sorteio = aleatorio.random()
+        if sorteio < 0.8:
+            # Estado por dbo:state, às vezes também por dbp:state
+            dbp = _recurso_dbpedia(estado) if sorteio < 0.2 else None
+            dbpedia.append({'url_eng': url_eng, 'Universidade': nome, 'Estado': estado, 'estado_dbp': dbp})
+        elif sorteio < 0.95:
+            # Só dbp:state, como literal ou recurso
+            dbp = f'State of {estado}' if sorteio < 0.9 else _recurso_dbpedia(estado)
+            dbpedia.append({'url_eng': url_eng, 'Universidade': nome, 'Estado': None, 'estado_dbp': dbp})
+        else:
+            dbpedia.append({'url_eng': url_eng, 'Universidade': nome, 'Estado': None, 'estado_dbp': None})
+
+    colunas = ['url_eng', 'Universidade', 'Estado', 'estado_dbp']
+    return pd.DataFrame(links), pd.DataFrame(dbpedia, columns=colunas)
+
+
+def tabela_cursos(aleatorio, quantidade, links):
+    """Um curso por linha, com nome e universidade (ambos opcionais)"""
+    urls = links['url_pt'].tolist()
+    linhas = []
+    for i in range(quantidade):
+        sorteio = aleatorio.random()
+        nome = None if sorteio < 0.01 else aleatorio.choice(NOMES_CURSOS)
+        universidade = None if 0.01 <= sorteio < 0.03 else aleatorio.choice(urls)
+        linhas.append({'cursos': f'{RECURSO}/curso/{i}', 'name': nome, 'u': universidade})
+    return pd.DataFrame(linhas, columns=['cursos', 'name', 'u'])
+
+
+def tabela_docentes(aleatorio, links):
+    """Docentes por combinação de universidades, graus e sexos (listas vazias inclusas)
+
+    Quase todas as combinações têm uma universidade e um grau; algumas têm
+    duas universidades ou dois graus, como docentes com mais de um vínculo.
+    """
+    urls = links['url_pt'].tolist()
+    graus = list(ROTULOS_GRAU)
+    linhas = []
+    for universidade in urls + ['']:
+        for grau in graus + ['']:
+            for sexo in SEXOS:
+                if aleatorio.random() < 0.85:
+                    linhas.append((universidade, grau, sexo or '', aleatorio.randint(1, 400)))
+        if universidade and aleatorio.random() < 0.3:
+            outra = aleatorio.choice([url for url in urls if url != universidade])
+            linhas.append((f'{universidade} {outra}', aleatorio.choice(graus), aleatorio.choice(SEXOS) or '',
+                           aleatorio.randint(1, 20)))
+            linhas.append((universidade, ' '.join(aleatorio.sample(graus, 2)), aleatorio.choice(SEXOS) or '',
+                           aleatorio.randint(1, 20)))
+    return pd.DataFrame(linhas, columns=['Universidades', 'Graus', 'Sexos', 'Docentes'])
+
+
+def gerar(destino=DIRETORIO_RESPOSTAS, universidades=UNIVERSIDADES, cursos=CURSOS, semente=SEMENTE):
+    """Gera as respostas e as grava em ``destino``, no formato de ``benchmarks.gravar``"""
+    os.makedirs(destino, exist_ok=True)
+    aleatorio = random.Random(semente)
+    indice = []
+
+    links, dbpedia = tabela_universidades(aleatorio, universidades)
+    guardar(destino, indice, SPARQL_FATOS_DOCENTES, tabela_docentes(aleatorio, links), True)
+    guardar(destino, indice, SPARQL_FATOS_CURSOS, tabela_cursos(aleatorio, cursos, links), True, 'cursos')
+    guardar(destino, indice, SPARQL_UNIVERSIDADES, links, False)
+
+    # Os lotes seguem a divisão de consultas_dbpedia: TAMANHO_LOTE URLs, na ordem das ligações
+    for i, sparql_query in enumerate(consultas_dbpedia(links)):
+        lote = dbpedia.iloc[i * TAMANHO_LOTE:(i + 1) * TAMANHO_LOTE].reset_index(drop=True)
+        guardar(destino, indice, sparql_query, lote, False)
+
+    gravar_indice(destino, indice)
+    return indice
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera respostas SPARQL sintéticas para os benchmarks")
+    parser.add_argument('--destino', default=DIRETORIO_RESPOSTAS,
+                        help="pasta das respostas (padrão: %(default)s)")
+    parser.add_argument('--universidades', type=int, default=UNIVERSIDADES,
+                        help="número de universidades (padrão: %(default)s)")
+    parser.add_argument('--cursos', type=int, default=CURSOS,
+                        help="número de cursos (padrão: %(default)s)")
+    parser.add_argument('--semente', type=int, default=SEMENTE,
+                        help="semente do gerador (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    indice = gerar(args.destino, args.universidades, args.cursos, args.semente)
+    print(f"{len(indice)} respostas geradas em {args.destino}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+"""Camada de acesso aos dados do DbAcademic compartilhada pelas páginas"""
+
+from dados import cache
+from dados.dataset import DATASET_ID, executar_consulta, garantir_dataset, versao_dataset
+from dados.dbpedia import get_universidades, juntar_universidades
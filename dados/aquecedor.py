@@ -0,0 +1,147 @@
+"""Aquecimento do cache fora do caminho das requisições
+
+Executa todas as consultas usadas pelos painéis na inicialização e depois
+periodicamente, para que nenhum visitante precise esperar por uma consulta
+SPARQL. A partir da segunda passagem, os resultados em memória são
+revalidados antes de as agregações serem recalculadas: no data.world, só
+voltam ao endpoint quando a versão do dataset mudou (senão vêm do cache em
+disco); com ``DBACADEMIC_SPARQL_ENDPOINT``, que não informa versão, sempre.
+Pode rodar como thread em segundo plano (iniciada pelo ``Home.py``) ou pela
+linha de comando::
+
+    python -m dados.aquecedor            # aquece e repete a cada intervalo
+    python -m dados.aquecedor --uma-vez  # aquece uma vez e termina
+"""
+
+import argparse
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+
+from dados import cache, cursos, docentes
+from dados.dataset import fonte_consultas, versao_dataset
+from dados.dbpedia import get_universidades
+from dados.executor import executar_em_paralelo
+from dados.geografia import ESTADOS_BRASIL
+
+# Intervalo (em segundos) entre dois aquecimentos. Cada passagem depois da
+# primeira revalida as tabelas em memória, então os visitantes veem dados com
+# no máximo INTERVALO segundos, sem depender de IDADE_MAXIMA
+INTERVALO = int(os.environ.get('DBACADEMIC_INTERVALO_AQUECIMENTO', 1800))
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_thread = None
+_versao_aquecida = None
+
+
+def _tarefas():
+    """Pares (nome, função) com todas as consultas dos painéis"""
+    tarefas = [
+        ('universidades', get_universidades),
+        ('fatos_docentes', docentes.get_fatos_docentes),
+        ('docentes_por_estado', lambda: docentes.por_estado(docentes.get_fatos_docentes())),
+        ('docentes_por_grau', lambda: docentes.por_grau(docentes.get_fatos_docentes())),
+        ('docentes_por_estado_grau', lambda: docentes.por_estado_grau(docentes.get_fatos_docentes())),
+        ('docentes_por_estado_sexo', lambda: docentes.por_estado_sexo(docentes.get_fatos_docentes())),
+        ('docentes_cubo_estado_sexo', lambda: docentes.cubo_estado_sexo(docentes.get_fatos_docentes())),
+        ('fatos_cursos', cursos.get_fatos_cursos),
+        ('quantidade_cursos', lambda: cursos.quantidade(cursos.get_fatos_cursos())),
+        ('cursos_por_universidade', lambda: cursos.por_universidade(cursos.get_fatos_cursos())),
+        ('cursos_por_nome', lambda: cursos.por_nome(cursos.get_fatos_cursos())),
+        ('engenharia_computacao', lambda: cursos.engenharia_computacao(cursos.get_fatos_cursos())),
+        ('listagem_cursos', cursos.listagem_completa),
+        ('engenharia_por_estados', lambda: cursos.engenharia_por_estados(cursos.get_fatos_cursos(), ESTADOS_BRASIL)),
+    ]
+    return tarefas
+
+
+def aquecer(revalidar=False):
+    """Executa todas as consultas; uma falha não interrompe as demais
+
+    Com ``revalidar=True`` as tabelas já em memória são carregadas de novo
+    antes das agregações; sem isso elas seriam servidas da memória até passar
+    de ``cache.IDADE_MAXIMA``. O disco só é ignorado quando a versão do
+    dataset mudou desde a última passagem, é desconhecida ou não existe
+    (endpoint configurado).
+    """
+    global _versao_aquecida
+
+    falhas = 0
+    inicio = time.monotonic()
+    versao = versao_dataset()
+
+    if revalidar:
+        ignorar_disco = (fonte_consultas() == 'endpoint' or versao is None
+                         or versao != _versao_aquecida)
+        cache.revalidar_todos(esperar=True, ignorar_disco=ignorar_disco)
+    _versao_aquecida = versao
+
+    # As tabelas base são independentes e vão juntas para o endpoint
+    try:
+        executar_em_paralelo([get_universidades, docentes.get_fatos_docentes, cursos.get_fatos_cursos])
+    except Exception:
+        logger.exception("Falha ao carregar as tabelas base")
+
+    for nome, tarefa in _tarefas():
+        try:
+            tarefa()
+        except Exception:
+            falhas += 1
+            logger.exception("Falha ao aquecer %s", nome)
+    logger.info("Cache aquecido em %.1fs (%d falhas)", time.monotonic() - inicio, falhas)
+    return falhas
+
+
+def _laco(intervalo):
+    aquecer()
+    while True:
+        time.sleep(intervalo)
+        aquecer(revalidar=True)
+
+
+def iniciar_em_segundo_plano(intervalo=INTERVALO):
+    """Inicia, uma única vez por processo, a thread que aquece o cache"""
+    global _thread
+
+    if os.environ.get('DBACADEMIC_AQUECEDOR', '1') == '0':
+        return
+
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _thread = threading.Thread(target=_laco, args=(intervalo,), daemon=True, name='aquecedor')
+        _thread.start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aquece o cache das consultas dos painéis")
+    parser.add_argument('--uma-vez', action='store_true', help="aquece uma vez e termina")
+    parser.add_argument('--forcar', action='store_true',
+                        help="consulta o endpoint mesmo com resultados válidos em disco")
+    parser.add_argument('--intervalo', type=int, default=INTERVALO,
+                        help="segundos entre dois aquecimentos (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    pd.set_option('mode.copy_on_write', True)
+
+    if args.forcar:
+        with cache.ignorando_disco():
+            falhas = aquecer()
+    else:
+        falhas = aquecer()
+    if args.uma_vez:
+        raise SystemExit(1 if falhas else 0)
+
+    while True:
+        time.sleep(args.intervalo)
+        aquecer(revalidar=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Busca por trecho de texto, sem diferenciar maiúsculas nem acentos
+
+``indice_busca`` monta, uma vez por versão da tabela, um índice invertido de
+trigramas sobre os valores distintos de uma coluna. Uma consulta cruza as
+listas dos seus trigramas, confirma os candidatos com uma comparação de
+substring e devolve uma máscara sobre as linhas da tabela, na ordem dela.
+"""
+
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from dados.cache import derivado
+from dados.texto import sem_acentos
+
+TAMANHO_NGRAMA = 3
+
+# Abaixo deste número de candidatos é mais barato conferir a substring
+# do que cruzar mais listas
+CANDIDATOS_CONFERIDOS = 256
+
+# Máscaras guardadas por índice: os reruns repetem a mesma consulta
+CONSULTAS_EM_CACHE = 128
+
+
+def _ngramas(texto):
+    return {texto[i:i + TAMANHO_NGRAMA] for i in range(len(texto) - TAMANHO_NGRAMA + 1)}
+
+
+class IndiceBusca:
+    """Índice de trigramas sobre os valores de uma coluna de textos"""
+
+    def __init__(self, textos):
+        # Cada valor distinto é normalizado e indexado uma única vez
+        self._codigos, distintos = pd.factorize(textos)
+        self._textos = [sem_acentos(texto) for texto in distintos]
+
+        listas = defaultdict(list)
+        for posicao, texto in enumerate(self._textos):
+            for ngrama in _ngramas(texto):
+                listas[ngrama].append(posicao)
+        self._listas = {ngrama: np.array(posicoes, dtype=np.int32) for ngrama, posicoes in listas.items()}
+        self.contem = lru_cache(maxsize=CONSULTAS_EM_CACHE)(self._contem)
+
+    def _distintos(self, consulta):
+        """Posições dos valores distintos que contêm a consulta normalizada"""
+        ngramas = _ngramas(consulta)
+        if not ngramas:
+            # Consulta mais curta que um trigrama: comparação direta
+            return [p for p, texto in enumerate(self._textos) if consulta in texto]
+
+        listas = [self._listas.get(ngrama) for ngrama in ngramas]
+        if any(lista is None for lista in listas):
+            return []
+
+        # Interseção a partir da lista mais curta, marcando as demais em um
+        # vetor, até sobrarem poucos candidatos para conferir um a um
+        listas.sort(key=len)
+        candidatos = listas[0]
+        marcados = np.zeros(len(self._textos), dtype=bool)
+        for lista in listas[1:]:
+            if len(candidatos) <= CANDIDATOS_CONFERIDOS:
+                break
+            marcados[lista] = True
+            candidatos = candidatos[marcados[candidatos]]
+            marcados[lista] = False
+
+        # Os trigramas podem estar fora de ordem; a substring confirma
+        if len(consulta) == TAMANHO_NGRAMA:
+            return candidatos
+        textos = self._textos
+        return [p for p in candidatos.tolist() if consulta in textos[p]]
+
+    def _contem(self, consulta):
+        """Máscara booleana (somente leitura) das linhas cujo texto contém ``consulta``"""
+        consulta = sem_acentos(consulta)
+        if not consulta:
+            mascara = self._codigos >= 0
+        else:
+            encontrados = np.zeros(len(self._textos) + 1, dtype=bool)
+            encontrados[self._distintos(consulta)] = True
+            # Valores nulos têm código -1 e caem na última posição, sempre False
+            mascara = encontrados[self._codigos]
+        mascara.flags.writeable = False
+        return mascara
+
+
+@derivado
+def indice_busca(df, coluna):
+    """Índice de busca da ``coluna`` de ``df``, memorizado por versão da tabela"""
+    return IndiceBusca(df[coluna])
@@ -0,0 +1,343 @@
+"""Cache dos resultados das consultas SPARQL
+
+Cada resultado é gravado em Parquet, com chave formada pelo texto
+normalizado da consulta e pela versão do dataset. O cache sobrevive a
+reinícios do Streamlit, expira entradas mais velhas que ``TTL`` e remove
+as menos usadas recentemente quando passa de ``TAMANHO_MAXIMO`` bytes.
+
+Em memória, ``servir_e_revalidar`` mantém o último resultado válido de cada
+função: depois de ``IDADE_MAXIMA`` ele continua sendo servido enquanto uma
+thread em segundo plano busca a versão nova, que substitui a antiga de uma
+só vez. Se a atualização falhar, o resultado anterior permanece.
+
+Resultados derivados dessas tabelas (agregações, pivôs, colunas
+calculadas) ficam em memória com ``derivado``, com chave na própria tabela
+de origem e nos parâmetros. Quando a tabela é substituída por uma versão
+nova, os derivados da anterior deixam de valer e são descartados.
+"""
+
+import contextlib
+import functools
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+import weakref
+
+import pandas as pd
+
+from dados import telemetria
+from dados.config import DIRETORIO_CACHE
+
+DIRETORIO_CONSULTAS = os.path.join(DIRETORIO_CACHE, 'consultas')
+
+# Validade (em segundos) de uma entrada, mesmo sem mudança de versão
+TTL = int(os.environ.get('DBACADEMIC_CACHE_TTL', 24 * 3600))
+
+# Tamanho máximo (em bytes) ocupado pelo cache em disco
+TAMANHO_MAXIMO = int(os.environ.get('DBACADEMIC_CACHE_TAMANHO', 500 * 1024 * 1024))
+
+# Idade (em segundos) a partir da qual um resultado em memória é revalidado
+IDADE_MAXIMA = int(os.environ.get('DBACADEMIC_IDADE_MAXIMA', 3600))
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def normalizar_sparql(sparql_query):
+    """Remove diferenças de espaçamento que não mudam o resultado da consulta"""
+    return re.sub(r'\s+', ' ', sparql_query).strip()
+
+
+def chave(sparql_query, versao):
+    """Chave da entrada: hash da versão do dataset com a consulta normalizada"""
+    texto = f"{versao or 'desconhecida'}\n{normalizar_sparql(sparql_query)}"
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+@contextlib.contextmanager
+def ignorando_disco():
+    """Executa o bloco consultando o endpoint mesmo com resultado válido em disco"""
+    anterior = getattr(_local, 'ignorar_disco', False)
+    _local.ignorar_disco = True
+    try:
+        yield
+    finally:
+        _local.ignorar_disco = anterior
+
+
+def disco_ignorado():
+    """Se a thread atual está dentro de ``ignorando_disco``"""
+    return getattr(_local, 'ignorar_disco', False)
+
+
+@contextlib.contextmanager
+def segurando_carga():
+    """Marca a thread como dona de uma carga que outras threads podem estar esperando
+
+    Enquanto a marca estiver ativa, ``executor.executar_em_paralelo`` roda as
+    chamadas na própria thread: as tarefas do pool podem estar bloqueadas
+    esperando justamente esta carga, e esperar por elas travaria o processo.
+    """
+    _local.cargas = getattr(_local, 'cargas', 0) + 1
+    try:
+        yield
+    finally:
+        _local.cargas -= 1
+
+
+def carga_em_andamento():
+    """Se a thread atual está dentro de ``segurando_carga``"""
+    return getattr(_local, 'cargas', 0) > 0
+
+
+def _caminho(sparql_query, versao):
+    return os.path.join(DIRETORIO_CONSULTAS, f"{chave(sparql_query, versao)}.parquet")
+
+
+def ler(sparql_query, versao):
+    """Resultado em cache, ou None se ausente ou expirado"""
+    if disco_ignorado():
+        return None
+
+    caminho = _caminho(sparql_query, versao)
+    try:
+        criado_em = os.path.getmtime(caminho)
+        if time.time() - criado_em > TTL:
+            os.remove(caminho)
+            return None
+        df = pd.read_parquet(caminho)
+        # atime marca o último acesso (LRU); mtime continua sendo a criação
+        os.utime(caminho, (time.time(), criado_em))
+        telemetria.anotar(idade=time.time() - criado_em, bytes=os.path.getsize(caminho))
+        return df
+    except (OSError, ValueError):
+        return None
+
+
+def gravar(sparql_query, versao, df):
+    """Grava o resultado no cache e aplica o limite de tamanho"""
+    caminho = _caminho(sparql_query, versao)
+    temporario = f"{caminho}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(DIRETORIO_CONSULTAS, exist_ok=True)
+        df.to_parquet(temporario, index=False)
+        os.replace(temporario, caminho)
+        _remover_excedente()
+    except Exception:
+        # Falhar em gravar o cache não deve impedir o uso do resultado
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+
+def _remover_excedente():
+    """Remove as entradas menos usadas até caber em TAMANHO_MAXIMO"""
+    with _lock:
+        entradas = []
+        for entrada in os.scandir(DIRETORIO_CONSULTAS):
+            if entrada.name.endswith('.parquet'):
+                info = entrada.stat()
+                entradas.append((info.st_atime, info.st_size, entrada.path))
+
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        for _, tamanho, caminho in sorted(entradas):
+            if total <= TAMANHO_MAXIMO:
+                break
+            try:
+                os.remove(caminho)
+            except OSError:
+                continue
+            total -= tamanho
+
+
+def limpar():
+    """Apaga todas as entradas do cache em disco"""
+    with _lock:
+        if not os.path.isdir(DIRETORIO_CONSULTAS):
+            return
+        for entrada in os.scandir(DIRETORIO_CONSULTAS):
+            try:
+                os.remove(entrada.path)
+            except OSError:
+                pass
+
+
+class _Entrada:
+    """Último resultado de uma chamada e como obtê-lo de novo"""
+
+    def __init__(self, funcao, args, kwargs):
+        self.funcao = funcao
+        self.args = args
+        self.kwargs = kwargs
+        self.valor = None
+        self.atualizado_em = None
+        self.atualizando = False
+        self.carregando = threading.Lock()
+
+
+_entradas = {}
+_lock_entradas = threading.Lock()
+
+
+def _revalidar(entrada, ignorar_disco=True):
+    """Recalcula a entrada (por padrão ignorando o cache em disco) e troca o valor"""
+    try:
+        with ignorando_disco() if ignorar_disco else contextlib.nullcontext():
+            valor = entrada.funcao(*entrada.args, **entrada.kwargs)
+    except Exception:
+        logger.exception("Falha ao atualizar %s; mantendo o resultado anterior",
+                         entrada.funcao.__qualname__)
+        with _lock_entradas:
+            entrada.atualizando = False
+        return
+
+    with _lock_entradas:
+        entrada.valor = valor
+        entrada.atualizado_em = time.time()
+        entrada.atualizando = False
+
+
+def _agendar_revalidacao(entrada):
+    """Inicia a atualização em segundo plano, se ainda não houver uma"""
+    if entrada.atualizando or entrada.atualizado_em is None:
+        return
+    entrada.atualizando = True
+    threading.Thread(target=_revalidar, args=(entrada,), daemon=True).start()
+
+
+def servir_e_revalidar(funcao):
+    """Decorador que serve o último resultado válido e atualiza em segundo plano"""
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        chave_entrada = (funcao.__module__, funcao.__qualname__, args, tuple(sorted(kwargs.items())))
+
+        inicio = time.perf_counter()
+        idade = None
+        with _lock_entradas:
+            entrada = _entradas.get(chave_entrada)
+            if entrada is None:
+                entrada = _entradas[chave_entrada] = _Entrada(funcao, args, kwargs)
+            if entrada.atualizado_em is not None:
+                idade = time.time() - entrada.atualizado_em
+                if idade > IDADE_MAXIMA:
+                    _agendar_revalidacao(entrada)
+                valor = entrada.valor
+        if idade is not None:
+            telemetria.registrar('memoria', funcao.__qualname__, time.perf_counter() - inicio,
+                                 linhas=telemetria.linhas_de(valor), cache='acerto', idade=idade)
+            return valor
+
+        # Primeira carga: bloqueia, mas só uma thread consulta o endpoint
+        with telemetria.medir('memoria', funcao.__qualname__) as evento, entrada.carregando:
+            if entrada.atualizado_em is None:
+                evento['cache'] = 'falha'
+                with segurando_carga():
+                    valor = funcao(*args, **kwargs)
+                with _lock_entradas:
+                    entrada.valor = valor
+                    entrada.atualizado_em = time.time()
+            else:
+                evento['cache'] = 'acerto'
+            evento['linhas'] = telemetria.linhas_de(entrada.valor)
+        return entrada.valor
+
+    return envoltorio
+
+
+def revalidar_todos(esperar=False, ignorar_disco=True):
+    """Atualiza todos os resultados em memória, sem esperar ``IDADE_MAXIMA``
+
+    Por padrão a atualização roda em segundo plano; com ``esperar=True`` roda
+    na thread atual e termina antes de retornar. Com ``ignorar_disco=False``
+    as consultas passam pelo cache em disco, que só se renova quando a versão
+    do dataset muda ou a entrada expira.
+    """
+    if not esperar:
+        with _lock_entradas:
+            for entrada in _entradas.values():
+                _agendar_revalidacao(entrada)
+        return
+
+    with _lock_entradas:
+        pendentes = [e for e in _entradas.values() if not e.atualizando and e.atualizado_em is not None]
+        for entrada in pendentes:
+            entrada.atualizando = True
+    for entrada in pendentes:
+        _revalidar(entrada, ignorar_disco)
+
+
+_derivados = {}
+_lock_derivados = threading.Lock()
+
+# Referências de tabelas já coletadas. O callback do weakref pode rodar no
+# meio de qualquer alocação, inclusive com o lock tomado, então só anota
+# aqui; a limpeza acontece na próxima chamada.
+_descartadas = []
+
+
+def _congelar(valor):
+    """Versão hashável de um parâmetro (listas viram tuplas)"""
+    if isinstance(valor, (list, tuple)):
+        return tuple(_congelar(v) for v in valor)
+    return valor
+
+
+def _remover_descartadas():
+    """Remove os derivados de tabelas que não existem mais (com o lock tomado)"""
+    while _descartadas:
+        referencia = _descartadas.pop()
+        for chave_derivado in [c for c, (r, _) in _derivados.items() if r is referencia]:
+            del _derivados[chave_derivado]
+
+
+def derivado(funcao):
+    """Decorador que memoriza ``funcao(tabela, *parametros)`` por versão da tabela
+
+    A versão é a identidade do objeto ``tabela``: enquanto a mesma tabela
+    for passada, o resultado é reaproveitado entre reruns e sessões. O
+    resultado é compartilhado e não deve ser modificado por quem chama.
+
+    Os pontos de entrada (páginas, ``Home.py``, aquecedor, benchmarks e
+    testes) ligam ``pd.set_option('mode.copy_on_write', True)``: assim fatias
+    e colunas acrescentadas nunca alteram a tabela de origem, e nenhuma
+    página precisa de ``.copy()`` defensivo.
+    """
+    @functools.wraps(funcao)
+    def envoltorio(tabela, *args, **kwargs):
+        chave_derivado = (
+            funcao.__module__, funcao.__qualname__, id(tabela),
+            _congelar(args), tuple(sorted((k, _congelar(v)) for k, v in kwargs.items()))
+        )
+
+        with _lock_derivados:
+            _remover_descartadas()
+            item = _derivados.get(chave_derivado)
+        if item is not None and item[0]() is tabela:
+            telemetria.registrar('transformacao', funcao.__qualname__, 0.0, cache='acerto')
+            return item[1]
+
+        with telemetria.medir('transformacao', funcao.__qualname__, cache='falha') as evento:
+            valor = funcao(tabela, *args, **kwargs)
+            evento['linhas'] = telemetria.linhas_de(valor)
+        with _lock_derivados:
+            _derivados[chave_derivado] = (weakref.ref(tabela, _descartadas.append), valor)
+        return valor
+
+    return envoltorio
+
+
+def limpar_memoria():
+    """Descarta os resultados em memória (``servir_e_revalidar`` e ``derivado``)
+
+    A próxima chamada de cada função volta a calcular o resultado (ou a lê-lo
+    do disco). Usado pelos benchmarks para medir cargas a frio.
+    """
+    with _lock_entradas:
+        _entradas.clear()
+    with _lock_derivados:
+        _derivados.clear()
+        _descartadas.clear()
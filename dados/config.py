@@ -0,0 +1,9 @@
+"""Configurações compartilhadas da camada de dados"""
+
+import os
+
+# Pasta onde ficam os arquivos gerados localmente (snapshots, caches)
+DIRETORIO_CACHE = os.environ.get(
+    'DBACADEMIC_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache')
+)
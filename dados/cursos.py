@@ -0,0 +1,188 @@
+"""Tabela base de cursos e as agregações derivadas dela
+
+Uma única consulta traz todos os cursos (``ccso:ProgramofStudy``) com nome
+e universidade. Rankings, contagens e filtros por nome são calculados
+localmente a partir dessa tabela, já juntada com o snapshot do DBpedia, e
+memorizados até a tabela ser atualizada.
+
+Os nomes são agrupados pela chave canônica de ``dados.nomes_cursos``, de modo
+que variações de grafia do mesmo curso contam juntas. Os filtros por área
+(engenharias, computação, ...) usam as famílias de ``nomes_cursos.FAMILIAS``,
+calculadas uma vez por chave distinta, em vez de uma regex por linha.
+
+A listagem completa para exportação (``listagem_completa``) não passa pela
+tabela em memória: é buscada em páginas e gravada direto em Parquet.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dados.cache import derivado, servir_e_revalidar
+from dados.dataset import executar_consulta
+from dados.dbpedia import formatar_nome_universidade, get_universidades, juntar_universidades
+from dados.executor import executar_em_paralelo
+from dados.nomes_cursos import FAMILIAS, canonizar, familias
+from dados.paginacao import consultar_paginado
+from dados.regioes import mapear_regioes_brasil
+from dados.tabelas import ranquear
+
+SPARQL_FATOS_CURSOS = """
+prefix ccso: <https://w3id.org/ccso/ccso#>
+
+SELECT ?cursos ?name ?u WHERE {
+    ?cursos a ccso:ProgramofStudy.
+    OPTIONAL { ?cursos ccso:psName ?name. }
+    OPTIONAL { ?cursos ccso:belongsTo ?u. }
+}
+"""
+
+# Faixas de tamanho das universidades pelo número de cursos
+FAIXAS_TAMANHO = [0, 5, 15, 50, float('inf')]
+CATEGORIAS_TAMANHO = ['Pequena', 'Média', 'Grande', 'Muito Grande']
+
+# Colunas da listagem completa (exportação), sem limite de linhas
+COLUNAS_LISTAGEM = ['cursos', 'NomeCurso', 'Universidade', 'Estado', 'UF', 'Região']
+
+# Famílias usadas pelas páginas de engenharia (substituem os FILTER regex originais)
+FAMILIA_ENGENHARIA = 'Engenharia'
+FAMILIA_ENGENHARIA_COMPUTACAO = 'Engenharia de Computação'
+
+
+@servir_e_revalidar
+def get_fatos_cursos():
+    """Cursos com nome, universidade e estado"""
+    # A consulta e o snapshot do DBpedia são independentes
+    df, _ = executar_em_paralelo([
+        lambda: executar_consulta(SPARQL_FATOS_CURSOS, nome='fatos_cursos'),
+        get_universidades,
+    ])
+    if df.empty:
+        return df
+
+    for col in ['name', 'u']:
+        if col not in df.columns:
+            df[col] = None
+
+    df['chave_curso'], df['Curso'] = canonizar(df['name'])
+    return juntar_universidades(df, coluna='u', how='left')
+
+
+@derivado
+def familias_por_chave(fatos):
+    """Famílias de cada chave de curso da tabela (uma linha por categoria de ``chave_curso``)"""
+    return familias(fatos['chave_curso'].cat.categories.tolist())
+
+
+def filtrar_familia(fatos, familia):
+    """Cursos com universidade que pertencem à ``familia``"""
+    if familia not in FAMILIAS:
+        raise ValueError(f"Família de cursos desconhecida: {familia}")
+
+    # Uma posição por categoria e uma última, sempre False, para os nulos (código -1)
+    selecionadas = np.append(familias_por_chave(fatos)[familia].to_numpy(), False)
+
+    df = fatos.dropna(subset=['name', 'u'])
+    return df[selecionadas[df['chave_curso'].cat.codes.to_numpy()]]
+
+
+@derivado
+def quantidade(fatos):
+    """Quantidade total de cursos"""
+    return pd.DataFrame({'qtcursos': [fatos['cursos'].nunique()]})
+
+
+@derivado
+def por_universidade(fatos):
+    """Ranking de universidades por número de cursos, com região e faixa de tamanho"""
+    df = fatos.dropna(subset=['Universidade'])
+    df = df.groupby('Universidade', as_index=False).agg(
+        Cursos=('cursos', 'nunique'),
+        Região=('Região', 'first')
+    )
+    df = ranquear(df, 'Cursos')
+    df['Categoria'] = pd.cut(df['Cursos'], bins=FAIXAS_TAMANHO, labels=CATEGORIAS_TAMANHO)
+    return df
+
+
+@derivado
+def por_nome(fatos):
+    """Ranking de cursos por quantidade de ofertas, somando as variações de grafia
+
+    ``name`` é a grafia mais frequente do curso e ``Variações``, quantas grafias
+    diferentes foram agrupadas nele.
+    """
+    df = fatos.dropna(subset=['name', 'u'])
+    df = df.groupby('Curso', as_index=False, observed=True).agg(
+        qtd=('cursos', 'size'),
+        Variações=('name', 'nunique')
+    )
+    df.insert(0, 'name', df.pop('Curso').astype(object))
+    return ranquear(df, 'qtd')
+
+
+@derivado
+def da_familia(fatos, familia):
+    """Cursos de uma família com a universidade e a região de cada um"""
+    df = filtrar_familia(fatos, familia)[['cursos', 'name', 'u', 'Universidade', 'Região']]
+
+    # Universidades fora da dimensão: nome pela URI e região pelas palavras-chave
+    sem_nome = df['Universidade'].isna()
+    if sem_nome.any():
+        df = df.copy()
+        df.loc[sem_nome, 'Universidade'] = df.loc[sem_nome, 'u'].map(formatar_nome_universidade)
+        df.loc[sem_nome, 'Região'] = mapear_regioes_brasil(df.loc[sem_nome, 'Universidade'])
+    return df
+
+
+@derivado
+def engenharia_computacao(fatos):
+    """Cursos de engenharia de computação com a universidade e a região de cada um"""
+    return da_familia(fatos, FAMILIA_ENGENHARIA_COMPUTACAO)
+
+
+@derivado
+def familia_por_estados(fatos, familia, estados, limite=50):
+    """Os cursos de uma família mais ofertados em cada estado, em formato longo
+
+    Colunas: Estado, name, qtd e, dentro de cada estado, Posição e Percentual.
+    """
+    # O estado é comparado sem diferenciar maiúsculas, mas retorna como foi pedido
+    nomes = {estado.lower(): estado for estado in estados}
+
+    df = filtrar_familia(fatos, familia).dropna(subset=['Estado'])
+    df = df.assign(Estado=df['Estado'].str.lower().map(nomes)).dropna(subset=['Estado'])
+    df = df.groupby(['Estado', 'Curso'], as_index=False, observed=True).size()
+    df = df.rename(columns={'Curso': 'name', 'size': 'qtd'}).astype({'name': object})
+
+    # Estados na ordem pedida, cursos do mais para o menos ofertado
+    ordem = df['Estado'].map({estado: i for i, estado in enumerate(estados)})
+    df = df.iloc[np.lexsort((-df['qtd'].to_numpy(), ordem.to_numpy()))]
+    df = df.groupby('Estado', sort=False).head(limite).reset_index(drop=True)
+
+    grupos = df.groupby('Estado', sort=False)['qtd']
+    df['Posição'] = grupos.cumcount() + 1
+    df['Percentual'] = (df['qtd'] / grupos.transform('sum') * 100).round(2)
+    return df
+
+
+@derivado
+def engenharia_por_estados(fatos, estados, limite=50):
+    """As engenharias mais ofertadas em cada estado, em formato longo"""
+    return familia_por_estados(fatos, FAMILIA_ENGENHARIA, estados, limite)
+
+
+def _preparar_listagem(pagina):
+    """Uma página da listagem: só cursos com universidade, já com estado e região"""
+    df = juntar_universidades(pagina, coluna='u', how='left')
+    df = df.dropna(subset=['name', 'Universidade']).rename(columns={'name': 'NomeCurso'})
+    return df[COLUNAS_LISTAGEM]
+
+
+def listagem_completa():
+    """Arquivo Parquet com todos os cursos, universidade e estado, buscado em páginas"""
+    return consultar_paginado(
+        SPARQL_FATOS_CURSOS,
+        ordem='?cursos ?name ?u',
+        colunas=['cursos', 'name', 'u'],
+        transformar=_preparar_listagem,
+    )
@@ -0,0 +1,179 @@
+"""Acesso ao dataset dbacademic/dbacademic no data.world
+
+O dataset é baixado uma única vez por processo. A cada consulta apenas a
+versão remota (campo ``updated`` dos metadados) é verificada, e um novo
+download só acontece quando os dados do data.world mudaram.
+
+Com ``DBACADEMIC_SPARQL_ENDPOINT`` as consultas vão para esse endpoint
+(protocolo SPARQL por HTTP, resultados em JSON) em vez do data.world, por
+exemplo um espelho próprio ou o endpoint local dos benchmarks.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+
+import datadotworld as dw
+import pandas as pd
+import requests
+
+from dados import cache, offline, telemetria
+
+DATASET_ID = 'dbacademic/dbacademic'
+
+# Intervalo mínimo (em segundos) entre duas verificações de versão remota
+INTERVALO_VERIFICACAO = int(os.environ.get('DBACADEMIC_INTERVALO_VERIFICACAO', 300))
+
+# Tipos XSD numéricos; as demais colunas dos resultados JSON ficam como texto
+TIPOS_NUMERICOS = {
+    f'http://www.w3.org/2001/XMLSchema#{tipo}'
+    for tipo in ['integer', 'int', 'long', 'short', 'nonNegativeInteger', 'decimal', 'double', 'float']
+}
+
+_lock = threading.Lock()
+_dataset = None
+_versao_carregada = None
+_versao_remota = None
+_ultima_verificacao = None
+
+
+def endpoint_sparql():
+    """URL do endpoint SPARQL configurado, ou vazio para usar o data.world"""
+    return os.environ.get('DBACADEMIC_SPARQL_ENDPOINT', '')
+
+
+def versao_dataset():
+    """Versão atual do dataset no data.world (data da última atualização)"""
+    global _versao_remota, _ultima_verificacao
+
+    if offline.ativo():
+        return offline.versao()
+    if endpoint_sparql():
+        # Sem metadados de versão: as entradas valem até expirar (cache.TTL)
+        return f"endpoint-{endpoint_sparql()}"
+
+    # A verificação é espaçada mesmo quando falha: sem acesso aos metadados
+    # (fora do ar) as consultas seguem com a última versão conhecida, ou None
+    agora = time.monotonic()
+    if _ultima_verificacao is not None and agora - _ultima_verificacao < INTERVALO_VERIFICACAO:
+        return _versao_remota
+    _ultima_verificacao = agora
+
+    try:
+        info = dw.api_client().get_dataset(DATASET_ID)
+        _versao_remota = info.get('updated')
+    except Exception:
+        # Sem acesso aos metadados: mantém a última versão conhecida
+        pass
+
+    return _versao_remota
+
+
+def _limpar_cache_local():
+    """Remove a cópia local do dataset mantida pelo datadotworld"""
+    cache_path = os.path.expanduser(os.path.join("~/.dw/cache", DATASET_ID))
+    if os.path.exists(cache_path):
+        shutil.rmtree(cache_path)
+
+
+def garantir_dataset():
+    """Carrega o dataset uma vez por processo, baixando de novo só se mudou"""
+    global _dataset, _versao_carregada
+
+    versao = versao_dataset()
+    if _dataset is not None and versao == _versao_carregada:
+        return _dataset
+
+    with _lock:
+        if _dataset is not None and versao == _versao_carregada:
+            return _dataset
+
+        try:
+            ds = dw.load_dataset(DATASET_ID, auto_update=True)
+        except Exception as e:
+            # Download interrompido deixa a pasta do cache em estado inválido
+            if "already exists" not in str(e):
+                raise
+            _limpar_cache_local()
+            ds = dw.load_dataset(DATASET_ID, auto_update=True)
+
+        _dataset = ds
+        _versao_carregada = versao
+
+    return _dataset
+
+
+def ler_resultados_json(resultados):
+    """DataFrame a partir de um resultado SPARQL em JSON (application/sparql-results+json)"""
+    colunas = resultados['head']['vars']
+    bindings = resultados['results']['bindings']
+    df = pd.DataFrame([{k: v['value'] for k, v in b.items()} for b in bindings], columns=colunas)
+
+    # Literais numéricos voltam a ser números, como no cliente do data.world
+    numericas = {k for b in bindings for k, v in b.items() if v.get('datatype') in TIPOS_NUMERICOS}
+    for coluna in numericas:
+        df[coluna] = pd.to_numeric(df[coluna])
+    return df
+
+
+def consultar_endpoint(url, sparql_query):
+    """Executa a consulta em um endpoint SPARQL por HTTP
+
+    A consulta vai no corpo de um POST de formulário (protocolo SPARQL 1.1):
+    os lotes do DBpedia passam de 8 KB, limite comum de URL em proxies.
+    """
+    response = requests.post(
+        url,
+        data={'query': sparql_query, 'format': 'application/sparql-results+json'},
+        headers={'Accept': 'application/sparql-results+json'},
+        timeout=120
+    )
+    response.raise_for_status()
+    telemetria.anotar(bytes=len(response.content))
+    return ler_resultados_json(response.json())
+
+
+def fonte_consultas():
+    """Origem das consultas na telemetria: 'offline', 'endpoint' ou 'data.world'"""
+    if offline.ativo():
+        return 'offline'
+    if endpoint_sparql():
+        return 'endpoint'
+    return 'data.world'
+
+
+def executar_consulta(sparql_query, usar_cache=True, nome=None):
+    """Executa uma consulta SPARQL no dataset e retorna um DataFrame
+
+    O resultado é servido do cache em disco enquanto a versão do dataset
+    não mudar. No modo offline a consulta roda no repositório RDF local e,
+    com ``DBACADEMIC_SPARQL_ENDPOINT``, no endpoint configurado.
+    Com ``usar_cache=False`` (páginas de uma consulta paginada, que já vão
+    para o próprio arquivo) o cache em disco não é lido nem gravado.
+    ``nome`` identifica a consulta na telemetria.
+    """
+    fonte = fonte_consultas()
+    with telemetria.medir(fonte, nome or cache.chave(sparql_query, None)[:12]) as evento:
+        versao = versao_dataset()
+        df = cache.ler(sparql_query, versao) if usar_cache else None
+        if df is not None:
+            evento.update(cache='acerto', linhas=len(df))
+            return df
+
+        if fonte == 'offline':
+            df = offline.consultar(sparql_query)
+        elif fonte == 'endpoint':
+            df = consultar_endpoint(endpoint_sparql(), sparql_query)
+        else:
+            garantir_dataset()
+            results = dw.query(DATASET_ID, sparql_query, query_type='sparql')
+            # O cliente só guarda o JSON já lido: o tamanho é o dele serializado
+            telemetria.anotar(bytes=len(json.dumps(results.raw_data, separators=(',', ':')).encode('utf-8')))
+            df = results.dataframe
+        if usar_cache:
+            evento['cache'] = 'falha'
+            cache.gravar(sparql_query, versao, df)
+        evento['linhas'] = len(df)
+        return df
@@ -0,0 +1,222 @@
+"""Tabela de dimensão das universidades, montada a partir do DBpedia
+
+Em vez de federar cada consulta com ``SERVICE <http://dbpedia.org/sparql>``,
+os nomes e estados das universidades são buscados uma vez no DBpedia, salvos
+em disco e reconstruídos apenas quando ficam mais velhos que
+``INTERVALO_ATUALIZACAO``.
+
+Ao carregar o snapshot, cada universidade (chave ``url_pt``) recebe nome
+canônico, estado oficial, sigla da UF e região. As consultas ao DbAcademic
+retornam a URI da universidade e são juntadas com essa tabela em um único
+merge, sem lógica por linha nas páginas.
+"""
+
+import functools
+import os
+import threading
+import time
+
+import pandas as pd
+
+from dados import cache, offline, telemetria
+from dados.config import DIRETORIO_CACHE
+from dados.dataset import consultar_endpoint, executar_consulta
+from dados.executor import executar_em_paralelo
+from dados.geografia import REGIOES_POR_ESTADO, UF_POR_ESTADO, normalizar_estado
+from dados.regioes import mapear_regioes_brasil
+
+DBPEDIA_ENDPOINT = os.environ.get('DBACADEMIC_DBPEDIA_ENDPOINT', 'https://dbpedia.org/sparql')
+
+# Idade máxima (em segundos) do snapshot antes de ser reconstruído
+INTERVALO_ATUALIZACAO = int(os.environ.get('DBACADEMIC_INTERVALO_DBPEDIA', 7 * 24 * 3600))
+
+# Espera (em segundos) antes de tentar de novo após uma atualização com falha
+INTERVALO_NOVA_TENTATIVA = 3600
+
+ARQUIVO_UNIVERSIDADES = os.path.join(DIRETORIO_CACHE, 'universidades_dbpedia.csv')
+
+# Quantidade de universidades por requisição ao DBpedia
+TAMANHO_LOTE = 100
+
+# Colunas do snapshot em disco (valores como vieram do DBpedia)
+COLUNAS_SNAPSHOT = ['url_pt', 'url_eng', 'Universidade', 'Estado']
+
+# Colunas da dimensão usadas nas junções
+COLUNAS_DIMENSAO = ['url_pt', 'Universidade', 'Estado', 'UF', 'Região']
+
+_lock = threading.Lock()
+_universidades = None
+_carregado_em = 0.0
+
+SPARQL_UNIVERSIDADES = """
+prefix owl: <http://www.w3.org/2002/07/owl#>
+
+SELECT DISTINCT ?url_pt ?url_eng WHERE {
+    ?url_pt owl:sameAs ?url_eng.
+    FILTER(STRSTARTS(STR(?url_eng), "http://dbpedia.org/resource/"))
+}
+"""
+
+SPARQL_DBPEDIA = """
+PREFIX dbp: <http://dbpedia.org/property/>
+PREFIX dbo: <http://dbpedia.org/ontology/>
+
+SELECT ?url_eng ?Universidade ?Estado ?estado_dbp WHERE {{
+    VALUES ?url_eng {{ {valores} }}
+    OPTIONAL {{ ?url_eng dbp:name ?Universidade. }}
+    OPTIONAL {{
+        ?url_eng dbo:state ?state.
+        ?state dbp:name ?Estado.
+    }}
+    OPTIONAL {{ ?url_eng dbp:state ?estado_dbp. }}
+}}
+"""
+
+
+def consultar_dbpedia(sparql_query):
+    """Executa uma consulta diretamente no endpoint público do DBpedia"""
+    with telemetria.medir('dbpedia', 'lote_universidades') as evento:
+        if offline.ativo():
+            df = offline.consultar(sparql_query)
+        else:
+            df = consultar_endpoint(DBPEDIA_ENDPOINT, sparql_query)
+        evento['linhas'] = len(df)
+        return df
+
+
+def _nome_do_recurso(valor):
+    """Converte 'http://dbpedia.org/resource/São_Paulo' em 'São Paulo'"""
+    if pd.isna(valor):
+        return valor
+    if valor.startswith('http'):
+        valor = valor.rstrip('/').split('/')[-1]
+    return valor.replace('_', ' ')
+
+
+def consultas_dbpedia(df_links):
+    """Consultas ao DBpedia, em lotes de ``TAMANHO_LOTE`` universidades"""
+    urls = df_links['url_eng'].dropna().unique().tolist()
+    return [
+        SPARQL_DBPEDIA.format(valores=' '.join(f'<{url}>' for url in urls[i:i + TAMANHO_LOTE]))
+        for i in range(0, len(urls), TAMANHO_LOTE)
+    ]
+
+
+def construir_snapshot():
+    """Monta a tabela de universidades consultando o DbAcademic e o DBpedia"""
+    df_links = executar_consulta(SPARQL_UNIVERSIDADES, nome='universidades')
+    if df_links.empty:
+        return pd.DataFrame(columns=COLUNAS_SNAPSHOT)
+
+    consultas = consultas_dbpedia(df_links)
+    partes = executar_em_paralelo(functools.partial(consultar_dbpedia, q) for q in consultas)
+
+    df_dbpedia = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame()
+    for col in ['url_eng', 'Universidade', 'Estado', 'estado_dbp']:
+        if col not in df_dbpedia.columns:
+            df_dbpedia[col] = None
+
+    # Estado vem de dbo:state; dbp:state (literal ou recurso) é o fallback
+    df_dbpedia['Estado'] = df_dbpedia['Estado'].fillna(df_dbpedia['estado_dbp'].map(_nome_do_recurso))
+
+    # Uma linha por universidade (first() pega o primeiro valor não nulo)
+    df_dbpedia = df_dbpedia.groupby('url_eng', as_index=False)[['Universidade', 'Estado']].first()
+
+    df = df_links.merge(df_dbpedia, on='url_eng', how='left')
+    return df[COLUNAS_SNAPSHOT]
+
+
+def formatar_nome_universidade(url_or_name):
+    """Formatação melhorada de nomes de universidades mantendo nomes oficiais em inglês"""
+    if pd.isna(url_or_name):
+        return "Não informado"
+    
+    if isinstance(url_or_name, str):
+        # Se for URL, extrair o nome
+        if 'http' in url_or_name:
+            parts = url_or_name.split('/')
+            name = parts[-1] if parts else url_or_name
+        else:
+            name = url_or_name
+        
+        # Se já estiver bem formatado (nomes das universidades federais em inglês), manter
+        if any(prefix in name for prefix in ['Federal University', 'University of', 'University for']):
+            return name
+        
+        # Caso contrário, limpar e formatar
+        name = name.replace('_', ' ').replace('-', ' ')
+        name = ' '.join(word.capitalize() for word in name.split())
+        
+        return name
+    
+    return str(url_or_name)
+
+
+def construir_dimensao(snapshot):
+    """Nome canônico, estado oficial, UF e região de cada universidade"""
+    df = snapshot[COLUNAS_SNAPSHOT].drop_duplicates('url_pt').reset_index(drop=True)
+
+    # Sem dbp:name, o nome vem do recurso no DBpedia
+    df['Universidade'] = df['Universidade'].fillna(df['url_eng'].map(formatar_nome_universidade))
+
+    # Grafias como 'Piaui' ou 'State of São Paulo' viram o nome oficial
+    df['Estado'] = df['Estado'].map(normalizar_estado).fillna(df['Estado'])
+    df['UF'] = df['Estado'].map(UF_POR_ESTADO)
+
+    # A região vem do estado; palavras-chave no nome só quando não há estado
+    df['Região'] = df['Estado'].map(REGIOES_POR_ESTADO)
+    sem_regiao = df['Região'].isna()
+    if sem_regiao.any():
+        df.loc[sem_regiao, 'Região'] = mapear_regioes_brasil(df.loc[sem_regiao, 'Universidade'])
+
+    return df[COLUNAS_DIMENSAO + ['url_eng']]
+
+
+def _salvar(df, caminho):
+    """Grava o arquivo de forma atômica para não expor arquivos incompletos"""
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = f"{caminho}.tmp"
+    df.to_csv(temporario, index=False)
+    os.replace(temporario, caminho)
+
+
+def get_universidades():
+    """Dimensão universidade → (nome, estado, UF, região), carregada uma vez por processo"""
+    global _universidades, _carregado_em
+
+    agora = time.time()
+    if _universidades is not None and agora - _carregado_em < INTERVALO_ATUALIZACAO:
+        return _universidades
+
+    with _lock:
+        if _universidades is not None and agora - _carregado_em < INTERVALO_ATUALIZACAO:
+            return _universidades
+
+        existe = os.path.exists(ARQUIVO_UNIVERSIDADES)
+        if existe and agora - os.path.getmtime(ARQUIVO_UNIVERSIDADES) < INTERVALO_ATUALIZACAO:
+            _universidades = construir_dimensao(pd.read_csv(ARQUIVO_UNIVERSIDADES))
+            _carregado_em = os.path.getmtime(ARQUIVO_UNIVERSIDADES)
+            return _universidades
+
+        try:
+            # Tarefas do pool podem estar esperando este lock: os lotes do DBpedia rodam aqui
+            with cache.segurando_carga():
+                df = construir_snapshot()
+            _salvar(df, ARQUIVO_UNIVERSIDADES)
+            _carregado_em = agora
+        except Exception:
+            # Falha na atualização: segue com o snapshot anterior, se houver
+            if not existe:
+                raise
+            df = pd.read_csv(ARQUIVO_UNIVERSIDADES)
+            _carregado_em = agora - INTERVALO_ATUALIZACAO + INTERVALO_NOVA_TENTATIVA
+        _universidades = construir_dimensao(df)
+
+    return _universidades
+
+
+def juntar_universidades(df, coluna='url_pt', how='inner'):
+    """Adiciona Universidade, Estado, UF e Região a um resultado com a URI da universidade"""
+    universidades = get_universidades()[COLUNAS_DIMENSAO]
+    return df.merge(universidades, left_on=coluna, right_on='url_pt', how=how,
+                    suffixes=('', '_dbpedia'))
@@ -0,0 +1,158 @@
+"""Tabela base de docentes e as agregações derivadas dela
+
+Uma única consulta agrupa os docentes pela combinação de universidades,
+graus de formação e sexos registrados para cada um e conta quantos têm cada
+combinação. Todas as visões do painel de docentes (por estado, por grau,
+estado × grau e estado × sexo) são calculadas localmente a partir dessa
+tabela, sem novas idas ao endpoint, e memorizadas até a tabela ser
+atualizada.
+
+Na tabela, cada combinação vira uma linha por (universidade, grau, sexo),
+todas com o mesmo número de docentes e o mesmo ``Combinacao``. As somas
+contam cada combinação uma única vez por grupo: um docente com duas
+universidades no mesmo estado, ou com dois graus, entra uma vez no total do
+estado, como no ``COUNT(DISTINCT ?s)`` por estado.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dados.cache import derivado, servir_e_revalidar
+from dados.dataset import executar_consulta
+from dados.dbpedia import get_universidades, juntar_universidades
+from dados.executor import executar_em_paralelo
+from dados.rotulos import ROTULOS_SEXO, rotular_graus, rotular_sexos
+from dados.tabelas import ranquear
+
+SPARQL_FATOS_DOCENTES = """
+prefix CCSO: <https://w3id.org/ccso/ccso#>
+prefix foaf: <http://xmlns.com/foaf/0.1/>
+
+SELECT ?Universidades ?Graus ?Sexos (COUNT(?s) AS ?Docentes) WHERE {
+    {
+        SELECT ?s
+            (GROUP_CONCAT(DISTINCT STR(?url_pt); separator=" ") AS ?Universidades)
+            (GROUP_CONCAT(DISTINCT STR(?GrauFormacao); separator=" ") AS ?Graus)
+            (GROUP_CONCAT(DISTINCT STR(?Sexo); separator=" ") AS ?Sexos)
+        WHERE {
+            ?s a CCSO:Professor.
+            OPTIONAL { ?s CCSO:worksFor ?url_pt. }
+            OPTIONAL { ?s CCSO:hasDegree ?GrauFormacao. }
+            OPTIONAL { ?s foaf:gender ?Sexo . }
+        }
+        GROUP BY ?s
+    }
+}
+GROUP BY ?Universidades ?Graus ?Sexos
+"""
+
+# Coluna da combinação (lista separada por espaços) -> coluna de cada valor
+COLUNAS_COMBINACAO = {'Universidades': 'url_pt', 'Graus': 'GrauFormacao', 'Sexos': 'Sexo'}
+
+
+@servir_e_revalidar
+def get_fatos_docentes():
+    """Docentes por combinação, uma linha por universidade, grau de formação e sexo"""
+    # A consulta e o snapshot do DBpedia são independentes
+    df, _ = executar_em_paralelo([
+        lambda: executar_consulta(SPARQL_FATOS_DOCENTES, nome='fatos_docentes'),
+        get_universidades,
+    ])
+    if df.empty:
+        return df
+
+    df['Docentes'] = pd.to_numeric(df['Docentes'], errors='coerce')
+    df['Combinacao'] = np.arange(len(df))
+    for combinacao, coluna in COLUNAS_COMBINACAO.items():
+        # Sem valor registrado: lista vazia, que o explode transforma em nulo
+        valores = df.pop(combinacao) if combinacao in df.columns else pd.Series('', index=df.index)
+        df[coluna] = valores.fillna('').str.split()
+        df = df.explode(coluna, ignore_index=True)
+
+    # Rótulos calculados uma vez por atualização dos dados, não por rerun
+    df['GrauFormacao_Formatado'] = rotular_graus(df['GrauFormacao'])
+    df['Sexo_Formatado'] = rotular_sexos(df['Sexo'])
+
+    # Left join: docentes sem estado ainda contam na visão por grau
+    return juntar_universidades(df, how='left')
+
+
+def _somar(df, colunas):
+    """Soma ``Docentes`` por ``colunas``, contando cada combinação uma vez por grupo"""
+    df = df.drop_duplicates(['Combinacao', *colunas])
+    return df.groupby(colunas, as_index=False, observed=True)['Docentes'].sum()
+
+
+@derivado
+def por_estado(fatos):
+    """Ranking de docentes por estado, com a região de cada estado"""
+    df = _somar(fatos.dropna(subset=['Estado']), ['Estado', 'Região'])
+    return ranquear(df, 'Docentes')
+
+
+@derivado
+def por_grau(fatos):
+    """Ranking de docentes por grau de formação"""
+    df = _somar(fatos.dropna(subset=['GrauFormacao']), ['GrauFormacao', 'GrauFormacao_Formatado'])
+    return ranquear(df, 'Docentes')
+
+
+@derivado
+def por_estado_grau(fatos):
+    """Docentes por estado e grau de formação"""
+    df = _somar(fatos.dropna(subset=['Estado', 'GrauFormacao']),
+                ['Estado', 'GrauFormacao', 'GrauFormacao_Formatado'])
+    return df.sort_values(['Estado', 'Docentes'], ascending=[True, False], ignore_index=True)
+
+
+@derivado
+def por_estado_sexo(fatos):
+    """Docentes por estado e sexo ('N' quando o sexo não foi registrado)"""
+    df = fatos.dropna(subset=['Estado'])
+    df = _somar(df.assign(Sexo=df['Sexo'].fillna('N')), ['Estado', 'Região', 'Sexo', 'Sexo_Formatado'])
+    return df.sort_values(['Estado', 'Docentes'], ascending=[True, False], ignore_index=True)
+
+
+# Colunas de contagem do cubo estado × sexo, na ordem de ROTULOS_SEXO
+COLUNAS_SEXO = ['Masculino', 'Feminino', 'Sem_sexo_registrado']
+
+
+def _dividir(numerador, denominador, casas):
+    """Divisão elemento a elemento arredondada, com 0 onde o denominador é 0"""
+    resultado = np.zeros(len(numerador))
+    np.divide(numerador, denominador, out=resultado, where=denominador > 0)
+    return resultado.round(casas)
+
+
+@derivado
+def cubo_estado_sexo(fatos):
+    """Cubo estado × sexo com totais, percentuais e razão F/M, do maior total para o menor"""
+    df = fatos.dropna(subset=['Estado']).drop_duplicates(['Combinacao', 'Estado', 'Sexo_Formatado'])
+    estados, nomes_estados = pd.factorize(df['Estado'])
+    sexos = df['Sexo_Formatado'].cat.set_categories(list(ROTULOS_SEXO.values())).cat.codes.to_numpy()
+
+    # Uma célula por (estado, sexo), somada de uma vez com bincount
+    n = len(nomes_estados)
+    celulas = np.bincount(
+        estados * len(COLUNAS_SEXO) + sexos,
+        weights=df['Docentes'].fillna(0).to_numpy(),
+        minlength=n * len(COLUNAS_SEXO)
+    )
+    contagens = celulas.reshape(n, len(COLUNAS_SEXO)).astype(np.int32)
+    masculino, feminino, sem_registro = contagens.T
+    total = contagens.sum(axis=1, dtype=np.int32)
+
+    ordem = np.argsort(-total, kind='stable')
+    cubo = pd.DataFrame({
+        'Estado': nomes_estados.to_numpy(),
+        'Masculino': masculino,
+        'Feminino': feminino,
+        'Sem_sexo_registrado': sem_registro,
+        'Total': total,
+        'Total_com_genero': masculino + feminino,
+        'Pct_Masculino': _dividir(masculino * 100, total, 2),
+        'Pct_Feminino': _dividir(feminino * 100, total, 2),
+        'Pct_Sem_registro': _dividir(sem_registro * 100, total, 2),
+        'Razao_F_M': _dividir(feminino, masculino, 3),
+    })
+    return cubo.iloc[ordem].reset_index(drop=True)
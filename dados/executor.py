@@ -0,0 +1,68 @@
+"""Execução simultânea de consultas independentes
+
+Páginas e tabelas que dependem de várias consultas as enviam juntas, de
+modo que o tempo de espera seja o da consulta mais lenta e não a soma de
+todas. Um único pool limita quantas consultas ficam abertas ao mesmo tempo.
+
+Chamadas aninhadas (feitas de dentro de uma tarefa do pool) rodam em
+sequência na própria thread, para não esgotar o pool esperando por ele mesmo.
+O mesmo vale para quem segura uma carga (``cache.segurando_carga``): tarefas
+do pool podem estar paradas esperando essa carga, então quem a segura nunca
+espera pelo pool.
+As tarefas herdam de quem as enviou o ``cache.ignorando_disco``, para que
+uma atualização forçada chegue ao endpoint também pelo pool.
+"""
+
+import contextlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from dados import cache
+
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:
+    add_script_run_ctx = get_script_run_ctx = None
+
+# Número máximo de consultas executadas ao mesmo tempo
+MAX_CONCORRENCIA = int(os.environ.get('DBACADEMIC_MAX_CONCORRENCIA', 4))
+
+_pool = ThreadPoolExecutor(max_workers=MAX_CONCORRENCIA, thread_name_prefix='consulta')
+_local = threading.local()
+
+
+def _preparar(chamada):
+    """Marca a thread como tarefa do pool e repassa o contexto do Streamlit e do cache"""
+    ctx = get_script_run_ctx(suppress_warning=True) if get_script_run_ctx else None
+    ignorar_disco = cache.disco_ignorado()
+
+    def executar():
+        _local.dentro_do_pool = True
+        if ctx is not None:
+            # Permite que a chamada use st.* quando disparada de uma página
+            add_script_run_ctx(threading.current_thread(), ctx)
+        try:
+            with cache.ignorando_disco() if ignorar_disco else contextlib.nullcontext():
+                return chamada()
+        finally:
+            _local.dentro_do_pool = False
+
+    return executar
+
+
+def executar_em_paralelo(chamadas):
+    """Executa as funções (sem argumentos) em paralelo e retorna os resultados na ordem
+
+    Todas as chamadas terminam antes de a primeira exceção ser propagada.
+    """
+    chamadas = list(chamadas)
+    if len(chamadas) <= 1 or getattr(_local, 'dentro_do_pool', False) or cache.carga_em_andamento():
+        return [chamada() for chamada in chamadas]
+
+    futuros = [_pool.submit(_preparar(chamada)) for chamada in chamadas]
+    erros = [f.exception() for f in futuros]
+    for erro in erros:
+        if erro is not None:
+            raise erro
+    return [f.result() for f in futuros]
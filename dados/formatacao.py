@@ -0,0 +1,37 @@
+"""Formatação das tabelas do dashboard
+
+As colunas numéricas chegam ao navegador com o dtype original e quem
+formata é o ``st.dataframe``, pelo ``column_config``. A ordenação ao clicar
+no cabeçalho continua numérica e nenhuma cópia em texto do DataFrame é
+criada a cada rerun.
+"""
+
+import streamlit as st
+
+from dados import perfil
+
+# Separador de milhar conforme o idioma do navegador
+FORMATO_INTEIRO = 'localized'
+
+
+def coluna_inteiro(rotulo, **opcoes):
+    """Coluna de inteiros com separador de milhar"""
+    return st.column_config.NumberColumn(rotulo, format=FORMATO_INTEIRO, **opcoes)
+
+
+def coluna_decimal(rotulo, casas=1, **opcoes):
+    """Coluna de números com ``casas`` casas decimais"""
+    return st.column_config.NumberColumn(rotulo, format=f'%.{casas}f', **opcoes)
+
+
+def coluna_percentual(rotulo, casas=2, **opcoes):
+    """Coluna de percentuais já multiplicados por 100 (12.5 -> 12.50%)"""
+    return st.column_config.NumberColumn(rotulo, format=f'%.{casas}f%%', **opcoes)
+
+
+def mostrar_tabela(df, colunas, column_config, **opcoes):
+    """Exibe só ``colunas`` de ``df``, na ordem dada, sem copiar o DataFrame"""
+    opcoes.setdefault('hide_index', True)
+    opcoes.setdefault('use_container_width', True)
+    perfil.tabela(df, column_order=list(colunas), column_config=column_config, **opcoes)
+
@@ -0,0 +1,41 @@
+"""Referências geográficas do Brasil usadas pelos painéis"""
+
+import re
+
+import pandas as pd
+
+from dados.texto import sem_acentos
+
+# Estado → (sigla, região)
+ESTADOS = {
+    'Acre': ('AC', 'Norte'), 'Alagoas': ('AL', 'Nordeste'), 'Amapá': ('AP', 'Norte'),
+    'Amazonas': ('AM', 'Norte'), 'Bahia': ('BA', 'Nordeste'), 'Ceará': ('CE', 'Nordeste'),
+    'Distrito Federal': ('DF', 'Centro-Oeste'), 'Espírito Santo': ('ES', 'Sudeste'),
+    'Goiás': ('GO', 'Centro-Oeste'), 'Maranhão': ('MA', 'Nordeste'), 'Mato Grosso': ('MT', 'Centro-Oeste'),
+    'Mato Grosso do Sul': ('MS', 'Centro-Oeste'), 'Minas Gerais': ('MG', 'Sudeste'), 'Pará': ('PA', 'Norte'),
+    'Paraíba': ('PB', 'Nordeste'), 'Paraná': ('PR', 'Sul'), 'Pernambuco': ('PE', 'Nordeste'),
+    'Piauí': ('PI', 'Nordeste'), 'Rio de Janeiro': ('RJ', 'Sudeste'), 'Rio Grande do Norte': ('RN', 'Nordeste'),
+    'Rio Grande do Sul': ('RS', 'Sul'), 'Rondônia': ('RO', 'Norte'), 'Roraima': ('RR', 'Norte'),
+    'Santa Catarina': ('SC', 'Sul'), 'São Paulo': ('SP', 'Sudeste'), 'Sergipe': ('SE', 'Nordeste'),
+    'Tocantins': ('TO', 'Norte')
+}
+
+REGIOES_POR_ESTADO = {estado: regiao for estado, (_, regiao) in ESTADOS.items()}
+UF_POR_ESTADO = {estado: uf for estado, (uf, _) in ESTADOS.items()}
+
+# Lista completa de estados brasileiros
+ESTADOS_BRASIL = list(ESTADOS)
+
+# Grafias aceitas (sem acento, minúsculas, siglas) → nome oficial do estado
+_CHAVES_ESTADO = {sem_acentos(estado): estado for estado in ESTADOS}
+_CHAVES_ESTADO.update({uf.lower(): estado for estado, uf in UF_POR_ESTADO.items()})
+
+_PREFIXO_ESTADO = re.compile(r'^(state of|estado d[aeo])\s+')
+
+
+def normalizar_estado(nome):
+    """Nome oficial do estado para grafias como 'Piaui', 'State of São Paulo' ou 'SP'"""
+    if pd.isna(nome):
+        return None
+    chave = _PREFIXO_ESTADO.sub('', sem_acentos(nome))
+    return _CHAVES_ESTADO.get(chave)
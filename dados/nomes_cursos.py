@@ -0,0 +1,147 @@
+"""Nomes canônicos dos cursos
+
+Grafias diferentes do mesmo curso ("ENGENHARIA DE COMPUTAÇÃO", "Engenharia
+da Computação", "ENG. COMPUTACAO") recebem a mesma chave: sem acentos, sem
+pontuação, sem preposições e com as abreviações expandidas. A chave de cada
+``psName`` distinto é calculada uma única vez e guardada em disco, e as
+versões seguintes da tabela de cursos só calculam os nomes novos.
+
+Cada chave é exibida com a grafia mais frequente entre as suas variações.
+
+As famílias de cursos (``FAMILIAS``) são definidas por trechos de chave e
+testadas uma vez por chave distinta; uma família nova não exige consulta
+nova ao endpoint, só uma entrada no dicionário.
+"""
+
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dados.config import DIRETORIO_CACHE
+from dados.texto import sem_acentos
+
+# Mudar as regras abaixo exige mudar a versão, que invalida a tabela em disco
+VERSAO_REGRAS = 1
+
+ARQUIVO_CHAVES = os.path.join(DIRETORIO_CACHE, f'nomes_cursos_v{VERSAO_REGRAS}.parquet')
+
+# Palavras que não distinguem um curso de outro
+PALAVRAS_IGNORADAS = {'de', 'da', 'do', 'das', 'dos', 'e', 'em'}
+
+ABREVIACOES = {
+    'eng': 'engenharia',
+    'engo': 'engenharia',
+    'comp': 'computacao',
+    'adm': 'administracao',
+    'lic': 'licenciatura',
+    'bach': 'bacharelado',
+    'bel': 'bacharelado',
+}
+
+# Família -> nomes de curso; a família reúne as chaves que contêm a chave de
+# algum desses nomes, com as palavras na mesma sequência
+FAMILIAS = {
+    'Engenharia': ['Engenharia'],
+    'Engenharia de Computação': ['Engenharia de Computação'],
+    'Computação': [
+        'Computação',
+        'Informática',
+        'Sistemas de Informação',
+        'Engenharia de Software',
+    ],
+}
+
+_SEPARADORES = re.compile(r'[^0-9a-z]+')
+
+_lock = threading.Lock()
+_chaves = None
+
+
+def chave_curso(nome):
+    """Chave canônica de um nome de curso"""
+    palavras = _SEPARADORES.split(sem_acentos(nome))
+    return ' '.join(ABREVIACOES.get(p, p) for p in palavras if p and p not in PALAVRAS_IGNORADAS)
+
+
+def _contem(chave, trecho):
+    return f' {trecho} ' in f' {chave} '
+
+
+def familias(chaves):
+    """Tabela booleana chave x família: uma linha por chave, uma coluna por família"""
+    trechos = {familia: [chave_curso(nome) for nome in nomes] for familia, nomes in FAMILIAS.items()}
+    return pd.DataFrame(
+        {
+            familia: [any(_contem(chave, trecho) for trecho in lista) for chave in chaves]
+            for familia, lista in trechos.items()
+        },
+        index=pd.Index(chaves, name='chave_curso'),
+        dtype=bool,
+    )
+
+
+def _carregar():
+    try:
+        df = pd.read_parquet(ARQUIVO_CHAVES)
+        return dict(zip(df['name'], df['chave']))
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def _salvar(chaves):
+    """Grava a tabela de forma atômica; falhar aqui não impede o uso das chaves"""
+    temporario = f"{ARQUIVO_CHAVES}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(ARQUIVO_CHAVES), exist_ok=True)
+        pd.DataFrame({'name': list(chaves), 'chave': list(chaves.values())}).to_parquet(temporario, index=False)
+        os.replace(temporario, ARQUIVO_CHAVES)
+    except Exception:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+
+def chaves(nomes):
+    """Chave canônica de cada nome, consultando e completando a tabela em disco"""
+    global _chaves
+
+    with _lock:
+        if _chaves is None:
+            _chaves = _carregar()
+
+        novos = {nome for nome in nomes if nome not in _chaves}
+        if novos:
+            # Cópia: quem leu a tabela anterior não a vê mudar
+            _chaves = {**_chaves, **{nome: chave_curso(nome) for nome in novos}}
+            _salvar(_chaves)
+        tabela = _chaves
+
+    return [tabela[nome] for nome in nomes]
+
+
+def canonizar(serie):
+    """Chave e nome de exibição de cada curso, como categóricos
+
+    O nome de exibição de uma chave é a variação com mais linhas na série.
+    Nulos continuam nulos nas duas colunas.
+    """
+    codigos, distintos = pd.factorize(serie)
+    chaves_distintos = chaves(distintos.tolist())
+
+    # Grafia mais frequente de cada chave (empate: a que aparece primeiro)
+    frequencias = np.bincount(codigos[codigos >= 0], minlength=len(distintos))
+    variacoes = pd.DataFrame({'chave': chaves_distintos, 'name': distintos, 'n': frequencias})
+    variacoes = variacoes.sort_values('n', ascending=False, kind='stable')
+    exibicao = variacoes.drop_duplicates('chave').set_index('chave')['name']
+
+    posicoes_chave, categorias = pd.factorize(np.asarray(chaves_distintos, dtype=object))
+    posicoes_chave = np.append(posicoes_chave, -1)[codigos]
+
+    chave = pd.Categorical.from_codes(posicoes_chave, categorias)
+    nome = pd.Categorical.from_codes(posicoes_chave, exibicao.reindex(categorias).to_numpy())
+    return (
+        pd.Series(chave, index=serie.index, name='chave_curso'),
+        pd.Series(nome, index=serie.index, name='Curso'),
+    )
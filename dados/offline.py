@@ -0,0 +1,182 @@
+"""Modo offline: consultas SPARQL executadas em um repositório RDF local
+
+Com ``DBACADEMIC_OFFLINE=1`` nenhuma consulta vai para o data.world ou para o
+DBpedia. Todos os arquivos RDF de ``DIRETORIO_OFFLINE`` (o dump do
+dbacademic mais um extrato do DBpedia) são carregados em um grafo rdflib, e
+blocos ``SERVICE`` são resolvidos nesse mesmo grafo.
+
+Os arquivos são preparados, em uma máquina com acesso à internet, com::
+
+    python -m dados.offline
+"""
+
+import argparse
+import glob
+import logging
+import os
+import re
+import threading
+
+import pandas as pd
+
+from dados.config import DIRETORIO_CACHE
+
+DIRETORIO_OFFLINE = os.environ.get('DBACADEMIC_OFFLINE_DIR', os.path.join(DIRETORIO_CACHE, 'offline'))
+
+# Extensões reconhecidas e o formato rdflib de cada uma
+FORMATOS = {
+    '.ttl': 'turtle', '.nt': 'nt', '.nq': 'nquads', '.trig': 'trig',
+    '.rdf': 'xml', '.owl': 'xml', '.xml': 'xml', '.jsonld': 'json-ld', '.n3': 'n3',
+}
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_grafo = None
+
+# O parser SPARQL do rdflib não é seguro para uso simultâneo entre threads
+_lock_consulta = threading.Lock()
+
+_SERVICE = re.compile(r'\bSERVICE\s+(?:SILENT\s+)?<[^>]*>\s*\{', re.IGNORECASE)
+
+
+def ativo():
+    """Indica se as consultas devem ir para o repositório local"""
+    return os.environ.get('DBACADEMIC_OFFLINE', '0') == '1'
+
+
+def _arquivos():
+    """Arquivos RDF do diretório offline, em ordem estável"""
+    caminhos = glob.glob(os.path.join(DIRETORIO_OFFLINE, '**', '*'), recursive=True)
+    return sorted(c for c in caminhos if os.path.splitext(c)[1].lower() in FORMATOS)
+
+
+def versao():
+    """Versão dos dados offline: data da última modificação dos arquivos"""
+    arquivos = _arquivos()
+    if not arquivos:
+        return None
+    return f"offline-{max(os.path.getmtime(c) for c in arquivos):.0f}"
+
+
+def get_grafo():
+    """Grafo com todos os arquivos RDF locais, carregado uma vez por processo"""
+    global _grafo
+
+    if _grafo is not None:
+        return _grafo
+
+    with _lock:
+        if _grafo is not None:
+            return _grafo
+
+        try:
+            import rdflib
+        except ImportError:
+            raise RuntimeError("O modo offline requer o pacote rdflib (pip install rdflib)")
+
+        arquivos = _arquivos()
+        if not arquivos:
+            raise RuntimeError(f"Nenhum arquivo RDF encontrado em {DIRETORIO_OFFLINE}")
+
+        grafo = rdflib.Dataset(default_union=True)
+        for caminho in arquivos:
+            grafo.parse(caminho, format=FORMATOS[os.path.splitext(caminho)[1].lower()])
+        logger.info("Repositório offline carregado: %d triplas", len(grafo))
+        _grafo = grafo
+
+    return _grafo
+
+
+def _para_python(valor):
+    """URIs viram texto e literais viram o tipo Python correspondente"""
+    if valor is None:
+        return None
+    if hasattr(valor, 'toPython') and valor.__class__.__name__ == 'Literal':
+        return valor.toPython()
+    return str(valor)
+
+
+def consultar(sparql_query):
+    """Executa a consulta no grafo local, tratando SERVICE como um grupo comum"""
+    grafo = get_grafo()
+    with _lock_consulta:
+        resultado = grafo.query(_SERVICE.sub('{', sparql_query))
+        colunas = [str(v) for v in resultado.vars]
+        linhas = [[_para_python(valor) for valor in linha] for linha in resultado]
+    return pd.DataFrame(linhas, columns=colunas)
+
+
+SPARQL_EXTRATO_DBPEDIA = """
+PREFIX dbp: <http://dbpedia.org/property/>
+PREFIX dbo: <http://dbpedia.org/ontology/>
+
+CONSTRUCT {{
+    ?url_eng dbp:name ?nome.
+    ?url_eng dbo:state ?state.
+    ?state dbp:name ?estado.
+    ?url_eng dbp:state ?estado_dbp.
+}} WHERE {{
+    VALUES ?url_eng {{ {valores} }}
+    OPTIONAL {{ ?url_eng dbp:name ?nome. }}
+    OPTIONAL {{
+        ?url_eng dbo:state ?state.
+        ?state dbp:name ?estado.
+    }}
+    OPTIONAL {{ ?url_eng dbp:state ?estado_dbp. }}
+}}
+"""
+
+
+def preparar():
+    """Copia o dump do dbacademic e extrai do DBpedia os dados das universidades"""
+    import datadotworld as dw
+    import rdflib
+    import requests
+
+    from dados.dataset import DATASET_ID
+    from dados.dbpedia import DBPEDIA_ENDPOINT, SPARQL_UNIVERSIDADES, TAMANHO_LOTE
+
+    destino_dump = os.path.join(DIRETORIO_OFFLINE, 'dbacademic')
+    os.makedirs(destino_dump, exist_ok=True)
+
+    # Arquivos RDF do datapackage baixado pelo datadotworld
+    ds = dw.load_dataset(DATASET_ID, auto_update=True)
+    for recurso in ds.describe()['resources']:
+        nome_arquivo = os.path.basename(recurso['path'])
+        if os.path.splitext(nome_arquivo)[1].lower() in FORMATOS:
+            with open(os.path.join(destino_dump, nome_arquivo), 'wb') as arquivo:
+                arquivo.write(ds.raw_data[recurso['name']])
+
+    # Extrato do DBpedia com as universidades referenciadas no dump
+    global _grafo
+    _grafo = None
+    urls = consultar(SPARQL_UNIVERSIDADES)['url_eng'].dropna().unique().tolist()
+
+    extrato = rdflib.Graph()
+    for i in range(0, len(urls), TAMANHO_LOTE):
+        valores = ' '.join(f'<{url}>' for url in urls[i:i + TAMANHO_LOTE])
+        # POST de formulário: o lote não cabe com folga em uma URL
+        response = requests.post(
+            DBPEDIA_ENDPOINT,
+            data={'query': SPARQL_EXTRATO_DBPEDIA.format(valores=valores), 'format': 'text/turtle'},
+            headers={'Accept': 'text/turtle'},
+            timeout=120
+        )
+        response.raise_for_status()
+        extrato.parse(data=response.text, format='turtle')
+
+    extrato.serialize(os.path.join(DIRETORIO_OFFLINE, 'dbpedia.nt'), format='nt', encoding='utf-8')
+    _grafo = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prepara os arquivos RDF do modo offline")
+    parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    preparar()
+    logger.info("Arquivos offline prontos em %s", DIRETORIO_OFFLINE)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""Consultas paginadas, gravadas em disco à medida que chegam
+
+Listagens completas (todos os cursos com universidade e estado, por exemplo)
+não cabem com folga em uma única resposta do endpoint nem em um único
+DataFrame no processo do Streamlit. ``consultar_paginado`` percorre o
+resultado com ORDER BY / LIMIT / OFFSET, busca até ``MAX_CONCORRENCIA``
+páginas por vez pelo pool de consultas e grava cada página em um arquivo
+Parquet assim que ela chega. Em memória fica no máximo uma janela de páginas.
+
+Quem usa o resultado lê o arquivo sob demanda: em lotes (``ler_em_lotes``)
+ou convertido em CSV no disco (``exportar_csv``). O arquivo vale enquanto a
+versão do dataset não mudar e não passar de ``cache.TTL``.
+"""
+
+import functools
+import logging
+import os
+import threading
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dados import cache
+from dados.config import DIRETORIO_CACHE
+from dados.dataset import executar_consulta, versao_dataset
+from dados.executor import MAX_CONCORRENCIA, executar_em_paralelo
+
+DIRETORIO_LISTAGENS = os.path.join(DIRETORIO_CACHE, 'listagens')
+
+# Linhas pedidas ao endpoint em cada página
+TAMANHO_PAGINA = int(os.environ.get('DBACADEMIC_TAMANHO_PAGINA', 10000))
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+
+
+def _caminho(sparql_query, versao):
+    return os.path.join(DIRETORIO_LISTAGENS, f"{cache.chave(sparql_query, versao)}.parquet")
+
+
+def _valido(caminho):
+    try:
+        return time.time() - os.path.getmtime(caminho) <= cache.TTL
+    except OSError:
+        return False
+
+
+def _buscar_pagina(sparql_query, ordem, numero):
+    """Uma página do resultado; a ordenação estável garante páginas disjuntas"""
+    pagina = (
+        f"{sparql_query.rstrip()}\n"
+        f"ORDER BY {ordem}\n"
+        f"LIMIT {TAMANHO_PAGINA} OFFSET {numero * TAMANHO_PAGINA}"
+    )
+    return executar_consulta(pagina, usar_cache=False, nome='pagina_listagem')
+
+
+def _gravar(sparql_query, ordem, colunas, transformar, caminho):
+    """Busca as páginas em janelas e as grava, em ordem, em um Parquet temporário"""
+    temporario = f"{caminho}.{threading.get_ident()}.tmp"
+    os.makedirs(DIRETORIO_LISTAGENS, exist_ok=True)
+
+    escritor = None
+    linhas = gravadas = 0
+    inicio = time.monotonic()
+    try:
+        numero = 0
+        terminou = False
+        while not terminou:
+            janela = range(numero, numero + MAX_CONCORRENCIA)
+            paginas = executar_em_paralelo(
+                [functools.partial(_buscar_pagina, sparql_query, ordem, n) for n in janela]
+            )
+            numero += MAX_CONCORRENCIA
+
+            for df in paginas:
+                # Página incompleta: é a última (as seguintes da janela vêm vazias)
+                terminou = len(df) < TAMANHO_PAGINA
+
+                # Colunas OPTIONAL sem valor na página não vêm na resposta
+                df = df.reindex(columns=colunas)
+                if transformar is not None:
+                    df = transformar(df)
+                tabela = pa.Table.from_pandas(
+                    df.astype('string'),
+                    schema=pa.schema([(coluna, pa.string()) for coluna in df.columns]),
+                    preserve_index=False,
+                )
+                if escritor is None:
+                    escritor = pq.ParquetWriter(temporario, tabela.schema)
+                escritor.write_table(tabela)
+                linhas += len(df)
+                gravadas += 1
+                if terminou:
+                    break
+
+        escritor.close()
+        os.replace(temporario, caminho)
+    except Exception:
+        if escritor is not None:
+            escritor.close()
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+    logger.info("Listagem paginada: %d linhas em %d páginas, %.1fs",
+                linhas, gravadas, time.monotonic() - inicio)
+
+
+def consultar_paginado(sparql_query, ordem, colunas, transformar=None):
+    """Caminho do Parquet com o resultado completo de ``sparql_query``
+
+    ``ordem`` é a expressão do ORDER BY (deve identificar cada linha, para que
+    LIMIT/OFFSET não repita nem pule linhas) e ``colunas`` fixa as variáveis
+    esperadas. ``transformar``, se dado, recebe cada página como DataFrame
+    antes da gravação. Todas as colunas são gravadas como texto.
+    """
+    caminho = _caminho(sparql_query, versao_dataset())
+    if _valido(caminho):
+        return caminho
+
+    with _lock:
+        if not _valido(caminho):
+            _gravar(sparql_query, ordem, colunas, transformar, caminho)
+    return caminho
+
+
+def ler_em_lotes(caminho, colunas=None, tamanho=TAMANHO_PAGINA):
+    """Percorre o arquivo em DataFrames de até ``tamanho`` linhas"""
+    arquivo = pq.ParquetFile(caminho)
+    for lote in arquivo.iter_batches(batch_size=tamanho, columns=colunas):
+        yield lote.to_pandas()
+
+
+def exportar_csv(caminho):
+    """Converte o arquivo em CSV no disco, lote a lote, e retorna o caminho do CSV"""
+    destino = f"{os.path.splitext(caminho)[0]}.csv"
+    if os.path.exists(destino) and os.path.getmtime(destino) >= os.path.getmtime(caminho):
+        return destino
+
+    temporario = f"{destino}.{threading.get_ident()}.tmp"
+    try:
+        with open(temporario, 'w', encoding='utf-8', newline='') as saida:
+            # O cabeçalho vem do esquema, para sair mesmo sem nenhuma linha
+            saida.write(','.join(pq.read_schema(caminho).names) + '\n')
+            for df in ler_em_lotes(caminho):
+                df.to_csv(saida, index=False, header=False)
+        os.replace(temporario, destino)
+    except Exception:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+    return destino
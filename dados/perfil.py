@@ -0,0 +1,244 @@
+"""Perfil de tempo de cada execução (rerun) das páginas
+
+Desligado por padrão. Liga com ``?perfil=1`` na URL da página ou com
+``DBACADEMIC_PERFIL=1`` para todas as sessões. Com o perfil ligado, cada
+rerun mede as seções nomeadas da página (``secao``) e cada gráfico e tabela
+exibidos por ``grafico`` e ``tabela`` (no lugar de ``st.plotly_chart`` e
+``st.dataframe``), e ``mostrar_relatorio`` exibe no fim da página um gráfico
+em chamas (icicle) e a tabela dos tempos, além de uma linha JSON no logger
+``dados.perfil``.
+
+O tempo que não está em nenhuma seção filha aparece como tempo próprio da
+seção: na raiz, é o processamento e o layout fora das seções nomeadas.
+
+Funções de ``st.fragment`` decoradas com ``fragmento`` são uma seção no rerun
+da página inteira e, quando só o fragmento roda de novo, têm o próprio
+relatório, exibido dentro do fragmento.
+"""
+
+import contextlib
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+import streamlit as st
+
+# Liga o perfil em todas as sessões
+PERFIL_SEMPRE = os.environ.get('DBACADEMIC_PERFIL', '0') == '1'
+
+# Parâmetro da URL que liga o perfil em uma sessão (?perfil=1)
+PARAMETRO_URL = 'perfil'
+
+# Execuções anteriores mantidas na sessão para comparação
+EXECUCOES_GUARDADAS = 10
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class _Secao:
+    """Trecho medido de um rerun e as seções dentro dele"""
+
+    __slots__ = ('nome', 'inicio', 'segundos', 'filhos')
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.inicio = time.perf_counter()
+        self.segundos = None
+        self.filhos = []
+
+    def fechar(self):
+        self.segundos = time.perf_counter() - self.inicio
+
+    def proprio(self):
+        return max(self.segundos - sum(f.segundos for f in self.filhos), 0.0)
+
+
+def ativo():
+    """Se o perfil está ligado para a sessão atual"""
+    if PERFIL_SEMPRE:
+        return True
+    try:
+        return st.query_params.get(PARAMETRO_URL, '') in ('1', 'true', 'sim')
+    except Exception:
+        # Fora de uma sessão do Streamlit (linha de comando, benchmarks)
+        return False
+
+
+def iniciar(pagina):
+    """Começa a medir o rerun; chamar no início da página, após ``set_page_config``"""
+    _local.pilha = None
+    if not ativo():
+        return
+    _local.pilha = [_Secao(pagina)]
+
+
+@contextlib.contextmanager
+def secao(nome):
+    """Mede o bloco como uma seção do rerun (não faz nada com o perfil desligado)"""
+    pilha = getattr(_local, 'pilha', None)
+    if not pilha:
+        yield
+        return
+
+    atual = _Secao(nome)
+    pilha[-1].filhos.append(atual)
+    pilha.append(atual)
+    try:
+        yield
+    finally:
+        atual.fechar()
+        # st.stop() dentro da seção também passa por aqui
+        if pilha and pilha[-1] is atual:
+            pilha.pop()
+
+
+def fragmento(funcao):
+    """Decorador que mede uma função de ``st.fragment`` (aplicar abaixo dele)
+
+    As páginas põem em fragmentos as seções com filtros próprios: mudar um
+    desses filtros roda de novo só o fragmento, não a página inteira.
+    """
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        if getattr(_local, 'pilha', None) or not ativo():
+            with secao(f"🧩 {funcao.__name__}"):
+                return funcao(*args, **kwargs)
+
+        # Rerun só do fragmento: a raiz do perfil é o próprio fragmento
+        iniciar(f"🧩 {funcao.__name__}")
+        try:
+            resultado = funcao(*args, **kwargs)
+        except BaseException:
+            _local.pilha = None
+            raise
+        mostrar_relatorio('fragmento')
+        return resultado
+
+    return envoltorio
+
+
+def _origem_chamada():
+    """``arquivo:linha`` do código da página que pediu o gráfico ou a tabela"""
+    quadro = sys._getframe(2)
+    while quadro is not None:
+        arquivo = quadro.f_code.co_filename
+        if not arquivo.endswith((os.path.join('dados', 'perfil.py'), os.path.join('dados', 'formatacao.py'))):
+            return f"{os.path.basename(arquivo)}:{quadro.f_lineno}"
+        quadro = quadro.f_back
+    return '?'
+
+
+def grafico(figura, **opcoes):
+    """``st.plotly_chart`` medido como uma seção com o título do gráfico"""
+    if not getattr(_local, 'pilha', None):
+        return st.plotly_chart(figura, **opcoes)
+    titulo = getattr(getattr(getattr(figura, 'layout', None), 'title', None), 'text', None)
+    with secao(f"📊 {titulo or 'Gráfico'} ({_origem_chamada()})"):
+        return st.plotly_chart(figura, **opcoes)
+
+
+def tabela(dados, **opcoes):
+    """``st.dataframe`` medido como uma seção com o número de linhas"""
+    if not getattr(_local, 'pilha', None):
+        return st.dataframe(dados, **opcoes)
+    linhas = f", {len(dados)} linhas" if hasattr(dados, '__len__') else ''
+    with secao(f"📋 Tabela ({_origem_chamada()}{linhas})"):
+        return st.dataframe(dados, **opcoes)
+
+
+def _linhas_relatorio(raiz):
+    """Seções em pré-ordem: (id, pai, nome, profundidade, secao)"""
+    linhas = []
+
+    def visitar(atual, pai, caminho, profundidade):
+        linhas.append((caminho, pai, atual.nome, profundidade, atual))
+        for i, filho in enumerate(atual.filhos):
+            visitar(filho, caminho, f"{caminho}/{i}", profundidade + 1)
+
+    visitar(raiz, '', '0', 0)
+    return linhas
+
+
+def mostrar_relatorio(execucao=None):
+    """Encerra a medição do rerun e exibe o perfil no fim da página
+
+    ``execucao`` identifica o rerun no relatório (por exemplo, a opção
+    escolhida no menu lateral).
+    """
+    pilha = getattr(_local, 'pilha', None)
+    if not pilha:
+        return
+    _local.pilha = None
+    raiz = pilha[0]
+    raiz.fechar()
+    if execucao:
+        raiz.nome = f"{raiz.nome} · {execucao}"
+
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    from dados import formatacao
+
+    linhas = _linhas_relatorio(raiz)
+    df = pd.DataFrame({
+        'id': [l[0] for l in linhas],
+        'pai': [l[1] for l in linhas],
+        'Seção': [('  ' * (l[3] - 1) + '↳ ' if l[3] else '') + l[2] for l in linhas],
+        'nome': [l[2] for l in linhas],
+        'total_ms': [l[4].segundos * 1000 for l in linhas],
+        'proprio_ms': [l[4].proprio() * 1000 for l in linhas],
+    })
+    df['percentual'] = df['total_ms'] / max(raiz.segundos * 1000, 1e-9) * 100
+
+    logger.info(json.dumps({
+        'pagina': raiz.nome,
+        'total_ms': round(raiz.segundos * 1000, 1),
+        'secoes': {nome: round(ms, 1) for nome, ms in zip(df['nome'][1:], df['total_ms'][1:])},
+    }, ensure_ascii=False))
+
+    # Seção de primeiro nível mais lenta, para comparar os reruns
+    filhos = sorted(raiz.filhos, key=lambda f: f.segundos, reverse=True)
+    anteriores = st.session_state.setdefault('_perfil_execucoes', [])
+    anteriores.insert(0, {
+        'Execução': raiz.nome,
+        'Total (ms)': raiz.segundos * 1000,
+        'Mais lenta': filhos[0].nome if filhos else '',
+    })
+    del anteriores[EXECUCOES_GUARDADAS:]
+
+    with st.expander(f"⏱️ Perfil desta execução: {raiz.segundos * 1000:,.0f} ms", expanded=True):
+        # Gráfico em chamas: a raiz embaixo, cada seção sobre a que a contém
+        figura = go.Figure(go.Icicle(
+            ids=df['id'], parents=df['pai'], labels=df['nome'], values=df['total_ms'],
+            branchvalues='total', tiling={'orientation': 'v', 'flip': 'y'},
+            texttemplate='%{label}<br>%{value:.1f} ms',
+            hovertemplate='%{label}<br>%{value:.1f} ms (%{percentRoot:.1%})<extra></extra>',
+        ))
+        figura.update_layout(height=120 + 60 * int(max(l[3] for l in linhas) + 1),
+                             margin={'t': 10, 'l': 10, 'r': 10, 'b': 10})
+        st.plotly_chart(figura, use_container_width=True)
+
+        formatacao.mostrar_tabela(
+            df,
+            ['Seção', 'total_ms', 'proprio_ms', 'percentual'],
+            column_config={
+                'Seção': st.column_config.TextColumn('Seção'),
+                'total_ms': formatacao.coluna_decimal('Total (ms)'),
+                'proprio_ms': formatacao.coluna_decimal('Próprio (ms)'),
+                'percentual': formatacao.coluna_percentual('% do rerun', casas=1),
+            },
+        )
+
+        if len(anteriores) > 1:
+            st.markdown("**Execuções recentes nesta sessão**")
+            formatacao.mostrar_tabela(
+                pd.DataFrame(anteriores),
+                ['Execução', 'Total (ms)', 'Mais lenta'],
+                column_config={'Total (ms)': formatacao.coluna_decimal('Total (ms)')},
+            )
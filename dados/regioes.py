@@ -0,0 +1,102 @@
+"""Classificação de universidades em regiões brasileiras pelo nome
+
+As palavras-chave de cada região (em português e os nomes oficiais em
+inglês) são compiladas em uma regex por região. As regiões são testadas na
+ordem de ``PALAVRAS_POR_REGIAO``, que define a prioridade quando um nome
+casa com mais de uma. Cada nome distinto é classificado uma única vez.
+"""
+
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+NAO_IDENTIFICADO = 'Não Identificado'
+
+# Ordem das regiões = prioridade na classificação
+PALAVRAS_POR_REGIAO = {
+    'Sudeste': [
+        # Nomes em português
+        'usp', 'unicamp', 'unesp', 'ufrj', 'uerj', 'uff', 'ufmg', 'puc-mg', 'ufes', 'unifesp', 'puc-sp', 'mackenzie',
+        'são carlos', 'viçosa', 'itajubá', 'são joão del-rei',
+        # Nomes em inglês das universidades federais
+        'federal university of viçosa', 'federal university of são carlos', 'federal university of itajubá',
+        'federal university of são joão del-rei', 'federal fluminense university', 'fluminense university',
+        'university of são paulo', 'federal university of minas gerais', 'federal university of rio de janeiro',
+        'federal university of espírito santo'
+    ],
+    'Sul': [
+        # Nomes em português
+        'ufrgs', 'ufpr', 'ufsc', 'puc-rs', 'unisinos', 'furb', 'udesc', 'uem', 'uel', 'pelotas', 'fronteira sul',
+        'utfpr', 'paraná',
+        # Nomes em inglês das universidades federais
+        'federal university of pelotas', 'federal university of technology – paraná', 'federal university of paraná',
+        'federal university of rio grande do sul', 'federal university of santa catarina',
+        'federal university of fronteira sul', 'federal university of health sciences of porto',
+        'health sciences of porto'
+    ],
+    'Nordeste': [
+        # Nomes em português
+        'ufba', 'ufpe', 'ufc', 'ufpb', 'ufal', 'ufrn', 'ufse', 'ufpi', 'ufma', 'uece', 'maranhão', 'ceará', 'bahia',
+        'pernambuco', 'piauí', 'rio grande do norte', 'paraíba', 'alagoas', 'sergipe',
+        # Nomes em inglês das universidades federais
+        'federal university of maranhão', 'ceará federal university', 'federal university of ceará',
+        'federal university of bahia', 'federal university of pernambuco', 'federal university of piauí',
+        'federal university of rio grande do norte', 'university for international integration',
+        'federal university of paraíba', 'federal university of alagoas', 'federal university of sergipe'
+    ],
+    'Centro-Oeste': [
+        # Nomes em português
+        'unb', 'ufg', 'ufmt', 'ufms', 'ucb', 'goiás', 'mato grosso', 'brasília',
+        # Nomes em inglês das universidades federais
+        'federal university of goiás', 'federal university of mato grosso do sul',
+        'federal university of mato grosso', 'university of brasília'
+    ],
+    'Norte': [
+        # Nomes em português
+        'ufam', 'ufpa', 'ufac', 'ufrr', 'unir', 'ufap', 'uft', 'amazonas', 'pará', 'acre', 'tocantins',
+        'rondônia', 'roraima', 'amapá',
+        # Nomes em inglês das universidades federais
+        'federal university of amazonas', 'federal university of pará', 'federal university of acre',
+        'federal university of roraima', 'federal university of tocantins', 'federal university of amapá',
+        'federal university of rondônia'
+    ],
+}
+
+
+class ClassificadorRegiao:
+    """Classificador de nomes de universidades em regiões, com memória dos já vistos"""
+
+    def __init__(self, palavras_por_regiao):
+        self.regioes = list(palavras_por_regiao)
+        # Palavras mais longas primeiro apenas para a regex parar mais cedo
+        self._padroes = [
+            re.compile('|'.join(re.escape(p) for p in sorted(palavras, key=len, reverse=True)))
+            for palavras in palavras_por_regiao.values()
+        ]
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def _classificar_novos(self, nomes):
+        """Classifica, de uma vez, nomes ainda não vistos"""
+        minusculos = pd.Series(nomes, dtype=object).str.lower()
+        condicoes = [minusculos.str.contains(padrao, regex=True).to_numpy() for padrao in self._padroes]
+        regioes = np.select(condicoes, self.regioes, default=NAO_IDENTIFICADO)
+        with self._lock:
+            self._memo.update(zip(nomes, regioes))
+
+    def classificar_serie(self, nomes):
+        """Região de cada nome da Series, em uma passada sobre os nomes distintos"""
+        novos = [n for n in pd.unique(nomes.dropna()) if n not in self._memo]
+        if novos:
+            self._classificar_novos(novos)
+        return nomes.map(self._memo).fillna(NAO_IDENTIFICADO)
+
+
+_classificador = ClassificadorRegiao(PALAVRAS_POR_REGIAO)
+
+
+def mapear_regioes_brasil(universidades):
+    """Região brasileira de cada universidade de uma Series de nomes (português e inglês)"""
+    return _classificador.classificar_serie(universidades)
@@ -0,0 +1,58 @@
+"""Rótulos de exibição para graus de formação e sexo dos docentes
+
+Os rótulos são calculados uma vez por valor distinto e devolvidos como
+``pd.Categorical``: a tabela base guarda só os códigos, e os groupby e
+pivot_table das páginas trabalham sobre inteiros em vez de strings.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+NAO_INFORMADO = "Não informado"
+SEM_SEXO = "Sem sexo registrado"
+
+ROTULOS_GRAU = {
+    "https://w3id.org/ccso/ccso#Doctorate": "Doutorado",
+    "https://w3id.org/ccso/ccso#Masters": "Mestrado",
+    "https://w3id.org/ccso/ccso#Bachelors": "Graduação",
+    "https://w3id.org/ccso/ccso#PostDoc": "Pós-Doutorado",
+}
+
+# Código usado na base (nulo vira 'N') e rótulo de cada sexo
+ROTULOS_SEXO = {
+    'M': 'Masculino',
+    'F': 'Feminino',
+    'N': SEM_SEXO,
+}
+
+
+@lru_cache(maxsize=None)
+def rotulo_grau(uri):
+    """Nome em português de um grau de formação"""
+    return ROTULOS_GRAU.get(uri, uri.split('#')[-1])
+
+
+def _categorizar(serie, rotular, rotulo_nulo):
+    """Aplica ``rotular`` uma vez por valor distinto e monta o Categorical"""
+    codigos, valores = pd.factorize(serie)
+
+    # O código -1 (nulo) aponta para o último rótulo
+    rotulos = [rotular(v) for v in valores] + [rotulo_nulo]
+    categorias, posicoes = np.unique(rotulos, return_inverse=True)
+
+    return pd.Series(
+        pd.Categorical.from_codes(posicoes[codigos], categorias),
+        index=serie.index
+    )
+
+
+def rotular_graus(serie):
+    """URIs de grau de formação como rótulos categóricos"""
+    return _categorizar(serie, rotulo_grau, NAO_INFORMADO)
+
+
+def rotular_sexos(serie):
+    """Códigos de sexo como rótulos categóricos (nulo ou desconhecido: sem registro)"""
+    return _categorizar(serie, lambda codigo: ROTULOS_SEXO.get(codigo, SEM_SEXO), SEM_SEXO)
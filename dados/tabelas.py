@@ -0,0 +1,13 @@
+"""Acabamento comum das tabelas devolvidas às páginas"""
+
+import numpy as np
+
+
+def ranquear(df, coluna):
+    """Ordena por ``coluna`` (maior primeiro) e acrescenta Posição e Percentual"""
+    df = df.sort_values(coluna, ascending=False, ignore_index=True)
+    total = df[coluna].sum()
+    return df.assign(
+        Posição=np.arange(1, len(df) + 1),
+        Percentual=(df[coluna] / total * 100).round(2) if total else 0.0
+    )
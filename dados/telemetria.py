@@ -0,0 +1,321 @@
+"""Telemetria das consultas e transformações da camada de dados
+
+Cada operação instrumentada (consulta SPARQL, requisição ao DBpedia, tabela
+em memória, agregação derivada) registra tempo de parede, linhas, bytes
+recebidos, acerto ou falha de cache, idade da entrada servida e erros. Os
+registros são somados por ``(origem, nome)`` no processo e ficam disponíveis:
+
+- no painel da barra lateral (``mostrar_painel``);
+- no log ``dados.telemetria``, uma linha JSON por operação;
+- em formato de texto do Prometheus (``texto_prometheus``), servido em
+  ``/metrics`` quando ``DBACADEMIC_METRICAS_PORTA`` está definida (na
+  interface ``DBACADEMIC_METRICAS_HOST``, por padrão só ``127.0.0.1``).
+
+Origens: ``data.world``, ``endpoint`` ou ``offline`` (consultas SPARQL, com
+acerto ou falha do cache em disco), ``dbpedia``, ``memoria`` (tabelas de
+``servir_e_revalidar``) e ``transformacao`` (agregações de ``derivado``).
+"""
+
+import collections
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Porta do endpoint /metrics (formato Prometheus); vazio não inicia o servidor
+PORTA_METRICAS = os.environ.get('DBACADEMIC_METRICAS_PORTA', '')
+
+# Interface do endpoint /metrics; só a máquina local por padrão
+HOST_METRICAS = os.environ.get('DBACADEMIC_METRICAS_HOST', '127.0.0.1')
+
+# Operações recentes mantidas para o painel
+TAMANHO_HISTORICO = 200
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_agregados = {}
+_historico = collections.deque(maxlen=TAMANHO_HISTORICO)
+_local = threading.local()
+_servidor_iniciado = False
+
+
+class _Agregado:
+    """Totais de uma operação desde o início do processo"""
+
+    __slots__ = ('chamadas', 'erros', 'acertos', 'falhas', 'segundos', 'maximo', 'ultimo',
+                 'linhas', 'bytes', 'idade', 'atualizado_em')
+
+    def __init__(self):
+        self.chamadas = self.erros = self.acertos = self.falhas = 0
+        self.segundos = self.maximo = self.ultimo = 0.0
+        self.linhas = self.idade = None
+        self.bytes = 0
+        self.atualizado_em = None
+
+
+def registrar(origem, nome, segundos, linhas=None, bytes=None, cache=None, idade=None, erro=None):
+    """Soma uma operação aos totais e a grava no histórico e no log
+
+    ``cache`` é ``'acerto'``, ``'falha'`` ou None (operação sem cache) e
+    ``idade``, em segundos, a da entrada servida do cache.
+    """
+    agora = time.time()
+    with _lock:
+        agregado = _agregados.get((origem, nome))
+        if agregado is None:
+            agregado = _agregados[(origem, nome)] = _Agregado()
+        agregado.chamadas += 1
+        agregado.segundos += segundos
+        agregado.ultimo = segundos
+        agregado.maximo = max(agregado.maximo, segundos)
+        agregado.atualizado_em = agora
+        if erro is not None:
+            agregado.erros += 1
+        if cache == 'acerto':
+            agregado.acertos += 1
+        elif cache == 'falha':
+            agregado.falhas += 1
+        if linhas is not None:
+            agregado.linhas = linhas
+        if bytes:
+            agregado.bytes += bytes
+        if idade is not None:
+            agregado.idade = idade
+
+        evento = {
+            'em': agora, 'origem': origem, 'nome': nome, 'segundos': round(segundos, 6),
+            'linhas': linhas, 'bytes': bytes, 'cache': cache,
+            'idade': None if idade is None else round(idade, 1),
+            'erro': None if erro is None else f'{type(erro).__name__}: {erro}',
+        }
+        _historico.append(evento)
+
+    # Acertos de cache são frequentes e baratos: só aparecem com DEBUG
+    nivel = logging.DEBUG if cache == 'acerto' and erro is None else logging.INFO
+    if erro is not None:
+        nivel = logging.WARNING
+    if logger.isEnabledFor(nivel):
+        logger.log(nivel, json.dumps(evento, ensure_ascii=False))
+
+
+@contextlib.contextmanager
+def medir(origem, nome, **campos):
+    """Mede o bloco e registra a operação, inclusive quando ele falha
+
+    O dicionário devolvido aceita ``linhas``, ``bytes``, ``cache`` e ``idade``;
+    código chamado dentro do bloco pode preenchê-lo com ``anotar``.
+    """
+    evento = dict(campos)
+    pilha = getattr(_local, 'pilha', None)
+    if pilha is None:
+        pilha = _local.pilha = []
+    pilha.append(evento)
+
+    inicio = time.perf_counter()
+    try:
+        yield evento
+    except Exception as erro:
+        pilha.pop()
+        registrar(origem, nome, time.perf_counter() - inicio, erro=erro, **evento)
+        raise
+    pilha.pop()
+    registrar(origem, nome, time.perf_counter() - inicio, **evento)
+
+
+def anotar(**campos):
+    """Completa a operação em andamento na thread (``bytes`` é somado)"""
+    pilha = getattr(_local, 'pilha', None)
+    if not pilha:
+        return
+    evento = pilha[-1]
+    for campo, valor in campos.items():
+        if campo == 'bytes':
+            evento['bytes'] = (evento.get('bytes') or 0) + valor
+        else:
+            evento[campo] = valor
+
+
+def linhas_de(valor):
+    """Número de linhas de um resultado tabular, ou None"""
+    return len(valor) if hasattr(valor, 'columns') or hasattr(valor, 'dtype') else None
+
+
+def resumo():
+    """Lista de dicionários com os totais de cada ``(origem, nome)``"""
+    with _lock:
+        itens = list(_agregados.items())
+    return [
+        {
+            'origem': origem,
+            'nome': nome,
+            'chamadas': a.chamadas,
+            'erros': a.erros,
+            'acertos': a.acertos,
+            'falhas': a.falhas,
+            'segundos': a.segundos,
+            'ultimo': a.ultimo,
+            'maximo': a.maximo,
+            'linhas': a.linhas,
+            'bytes': a.bytes,
+            'idade': a.idade,
+            'atualizado_em': a.atualizado_em,
+        }
+        for (origem, nome), a in sorted(itens)
+    ]
+
+
+def historico():
+    """Operações mais recentes, da mais nova para a mais antiga"""
+    with _lock:
+        return list(reversed(_historico))
+
+
+def limpar():
+    """Zera os totais e o histórico"""
+    with _lock:
+        _agregados.clear()
+        _historico.clear()
+
+
+def _rotulos(item):
+    nome = item['nome'].replace('\\', '\\\\').replace('"', '\\"')
+    return f'origem="{item["origem"]}",nome="{nome}"'
+
+
+def texto_prometheus():
+    """Totais no formato de exposição em texto do Prometheus"""
+    itens = resumo()
+    metricas = [
+        ('dbacademic_operacoes_total', 'counter', 'Operações executadas', 'chamadas'),
+        ('dbacademic_erros_total', 'counter', 'Operações que terminaram com erro', 'erros'),
+        ('dbacademic_cache_acertos_total', 'counter', 'Resultados servidos do cache', 'acertos'),
+        ('dbacademic_cache_falhas_total', 'counter', 'Resultados calculados ou consultados de novo', 'falhas'),
+        ('dbacademic_operacao_segundos_total', 'counter', 'Tempo de parede somado, em segundos', 'segundos'),
+        ('dbacademic_operacao_segundos_max', 'gauge', 'Maior tempo de uma operação, em segundos', 'maximo'),
+        ('dbacademic_bytes_total', 'counter', 'Bytes recebidos do endpoint ou lidos do cache', 'bytes'),
+        ('dbacademic_linhas', 'gauge', 'Linhas do último resultado', 'linhas'),
+        ('dbacademic_cache_idade_segundos', 'gauge', 'Idade da última entrada servida do cache', 'idade'),
+    ]
+    linhas = []
+    for metrica, tipo, ajuda, campo in metricas:
+        linhas.append(f'# HELP {metrica} {ajuda}')
+        linhas.append(f'# TYPE {metrica} {tipo}')
+        for item in itens:
+            if item[campo] is not None:
+                linhas.append(f'{metrica}{{{_rotulos(item)}}} {item[campo]:g}')
+    return '\n'.join(linhas) + '\n'
+
+
+class _TratadorMetricas(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        corpo = texto_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def iniciar_servidor_metricas(porta=PORTA_METRICAS, host=HOST_METRICAS):
+    """Serve ``/metrics`` em segundo plano, uma única vez por processo"""
+    global _servidor_iniciado
+
+    if not porta:
+        return
+    with _lock:
+        if _servidor_iniciado:
+            return
+        _servidor_iniciado = True
+
+    try:
+        servidor = ThreadingHTTPServer((host, int(porta)), _TratadorMetricas)
+    except OSError:
+        # Outro processo (outra instância do Streamlit) já usa a porta
+        logger.warning("Endereço %s:%s de métricas indisponível", host, porta)
+        return
+    threading.Thread(target=servidor.serve_forever, daemon=True, name='metricas').start()
+
+
+# Origens que separam o tempo de uma página: rede, DBpedia e pandas. As
+# tabelas em memória (``memoria``) englobam consultas e não entram na soma.
+ORIGENS_PAINEL = {
+    'data.world': '📡 data.world',
+    'endpoint': '📡 Endpoint',
+    'offline': '💾 Offline',
+    'dbpedia': '🌐 DBpedia',
+    'transformacao': '🐼 pandas',
+}
+
+
+def mostrar_painel():
+    """Painel de telemetria na barra lateral"""
+    import pandas as pd
+    import streamlit as st
+
+    from dados import formatacao
+
+    st.sidebar.markdown("### 📊 Status do Sistema")
+    df = pd.DataFrame(resumo())
+    if df.empty:
+        st.sidebar.caption("Nenhuma consulta registrada neste processo ainda.")
+        return
+
+    consultas = df[df['origem'].isin(['data.world', 'endpoint', 'offline'])]
+    acertos, falhas = int(consultas['acertos'].sum()), int(consultas['falhas'].sum())
+    erros = int(df['erros'].sum())
+
+    col1, col2 = st.sidebar.columns(2)
+    with col1:
+        taxa = f"{acertos / (acertos + falhas):.0%}" if acertos + falhas else "—"
+        st.metric("🔄 Cache", taxa, f"{acertos + falhas} consultas", delta_color="off",
+                  help="Consultas SPARQL servidas do cache em disco")
+    with col2:
+        st.metric("📡 SPARQL", "Online" if not erros else f"{erros} erros",
+                  f"{consultas['segundos'].sum():.1f}s em consultas", delta_color="off")
+
+    # Onde o tempo foi gasto desde o início do processo
+    tempos = df.groupby('origem')['segundos'].sum()
+    colunas = st.sidebar.columns(3)
+    presentes = [origem for origem in ORIGENS_PAINEL if origem in tempos.index]
+    for coluna, origem in zip(colunas * 2, presentes):
+        coluna.metric(ORIGENS_PAINEL[origem], f"{tempos[origem]:.2f}s")
+
+    with st.sidebar.expander("🔎 Detalhes por operação"):
+        df = df.assign(
+            ultimo_ms=df['ultimo'] * 1000,
+            maximo_ms=df['maximo'] * 1000,
+            kb=df['bytes'] / 1024,
+        ).sort_values('segundos', ascending=False)
+        formatacao.mostrar_tabela(
+            df,
+            ['origem', 'nome', 'chamadas', 'acertos', 'falhas', 'erros',
+             'ultimo_ms', 'maximo_ms', 'segundos', 'linhas', 'kb', 'idade'],
+            column_config={
+                'origem': st.column_config.TextColumn('Origem'),
+                'nome': st.column_config.TextColumn('Operação'),
+                'chamadas': formatacao.coluna_inteiro('Chamadas'),
+                'acertos': formatacao.coluna_inteiro('Cache ✓'),
+                'falhas': formatacao.coluna_inteiro('Cache ✗'),
+                'erros': formatacao.coluna_inteiro('Erros'),
+                'ultimo_ms': formatacao.coluna_decimal('Última (ms)'),
+                'maximo_ms': formatacao.coluna_decimal('Máx. (ms)'),
+                'segundos': formatacao.coluna_decimal('Total (s)', casas=2),
+                'linhas': formatacao.coluna_inteiro('Linhas'),
+                'kb': formatacao.coluna_decimal('KB'),
+                'idade': formatacao.coluna_decimal('Idade cache (s)', casas=0),
+            },
+        )
+
+        recentes = [evento for evento in historico() if evento['erro']][:5]
+        for evento in recentes:
+            st.error(f"{evento['origem']} · {evento['nome']}: {evento['erro']}")
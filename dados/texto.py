@@ -0,0 +1,13 @@
+"""Normalização de textos para comparações e buscas"""
+
+import re
+import unicodedata
+
+# Diacríticos separados pela decomposição NFKD (acentos, til, cedilha)
+_DIACRITICOS = re.compile('[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]')
+
+
+def sem_acentos(texto):
+    """Texto em minúsculas, sem acentos e sem espaços nas pontas"""
+    texto = unicodedata.normalize('NFKD', str(texto))
+    return _DIACRITICOS.sub('', texto).lower().strip()
@@ -3,12 +3,14 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import datadotworld as dw
 import numpy as np
-import shutil
-import os
 import re
 
+from dados import aquecedor, busca, cache, cursos, formatacao, paginacao, perfil, telemetria
+from dados.geografia import ESTADOS_BRASIL
+
+pd.set_option('mode.copy_on_write', True)
+
 # Configuração da página
 st.set_page_config(
     page_title="Cursos - Análise Acadêmica",
@@ -16,347 +18,70 @@ st.set_page_config(
     layout="wide"
 )
 
+# Garante o aquecimento do cache mesmo quando a página é aberta diretamente
+aquecedor.iniciar_em_segundo_plano()
+telemetria.iniciar_servidor_metricas()
+
+# Perfil de tempo do rerun, ligado com ?perfil=1 ou DBACADEMIC_PERFIL=1
+perfil.iniciar('Cursos')
+
 # Funções para executar consultas SPARQL
-@st.cache_data(ttl=3600)
-def get_cursos_por_universidade():
-    """Consulta cursos por universidade"""
+def get_fatos_cursos():
+    """Consulta a tabela base de cursos com universidade e estado"""
     try:
-        ds = dw.load_dataset('dbacademic/dbacademic', force_update=True)
-        
-        sparql_query = """
-        prefix ccso: <https://w3id.org/ccso/ccso#> 
-        PREFIX dbp: <http://dbpedia.org/property/> 
-        PREFIX dbo: <http://dbpedia.org/ontology/> 
-        prefix foaf: <http://xmlns.com/foaf/0.1/>
-        prefix owl: <http://www.w3.org/2002/07/owl#>
-
-        SELECT ?Universidade (count (DISTINCT ?s) as ?Cursos) where {
-            ?s a ccso:ProgramofStudy. 
-            ?s ccso:belongsTo ?url_pt. 
-            ?url_pt owl:sameAs ?url_eng.
-            
-            service <http://dbpedia.org/sparql> { 
-                ?url_eng dbp:name ?Universidade. 
-            }
-        } 
-        GROUP BY ?Universidade 
-        ORDER BY DESC (?Cursos)
-        """
-        
-        results = dw.query('dbacademic/dbacademic', sparql_query, query_type='sparql')
-        return results.dataframe, sparql_query
+        return cursos.get_fatos_cursos(), cursos.SPARQL_FATOS_CURSOS
         
     except Exception as e:
-        # Tenta limpar o cache se erro for de pasta existente
-        if "already exists" in str(e):
-            cache_path = os.path.expanduser("~/.dw/cache/dbacademic/dbacademic")
-            if os.path.exists(cache_path):
-                shutil.rmtree(cache_path)
-                st.warning("Cache local limpo automaticamente. Recarregue a página.")
-        st.error(f"Erro ao consultar cursos por universidade: {str(e)}")
+        st.error(f"Erro ao consultar cursos: {str(e)}")
         return pd.DataFrame(), ""
 
-@st.cache_data(ttl=3600)
+def get_cursos_por_universidade():
+    """Consulta cursos por universidade"""
+    df_fatos, sparql_query = get_fatos_cursos()
+    if df_fatos.empty:
+        return df_fatos, sparql_query
+    return cursos.por_universidade(df_fatos), sparql_query
+
 def get_quantidade_cursos():
     """Consulta quantidade total de cursos"""
-    try:
-        ds = dw.load_dataset('dbacademic/dbacademic', force_update=True)
-        
-        sparql_query = """
-        PREFIX : <https://dbacademic.linked.data.world/d/dbacademic/> 
-        PREFIX ds-institutos: <https://dbacademic.linked.data.world/d/institutos/> 
-        PREFIX ds-universidades: <https://dbacademic.linked.data.world/d/universidades/> 
-        prefix ccso: <https://w3id.org/ccso/ccso#>
-        
-        SELECT (COUNT(distinct ?cursos) AS ?qtcursos)
-        WHERE { 
-            ?cursos a ccso:ProgramofStudy.
-        }
-        """
-        
-        results = dw.query('dbacademic/dbacademic', sparql_query, query_type='sparql')
-        return results.dataframe, sparql_query
-        
-    except Exception as e:
-        st.error(f"Erro ao consultar quantidade de cursos: {str(e)}")
-        return pd.DataFrame(), ""
+    df_fatos, sparql_query = get_fatos_cursos()
+    if df_fatos.empty:
+        return df_fatos, sparql_query
+    return cursos.quantidade(df_fatos), sparql_query
 
-@st.cache_data(ttl=3600)
 def get_cursos_engenharia_computacao():
     """Consulta cursos de engenharia de computação"""
-    try:
-        ds = dw.load_dataset('dbacademic/dbacademic', force_update=True)
-        
-        sparql_query = """
-        PREFIX : <https://dbacademic.linked.data.world/d/dbacademic/> 
-        PREFIX ds-institutos: <https://dbacademic.linked.data.world/d/institutos/> 
-        PREFIX ds-universidades: <https://dbacademic.linked.data.world/d/universidades/> 
-        prefix ccso: <https://w3id.org/ccso/ccso#>
-        
-        SELECT ?cursos ?name ?u
-        WHERE { 
-            ?cursos a ccso:ProgramofStudy. 
-            ?cursos ccso:psName ?name. 
-            ?cursos ccso:belongsTo ?u.
-            FILTER regex(?name, "ENGENHARIA D. COMPUTAÇÃO", "i" )
-        }
-        """
-        
-        results = dw.query('dbacademic/dbacademic', sparql_query, query_type='sparql')
-        return results.dataframe, sparql_query
-        
-    except Exception as e:
-        st.error(f"Erro ao consultar cursos de engenharia de computação: {str(e)}")
-        return pd.DataFrame(), ""
-
-@st.cache_data(ttl=3600)
-def get_cursos_engenharia_por_estado(estado="São Paulo"):
-    """Consulta cursos de engenharia por estado"""
-    try:
-        ds = dw.load_dataset('dbacademic/dbacademic', force_update=True)
-        
-        sparql_query = f"""
-        PREFIX : <https://dbacademic.linked.data.world/d/dbacademic/> 
-        PREFIX ds-institutos: <https://dbacademic.linked.data.world/d/institutos/> 
-        PREFIX ds-universidades: <https://dbacademic.linked.data.world/d/universidades/> 
-        PREFIX ccso: <https://w3id.org/ccso/ccso#> 
-        PREFIX owl: <http://www.w3.org/2002/07/owl#> 
-        PREFIX dbp: <http://dbpedia.org/property/> 
-        PREFIX dbo: <http://dbpedia.org/ontology/>
-        
-        SELECT ?name (COUNT(?cursos) AS ?qtd) 
-        WHERE {{ 
-            ?cursos a ccso:ProgramofStudy . 
-            ?cursos ccso:psName ?name . 
-            ?cursos ccso:belongsTo ?u . 
-            ?u owl:sameAs ?u_dbpedia .
-            FILTER regex(?name, "engenharia", "i")
-            SERVICE <http://dbpedia.org/sparql> {{ 
-                OPTIONAL {{ ?u_dbpedia dbp:state ?estado . }} 
-                FILTER (lcase(str(?estado)) = "{estado.lower()}") 
-            }} 
-        }} 
-        GROUP BY ?name 
-        ORDER BY DESC(?qtd) 
-        LIMIT 50
-        """
-        
-        results = dw.query('dbacademic/dbacademic', sparql_query, query_type='sparql')
-        return results.dataframe, sparql_query
-        
-    except Exception as e:
-        st.error(f"Erro ao consultar cursos de engenharia por estado: {str(e)}")
-        return pd.DataFrame(), ""
+    df_fatos, sparql_query = get_fatos_cursos()
+    if df_fatos.empty:
+        return df_fatos, sparql_query
+    return cursos.engenharia_computacao(df_fatos), sparql_query
+
+def get_cursos_engenharia_por_estados(estados):
+    """Consulta cursos de engenharia de vários estados de uma vez"""
+    df_fatos, sparql_query = get_fatos_cursos()
+    if df_fatos.empty:
+        return df_fatos, sparql_query
+    return cursos.engenharia_por_estados(df_fatos, estados), sparql_query
 
-@st.cache_data(ttl=3600)
 def get_cursos_por_nome():
     """Consulta quantidade de cursos por nome - versão completa"""
-    try:
-        ds = dw.load_dataset('dbacademic/dbacademic', force_update=True)
-        
-        sparql_query = """
-        PREFIX : <https://dbacademic.linked.data.world/d/dbacademic/> 
-        PREFIX ds-institutos: <https://dbacademic.linked.data.world/d/institutos/> 
-        PREFIX ds-universidades: <https://dbacademic.linked.data.world/d/universidades/> 
-        PREFIX ccso: <https://w3id.org/ccso/ccso#> 
-        
-        SELECT ?name (COUNT(?cursos) AS ?qtd) 
-        WHERE {     
-            ?cursos a ccso:ProgramofStudy .     
-            ?cursos ccso:psName ?name .     
-            ?cursos ccso:belongsTo ?u . 
-        } 
-        GROUP BY ?name 
-        ORDER BY DESC(?qtd)
-        """
-        
-        results = dw.query('dbacademic/dbacademic', sparql_query, query_type='sparql')
-        return results.dataframe, sparql_query
-        
-    except Exception as e:
-        st.error(f"Erro ao consultar cursos por nome: {str(e)}")
-        return pd.DataFrame(), ""
-
-@st.cache_data(ttl=3600)
-def get_cursos_completos_com_universidade():
-    """Consulta cursos com informações de universidade e estado"""
-    try:
-        ds = dw.load_dataset('dbacademic/dbacademic', force_update=True)
-        
-        sparql_query = """
-        prefix ccso: <https://w3id.org/ccso/ccso#> 
-        PREFIX dbp: <http://dbpedia.org/property/> 
-        PREFIX dbo: <http://dbpedia.org/ontology/> 
-        prefix foaf: <http://xmlns.com/foaf/0.1/>
-        prefix owl: <http://www.w3.org/2002/07/owl#>
-
-        SELECT ?NomeCurso ?Universidade ?Estado WHERE {
-            ?curso a ccso:ProgramofStudy. 
-            ?curso ccso:psName ?NomeCurso.
-            ?curso ccso:belongsTo ?url_pt. 
-            ?url_pt owl:sameAs ?url_eng.
-            
-            service <http://dbpedia.org/sparql> { 
-                ?url_eng dbp:name ?Universidade.
-                OPTIONAL {
-                    ?url_eng dbo:state ?state.
-                    ?state dbp:name ?Estado.
-                }
-            }
-        }
-        LIMIT 1000
-        """
-        
-        results = dw.query('dbacademic/dbacademic', sparql_query, query_type='sparql')
-        return results.dataframe, sparql_query
-        
-    except Exception as e:
-        st.error(f"Erro ao consultar cursos completos: {str(e)}")
-        return pd.DataFrame(), ""
-
-# Funções de processamento de dados melhoradas
-def process_universidade_data(df):
-    """Processar dados de universidade com análise estatística"""
-    if df.empty:
-        return df
-    
-    df['Cursos'] = pd.to_numeric(df['Cursos'], errors='coerce')
-    df = df.dropna().reset_index(drop=True)
-    df = df.sort_values('Cursos', ascending=False).reset_index(drop=True)
-    df['Posição'] = range(1, len(df) + 1)
-    df['Percentual'] = (df['Cursos'] / df['Cursos'].sum() * 100).round(2)
-    
-    # Adicionar categoria de tamanho
-    df['Categoria'] = pd.cut(df['Cursos'], 
-                           bins=[0, 5, 15, 50, float('inf')], 
-                           labels=['Pequena', 'Média', 'Grande', 'Muito Grande'])
-    
-    return df
-
-def process_curso_nome_data(df):
-    """Processar dados de cursos por nome"""
-    if df.empty:
-        return df
-    
-    df['qtd'] = pd.to_numeric(df['qtd'], errors='coerce')
-    df = df.dropna().reset_index(drop=True)
-    df = df.sort_values('qtd', ascending=False).reset_index(drop=True)
-    df['Posição'] = range(1, len(df) + 1)
-    df['Percentual'] = (df['qtd'] / df['qtd'].sum() * 100).round(2)
-    
+    df_fatos, sparql_query = get_fatos_cursos()
+    if df_fatos.empty:
+        return df_fatos, sparql_query
+    return cursos.por_nome(df_fatos), sparql_query
+
+def exportar_listagem_cursos():
+    """CSV da listagem completa, gerado no disco só quando o download é pedido"""
+    with open(paginacao.exportar_csv(cursos.listagem_completa()), 'rb') as arquivo:
+        return arquivo.read()
+
+@cache.derivado
+def deduplicar_engenharia_computacao(df):
+    """Um curso por universidade, com o nome de exibição da universidade"""
+    df = df.drop_duplicates(subset=['name', 'u'])
+    df['Universidade_Nome'] = df['Universidade']
     return df
 
-def process_engenharia_data(df):
-    """Processar dados de cursos de engenharia"""
-    if df.empty:
-        return df
-    
-    if 'qtd' in df.columns:
-        df['qtd'] = pd.to_numeric(df['qtd'], errors='coerce')
-        df = df.dropna().reset_index(drop=True)
-        df = df.sort_values('qtd', ascending=False).reset_index(drop=True)
-        df['Posição'] = range(1, len(df) + 1)
-        df['Percentual'] = (df['qtd'] / df['qtd'].sum() * 100).round(2)
-    
-    return df
-
-def format_university_name(url_or_name):
-    """Formatação melhorada de nomes de universidades mantendo nomes oficiais em inglês"""
-    if pd.isna(url_or_name):
-        return "Não informado"
-    
-    if isinstance(url_or_name, str):
-        # Se for URL, extrair o nome
-        if 'http' in url_or_name:
-            parts = url_or_name.split('/')
-            name = parts[-1] if parts else url_or_name
-        else:
-            name = url_or_name
-        
-        # Se já estiver bem formatado (nomes das universidades federais em inglês), manter
-        if any(prefix in name for prefix in ['Federal University', 'University of', 'University for']):
-            return name
-        
-        # Caso contrário, limpar e formatar
-        name = name.replace('_', ' ').replace('-', ' ')
-        name = ' '.join(word.capitalize() for word in name.split())
-        
-        return name
-    
-    return str(url_or_name)
-
-def mapear_regiao_brasil(universidade):
-    """Mapeamento completo de universidades para regiões brasileiras (português e inglês)"""
-    univ_lower = universidade.lower()
-    
-    # Sudeste
-    sudeste = [
-        # Nomes em português
-        'usp', 'unicamp', 'unesp', 'ufrj', 'uerj', 'uff', 'ufmg', 'puc-mg', 'ufes', 'unifesp', 'puc-sp', 'mackenzie',
-        'são carlos', 'viçosa', 'itajubá', 'são joão del-rei',
-        # Nomes em inglês das universidades federais
-        'federal university of viçosa', 'federal university of são carlos', 'federal university of itajubá',
-        'federal university of são joão del-rei', 'federal fluminense university', 'fluminense university',
-        'university of são paulo', 'federal university of minas gerais', 'federal university of rio de janeiro',
-        'federal university of espírito santo'
-    ]
-    if any(univ in univ_lower for univ in sudeste):
-        return 'Sudeste'
-    
-    # Sul
-    sul = [
-        # Nomes em português
-        'ufrgs', 'ufpr', 'ufsc', 'puc-rs', 'unisinos', 'furb', 'udesc', 'uem', 'uel', 'pelotas', 'fronteira sul',
-        'utfpr', 'paraná',
-        # Nomes em inglês das universidades federais
-        'federal university of pelotas', 'federal university of technology – paraná', 'federal university of paraná',
-        'federal university of rio grande do sul', 'federal university of santa catarina',
-        'federal university of fronteira sul', 'federal university of health sciences of porto',
-        'health sciences of porto'
-    ]
-    if any(univ in univ_lower for univ in sul):
-        return 'Sul'
-    
-    # Nordeste  
-    nordeste = [
-        # Nomes em português
-        'ufba', 'ufpe', 'ufc', 'ufpb', 'ufal', 'ufrn', 'ufse', 'ufpi', 'ufma', 'uece', 'maranhão', 'ceará', 'bahia',
-        'pernambuco', 'piauí', 'rio grande do norte', 'paraíba', 'alagoas', 'sergipe',
-        # Nomes em inglês das universidades federais
-        'federal university of maranhão', 'ceará federal university', 'federal university of ceará',
-        'federal university of bahia', 'federal university of pernambuco', 'federal university of piauí',
-        'federal university of rio grande do norte', 'university for international integration',
-        'federal university of paraíba', 'federal university of alagoas', 'federal university of sergipe'
-    ]
-    if any(univ in univ_lower for univ in nordeste):
-        return 'Nordeste'
-    
-    # Centro-Oeste
-    centro_oeste = [
-        # Nomes em português
-        'unb', 'ufg', 'ufmt', 'ufms', 'ucb', 'goiás', 'mato grosso', 'brasília',
-        # Nomes em inglês das universidades federais
-        'federal university of goiás', 'federal university of mato grosso do sul',
-        'federal university of mato grosso', 'university of brasília'
-    ]
-    if any(univ in univ_lower for univ in centro_oeste):
-        return 'Centro-Oeste'
-    
-    # Norte
-    norte = [
-        # Nomes em português
-        'ufam', 'ufpa', 'ufac', 'ufrr', 'unir', 'ufap', 'uft', 'amazonas', 'pará', 'acre', 'tocantins',
-        'rondônia', 'roraima', 'amapá',
-        # Nomes em inglês das universidades federais
-        'federal university of amazonas', 'federal university of pará', 'federal university of acre',
-        'federal university of roraima', 'federal university of tocantins', 'federal university of amapá',
-        'federal university of rondônia'
-    ]
-    if any(univ in univ_lower for univ in norte):
-        return 'Norte'
-    
-    return 'Não Identificado'
-
 # Interface principal
 st.title("📚 Dashboard Avançado de Cursos Acadêmicos")
 st.markdown("""
@@ -380,13 +105,14 @@ page = st.sidebar.radio(
 
 # Botão para recarregar dados
 if st.sidebar.button("🔄 Atualizar Base de Dados"):
-    st.cache_data.clear()
-    st.success("✅ Cache limpo! Dados serão recarregados.")
-    st.rerun()
+    # Os dados atuais continuam sendo exibidos até a atualização terminar
+    cache.revalidar_todos()
+    st.success("✅ Atualização iniciada em segundo plano.")
 
 # Carregar dados básicos
-with st.spinner("🔄 Carregando estatísticas gerais..."):
+with st.spinner("🔄 Carregando estatísticas gerais..."), perfil.secao("Estatísticas gerais"):
     df_qtd_cursos_raw, _ = get_quantidade_cursos()
+    df_univ_temp, _ = get_cursos_por_universidade()
     total_cursos = int(df_qtd_cursos_raw['qtcursos'].iloc[0]) if not df_qtd_cursos_raw.empty else 0
 
 # Métricas globais no topo
@@ -398,8 +124,6 @@ with col1:
              help="Número total de cursos cadastrados na base")
 
 with col2:
-    # Carregar universidades para métrica
-    df_univ_temp, _ = get_cursos_por_universidade()
     total_universidades = len(df_univ_temp) if not df_univ_temp.empty else 0
     st.metric("🏛️ Universidades", f"{total_universidades:,}",
              help="Universidades com cursos cadastrados")
@@ -423,64 +147,66 @@ if page == "🏛️ Panorama Universitário":
     st.header("🏛️ Panorama Universitário Brasileiro")
     
     # Carregar dados
-    with st.spinner("📊 Carregando dados universitários..."):
-        df_universidade_raw, query_universidade = get_cursos_por_universidade()
+    with st.spinner("📊 Carregando dados universitários..."), perfil.secao("Carga de dados"):
+        df_universidade, query_universidade = get_cursos_por_universidade()
     
-    if df_universidade_raw.empty:
+    if df_universidade.empty:
         st.error("❌ Não foi possível carregar os dados de universidades.")
         st.stop()
     
-    # Processar dados
-    df_universidade = process_universidade_data(df_universidade_raw)
-    df_universidade['Região'] = df_universidade['Universidade'].apply(mapear_regiao_brasil)
+    @st.fragment
+    @perfil.fragmento
+    def ranking_universidades(df_universidade):
+        """Filtros de região e quantidade e o ranking de universidades"""
+        # Filtros interativos
+        st.subheader("🎛️ Controles Interativos")
     
-    # Filtros interativos
-    st.subheader("🎛️ Controles Interativos")
+        col1, col2 = st.columns(2)
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        filtro_regiao = st.selectbox(
-            "🌎 Filtrar por Região:",
-            ['Todas'] + sorted(df_universidade['Região'].unique().tolist())
-        )
+        with col1:
+            filtro_regiao = st.selectbox(
+                "🌎 Filtrar por Região:",
+                ['Todas'] + sorted(df_universidade['Região'].unique().tolist())
+            )
    
     
-    with col2:
-        top_n = st.slider("📊 Quantidade para exibir:", 5, min(100, len(df_universidade)), 25)
+        with col2:
+            top_n = st.slider("📊 Quantidade para exibir:", 5, min(100, len(df_universidade)), 25)
     
-    # Aplicar filtros
-    df_filtrado = df_universidade.copy()
+        # Aplicar filtros
+        df_filtrado = df_universidade
     
-    if filtro_regiao != 'Todas':
-        df_filtrado = df_filtrado[df_filtrado['Região'] == filtro_regiao]
+        if filtro_regiao != 'Todas':
+            df_filtrado = df_filtrado[df_filtrado['Região'] == filtro_regiao]
     
     
-    # Gráfico principal - ranking universitário
-    st.subheader(f"🏆 Top {top_n} Universidades" + (f" - {filtro_regiao}" if filtro_regiao != 'Todas' else ""))
+        # Gráfico principal - ranking universitário
+        st.subheader(f"🏆 Top {top_n} Universidades" + (f" - {filtro_regiao}" if filtro_regiao != 'Todas' else ""))
     
-    top_universidades = df_filtrado.head(top_n)
+        top_universidades = df_filtrado.head(top_n)
     
-    fig_universidades = px.bar(
-        top_universidades,
-        y='Universidade',
-        x='Cursos',
-        orientation='h',
-        color='Região',
-        title=f"Ranking de Universidades por Número de Cursos",
-        labels={'Cursos': 'Número de Cursos', 'Universidade': 'Universidade'},
-        text='Cursos',
-        color_discrete_sequence=px.colors.qualitative.Set1
-    )
+        fig_universidades = px.bar(
+            top_universidades,
+            y='Universidade',
+            x='Cursos',
+            orientation='h',
+            color='Região',
+            title=f"Ranking de Universidades por Número de Cursos",
+            labels={'Cursos': 'Número de Cursos', 'Universidade': 'Universidade'},
+            text='Cursos',
+            color_discrete_sequence=px.colors.qualitative.Set1
+        )
     
-    fig_universidades.update_layout(
-        height=max(600, top_n * 20),
-        yaxis={'categoryorder': 'total ascending'},
-        showlegend=True
-    )
-    fig_universidades.update_traces(texttemplate='%{text}', textposition='outside')
+        fig_universidades.update_layout(
+            height=max(600, top_n * 20),
+            yaxis={'categoryorder': 'total ascending'},
+            showlegend=True
+        )
+        fig_universidades.update_traces(texttemplate='%{text}', textposition='outside')
     
-    st.plotly_chart(fig_universidades, use_container_width=True)
+        perfil.grafico(fig_universidades, use_container_width=True)
+
+    ranking_universidades(df_universidade)
     
     # Análise regional detalhada
     st.subheader("🌎 Análise Regional Detalhada")
@@ -506,29 +232,22 @@ if page == "🏛️ Panorama Universitário":
             barmode='group',
             color_discrete_sequence=['#FF6B6B', '#4ECDC4']
         )
-        st.plotly_chart(fig_regiao_comp, use_container_width=True)
+        perfil.grafico(fig_regiao_comp, use_container_width=True)
     
     # Tabela interativa com estatísticas completas
     st.subheader("📊 Estatísticas Regionais Completas")
     
-    # Formatar dados para exibição
-    regiao_display = regiao_stats.copy()
-    for col in ['Total Cursos', 'Qtd Universidades', 'Mínimo', 'Máximo']:
-        regiao_display[col] = regiao_display[col].apply(lambda x: f"{int(x):,}")
-    
-    regiao_display['Participação'] = regiao_display['Participação'].apply(lambda x: f"{x:.1f}%")
-    
-    st.dataframe(
-        regiao_display,
+    perfil.tabela(
+        regiao_stats,
         column_config={
             'Região': st.column_config.TextColumn('🌎 Região'),
-            'Total Cursos': st.column_config.TextColumn('📚 Total'),
-            'Qtd Universidades': st.column_config.TextColumn('🏛️ Universidades'),
-            'Média': st.column_config.NumberColumn('📊 Média', format="%.1f"),
-            'Desvio Padrão': st.column_config.NumberColumn('📈 Desvio', format="%.1f"),
-            'Mínimo': st.column_config.TextColumn('📉 Min'),
-            'Máximo': st.column_config.TextColumn('📈 Max'),
-            'Participação': st.column_config.TextColumn('🥧 %')
+            'Total Cursos': formatacao.coluna_inteiro('📚 Total'),
+            'Qtd Universidades': formatacao.coluna_inteiro('🏛️ Universidades'),
+            'Média': formatacao.coluna_decimal('📊 Média'),
+            'Desvio Padrão': formatacao.coluna_decimal('📈 Desvio'),
+            'Mínimo': formatacao.coluna_inteiro('📉 Min'),
+            'Máximo': formatacao.coluna_inteiro('📈 Max'),
+            'Participação': formatacao.coluna_percentual('🥧 %', casas=1)
         },
         hide_index=True,
         use_container_width=True
@@ -539,52 +258,13 @@ elif page == "📈 Ranking de Cursos":
     st.header("📈 Análise Avançada do Ranking de Cursos")
     
     # Carregar dados
-    with st.spinner("📊 Carregando dados completos de cursos..."):
-        df_cursos_nome_raw, query_nome = get_cursos_por_nome()
+    with st.spinner("📊 Carregando dados completos de cursos..."), perfil.secao("Carga de dados"):
+        df_cursos_nome, query_nome = get_cursos_por_nome()
     
-    if df_cursos_nome_raw.empty:
+    if df_cursos_nome.empty:
         st.error("❌ Não foi possível carregar os dados de cursos.")
         st.stop()
     
-    # Processar dados
-    df_cursos_nome = process_curso_nome_data(df_cursos_nome_raw)
-    
-    # Filtros avançados
-    st.subheader("🎛️ Filtros Inteligentes")
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        min_cursos = st.number_input(
-            "🔢 Mínimo de ofertas:",
-            min_value=1,
-            max_value=int(df_cursos_nome['qtd'].max()),
-            value=1
-        )
-    
-    with col2:
-        top_n_cursos = st.slider(
-            "📊 Quantidade para mostrar:",
-            5, 100, 30
-        )
-    
-    with col3:
-        busca_curso = st.text_input(
-            "🔍 Buscar curso:",
-            placeholder="Digite parte do nome..."
-        )
-    
-    # Aplicar filtros
-    df_filtrado = df_cursos_nome.copy()
-    
-    if min_cursos > 1:
-        df_filtrado = df_filtrado[df_filtrado['qtd'] >= min_cursos]
-    
-    if busca_curso:
-        mask = df_filtrado['name'].str.contains(busca_curso, case=False, na=False)
-        df_filtrado = df_filtrado[mask]
-    
-    st.info(f"📋 Exibindo {len(df_filtrado)} cursos de {len(df_cursos_nome)} totais")
     
     # Análise estatística básica
     st.subheader("📊 Análise Estatística dos Cursos")
@@ -617,68 +297,103 @@ elif page == "📈 Ranking de Cursos":
             color_discrete_sequence=['#FF6B6B']
         )
         fig_hist.update_layout(showlegend=False)
-        st.plotly_chart(fig_hist, use_container_width=True)
-    
-    # Ranking principal
-    st.subheader(f"🏆 Top {top_n_cursos} Cursos")
-    
-    top_cursos = df_filtrado.head(top_n_cursos)
-    
-    # Gráfico de barras horizontal
-    fig_cursos = px.bar(
-        top_cursos,
-        y='name',
-        x='qtd',
-        orientation='h',
-        title=f"Ranking dos Cursos Mais Ofertados",
-        labels={'qtd': 'Número de Ofertas', 'name': 'Nome do Curso'},
-        text='qtd',
-        color='qtd',
-        color_continuous_scale='Viridis'
-    )
-    
-    fig_cursos.update_layout(
-        height=max(700, len(top_cursos) * 25),
-        yaxis={'categoryorder': 'total ascending'},
-        showlegend=False
-    )
-    fig_cursos.update_traces(texttemplate='%{text}', textposition='outside')
+        perfil.grafico(fig_hist, use_container_width=True)
+
+    @st.fragment
+    @perfil.fragmento
+    def ranking_cursos(df_cursos_nome):
+        """Filtros, ranking e tabela dos cursos"""
+        # Filtros avançados
+        st.subheader("🎛️ Filtros Inteligentes")
+    
+        col1, col2, col3 = st.columns(3)
+    
+        with col1:
+            min_cursos = st.number_input(
+                "🔢 Mínimo de ofertas:",
+                min_value=1,
+                max_value=int(df_cursos_nome['qtd'].max()),
+                value=1
+            )
+    
+        with col2:
+            top_n_cursos = st.slider(
+                "📊 Quantidade para mostrar:",
+                5, 100, 30
+            )
+    
+        with col3:
+            busca_curso = st.text_input(
+                "🔍 Buscar curso:",
+                placeholder="Digite parte do nome..."
+            )
+    
+        # Aplicar filtros
+        df_filtrado = df_cursos_nome
+    
+        if min_cursos > 1 or busca_curso:
+            # A busca usa o índice da tabela completa; os filtros viram uma só máscara
+            mask = busca.indice_busca(df_cursos_nome, 'name').contem(busca_curso)
+            if min_cursos > 1:
+                mask = mask & (df_cursos_nome['qtd'] >= min_cursos).to_numpy()
+            df_filtrado = df_cursos_nome[mask]
+    
+        st.info(f"📋 Exibindo {len(df_filtrado)} cursos de {len(df_cursos_nome)} totais")
+    
+        # Ranking principal
+        st.subheader(f"🏆 Top {top_n_cursos} Cursos")
+    
+        top_cursos = df_filtrado.head(top_n_cursos)
+    
+        # Gráfico de barras horizontal
+        fig_cursos = px.bar(
+            top_cursos,
+            y='name',
+            x='qtd',
+            orientation='h',
+            title=f"Ranking dos Cursos Mais Ofertados",
+            labels={'qtd': 'Número de Ofertas', 'name': 'Nome do Curso'},
+            text='qtd',
+            color='qtd',
+            color_continuous_scale='Viridis'
+        )
     
-    st.plotly_chart(fig_cursos, use_container_width=True)
+        fig_cursos.update_layout(
+            height=max(700, len(top_cursos) * 25),
+            yaxis={'categoryorder': 'total ascending'},
+            showlegend=False
+        )
+        fig_cursos.update_traces(texttemplate='%{text}', textposition='outside')
     
-    # Tabela detalhada com busca
-    st.subheader("📋 Tabela Detalhada de Cursos")
+        perfil.grafico(fig_cursos, use_container_width=True)
     
-    # Preparar dados para exibição
-    display_cursos = df_filtrado.head(100)[['Posição', 'name', 'qtd', 'Percentual']].copy()
-    display_cursos['qtd'] = display_cursos['qtd'].apply(lambda x: f"{int(x):,}")
-    display_cursos['Percentual'] = display_cursos['Percentual'].apply(lambda x: f"{x:.2f}%")
+        # Tabela detalhada com busca
+        st.subheader("📋 Tabela Detalhada de Cursos")
     
-    st.dataframe(
-        display_cursos,
-        column_config={
-            'Posição': st.column_config.NumberColumn('🏆 Rank', width="small"),
-            'name': st.column_config.TextColumn('📚 Nome do Curso'),
-            'qtd': st.column_config.TextColumn('🔢 Ofertas', width="small"),
-            'Percentual': st.column_config.TextColumn('📊 %', width="small")
-        },
-        hide_index=True,
-        use_container_width=True,
-        height=400
-    )
+        formatacao.mostrar_tabela(
+            df_filtrado.head(100),
+            ['Posição', 'name', 'qtd', 'Variações', 'Percentual'],
+            column_config={
+                'Posição': st.column_config.NumberColumn('🏆 Rank', width="small"),
+                'name': st.column_config.TextColumn('📚 Nome do Curso'),
+                'qtd': formatacao.coluna_inteiro('🔢 Ofertas', width="small"),
+                'Variações': formatacao.coluna_inteiro(
+                    '✏️ Grafias', width="small",
+                    help="Variações do nome (acentos, abreviações, preposições) somadas neste curso"
+                ),
+                'Percentual': formatacao.coluna_percentual('📊 %', width="small")
+            },
+            height=400
+        )
+
+    ranking_cursos(df_cursos_nome)
 
 # === PÁGINA: ENGENHARIAS POR ESTADO ===
 elif page == "🔬 Engenharias por Estado":
     st.header("🔬 Análise Detalhada de Engenharias por Estado")
     
     # Lista completa de estados brasileiros
-    estados_brasil = [
-        "Acre", "Alagoas", "Amapá", "Amazonas", "Bahia", "Ceará", "Distrito Federal",
-        "Espírito Santo", "Goiás", "Maranhão", "Mato Grosso", "Mato Grosso do Sul",
-        "Minas Gerais", "Pará", "Paraíba", "Paraná", "Pernambuco", "Piauí",
-        "Rio de Janeiro", "Rio Grande do Norte", "Rio Grande do Sul", "Rondônia",
-        "Roraima", "Santa Catarina", "São Paulo", "Sergipe", "Tocantins"
-    ]
+    estados_brasil = ESTADOS_BRASIL
     
     # Controles
     col1, col2 = st.columns(2)
@@ -697,27 +412,24 @@ elif page == "🔬 Engenharias por Estado":
             default=[]
         )
     
-    # Carregar dados do estado principal
-    with st.spinner(f"📊 Carregando engenharias de {estado_selecionado}..."):
-        df_eng_estado_raw, query_eng_estado = get_cursos_engenharia_por_estado(estado_selecionado)
+    # Carregar dados do estado principal e dos estados para comparação de uma vez
+    with st.spinner(f"📊 Carregando engenharias de {estado_selecionado}..."), perfil.secao("Carga de dados"):
+        df_eng_estados, query_eng_estado = get_cursos_engenharia_por_estados(
+            [estado_selecionado] + comparar_estados
+        )
+    
+    df_eng_estado = pd.DataFrame()
+    if not df_eng_estados.empty:
+        df_eng_estado = df_eng_estados[df_eng_estados['Estado'] == estado_selecionado].drop(columns='Estado')
     
-    if df_eng_estado_raw.empty:
+    if df_eng_estado.empty:
         st.error(f"❌ Não foram encontrados cursos de engenharia em {estado_selecionado}.")
         st.info("💡 Tente selecionar outro estado ou verificar a conectividade.")
         st.stop()
     
-    # Processar dados principais
-    df_eng_estado = process_engenharia_data(df_eng_estado_raw)
     
-    # Carregar dados dos estados para comparação
-    df_comparacao = {}
-    if comparar_estados:
-        for estado_comp in comparar_estados:
-            with st.spinner(f"📊 Carregando {estado_comp}..."):
-                df_comp_raw, _ = get_cursos_engenharia_por_estado(estado_comp)
-                if not df_comp_raw.empty:
-                    df_comp_processed = process_engenharia_data(df_comp_raw)
-                    df_comparacao[estado_comp] = df_comp_processed
+    # Estados para comparação que têm engenharias
+    estados_com_dados = [e for e in comparar_estados if e in set(df_eng_estados['Estado'])]
     
     # Métricas principais
     st.subheader(f"📊 Panorama das Engenharias em {estado_selecionado}")
@@ -760,33 +472,14 @@ elif page == "🔬 Engenharias por Estado":
     )
     fig_eng_ranking.update_traces(texttemplate='%{text}', textposition='outside')
     
-    st.plotly_chart(fig_eng_ranking, use_container_width=True)
+    perfil.grafico(fig_eng_ranking, use_container_width=True)
     
     # Análise comparativa com outros estados
-    if df_comparacao:
+    if estados_com_dados:
         st.subheader("📊 Análise Comparativa entre Estados")
         
-        # Preparar dados para comparação
-        dados_comparacao = []
-        
-        # Adicionar estado principal
-        for _, row in df_eng_estado.iterrows():
-            dados_comparacao.append({
-                'Estado': estado_selecionado,
-                'Engenharia': row['name'],
-                'Ofertas': row['qtd']
-            })
-        
-        # Adicionar estados de comparação
-        for estado_comp, df_comp in df_comparacao.items():
-            for _, row in df_comp.iterrows():
-                dados_comparacao.append({
-                    'Estado': estado_comp,
-                    'Engenharia': row['name'],
-                    'Ofertas': row['qtd']
-                })
-        
-        df_comp_final = pd.DataFrame(dados_comparacao)
+        # Preparar dados para comparação (já em formato longo)
+        df_comp_final = df_eng_estados.rename(columns={'name': 'Engenharia', 'qtd': 'Ofertas'})
         
         # Gráfico comparativo de engenharias entre estados
         top_eng = df_comp_final.groupby('Engenharia')['Ofertas'].sum().sort_values(ascending=False).head(10).index
@@ -802,15 +495,15 @@ elif page == "🔬 Engenharias por Estado":
             color_discrete_sequence=px.colors.qualitative.Set1
         )
         fig_comp_eng.update_layout(xaxis_tickangle=-45)
-        st.plotly_chart(fig_comp_eng, use_container_width=True)
+        perfil.grafico(fig_comp_eng, use_container_width=True)
         
         # Tabela comparativa
         eng_totais = df_comp_final.groupby('Estado')['Ofertas'].sum().reset_index()
-        st.dataframe(
+        perfil.tabela(
             eng_totais.sort_values('Ofertas', ascending=False),
             column_config={
                 'Estado': st.column_config.TextColumn('🗺️ Estado'),
-                'Ofertas': st.column_config.NumberColumn('📊 Total de Ofertas')
+                'Ofertas': formatacao.coluna_inteiro('📊 Total de Ofertas')
             },
             hide_index=True,
             use_container_width=True
@@ -819,20 +512,15 @@ elif page == "🔬 Engenharias por Estado":
     # Tabela detalhada
     st.subheader("📋 Detalhamento Completo")
     
-    display_eng = df_eng_estado[['Posição', 'name', 'qtd', 'Percentual']].copy()
-    display_eng['qtd'] = display_eng['qtd'].apply(lambda x: f"{int(x):,}")
-    display_eng['Percentual'] = display_eng['Percentual'].apply(lambda x: f"{x:.2f}%")
-    
-    st.dataframe(
-        display_eng,
+    formatacao.mostrar_tabela(
+        df_eng_estado,
+        ['Posição', 'name', 'qtd', 'Percentual'],
         column_config={
             'Posição': st.column_config.NumberColumn('🏆 Rank', width="small"),
             'name': st.column_config.TextColumn('🔬 Curso de Engenharia'),
-            'qtd': st.column_config.TextColumn('🔢 Ofertas', width="small"),
-            'Percentual': st.column_config.TextColumn('📊 %', width="small")
-        },
-        hide_index=True,
-        use_container_width=True
+            'qtd': formatacao.coluna_inteiro('🔢 Ofertas', width="small"),
+            'Percentual': formatacao.coluna_percentual('📊 %', width="small")
+        }
     )
 
 # === PÁGINA: ENGENHARIA DE COMPUTAÇÃO ===
@@ -840,7 +528,7 @@ elif page == "💻 Engenharia de Computação":
     st.header("💻 Análise Profunda de Engenharia de Computação")
     
     # Carregar dados
-    with st.spinner("📊 Carregando dados de Engenharia de Computação..."):
+    with st.spinner("📊 Carregando dados de Engenharia de Computação..."), perfil.secao("Carga de dados"):
         df_eng_comp_raw, query_eng_comp = get_cursos_engenharia_computacao()
     
     if df_eng_comp_raw.empty:
@@ -848,15 +536,8 @@ elif page == "💻 Engenharia de Computação":
         st.info("💡 Verifique a conectividade ou tente recarregar os dados.")
         st.stop()
     
-    # Processar dados - ADICIONADO CÓDIGO PARA REMOVER DUPLICATAS
-    df_eng_comp = df_eng_comp_raw.copy()
-    
     # Remover duplicatas com base no nome do curso e universidade
-    df_eng_comp = df_eng_comp.drop_duplicates(subset=['name', 'u'])
-    
-    # Continuar o processamento
-    df_eng_comp['Universidade_Nome'] = df_eng_comp['u'].apply(format_university_name)
-    df_eng_comp['Região'] = df_eng_comp['u'].apply(lambda x: mapear_regiao_brasil(format_university_name(x)))
+    df_eng_comp = deduplicar_engenharia_computacao(df_eng_comp_raw)
     
     # Análise de variações do nome
     variações_nome = df_eng_comp['name'].value_counts()
@@ -905,7 +586,7 @@ elif page == "💻 Engenharia de Computação":
             color_continuous_scale='Blues'
         )
         fig_variacoes.update_layout(height=400)
-        st.plotly_chart(fig_variacoes, use_container_width=True)
+        perfil.grafico(fig_variacoes, use_container_width=True)
     
     # Distribuição geográfica
     st.subheader("🌎 Distribuição Geográfica")
@@ -924,7 +605,7 @@ elif page == "💻 Engenharia de Computação":
             hole=0.3
         )
         fig_regiao_pie.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig_regiao_pie, use_container_width=True)
+        perfil.grafico(fig_regiao_pie, use_container_width=True)
     
     with col2:
         # Análise de concentração regional
@@ -945,7 +626,7 @@ elif page == "💻 Engenharia de Computação":
             hover_name='Região',
             size_max=50
         )
-        st.plotly_chart(fig_concentracao, use_container_width=True)
+        perfil.grafico(fig_concentracao, use_container_width=True)
     
   
     
@@ -977,31 +658,34 @@ elif page == "💻 Engenharia de Computação":
                             </div>
                             """, unsafe_allow_html=True)
     
-    # Tabela completa e pesquisável
-    st.subheader("📋 Base Completa de Dados")
+    @st.fragment
+    @perfil.fragmento
+    def base_engenharia_computacao(df_eng_comp):
+        """Busca por universidade e a tabela completa"""
+        # Tabela completa e pesquisável
+        st.subheader("📋 Base Completa de Dados")
     
-    # Preparar dados para exibição
-    df_display = df_eng_comp[['name', 'Universidade_Nome', 'Região']].copy()
-    df_display.columns = ['Nome do Curso', 'Universidade', 'Região']
+        df_display = df_eng_comp
     
-    # Adicionar filtro de busca
-    busca_univ = st.text_input("🔍 Buscar universidade:", placeholder="Digite o nome da universidade...")
+        # Adicionar filtro de busca
+        busca_univ = st.text_input("🔍 Buscar universidade:", placeholder="Digite o nome da universidade...")
     
-    if busca_univ:
-        mask = df_display['Universidade'].str.contains(busca_univ, case=False, na=False)
-        df_display = df_display[mask]
+        if busca_univ:
+            mask = busca.indice_busca(df_eng_comp, 'Universidade_Nome').contem(busca_univ)
+            df_display = df_display[mask]
     
-    st.dataframe(
-        df_display,
-        column_config={
-            'Nome do Curso': st.column_config.TextColumn('💻 Nome do Curso'),
-            'Universidade': st.column_config.TextColumn('🏛️ Universidade'),
-            'Região': st.column_config.TextColumn('🌎 Região', width="medium")
-        },
-        hide_index=True,
-        use_container_width=True,
-        height=400
-    )
+        formatacao.mostrar_tabela(
+            df_display,
+            ['name', 'Universidade_Nome', 'Região'],
+            column_config={
+                'name': st.column_config.TextColumn('💻 Nome do Curso'),
+                'Universidade_Nome': st.column_config.TextColumn('🏛️ Universidade'),
+                'Região': st.column_config.TextColumn('🌎 Região', width="medium")
+            },
+            height=400
+        )
+
+    base_engenharia_computacao(df_eng_comp)
 
 # Sidebar - Downloads e informações
 st.sidebar.markdown("---")
@@ -1048,19 +732,29 @@ elif page == "💻 Engenharia de Computação":
             mime='text/csv'
         )
 
+# A listagem completa vale para qualquer página e só é montada no clique
+st.sidebar.download_button(
+    label="📚 Baixar Listagem Completa de Cursos",
+    data=exportar_listagem_cursos,
+    file_name=f'cursos_universidades_{pd.Timestamp.now().strftime("%Y%m%d_%H%M")}.csv',
+    mime='text/csv',
+    on_click='ignore',
+    help="Todos os cursos com universidade, estado e região, sem limite de linhas"
+)
+
 # Informações técnicas aprimoradas
 st.sidebar.markdown("---")
 st.sidebar.markdown("### ⚙️ Informações Técnicas")
 st.sidebar.markdown("""
 **🔧 Stack Tecnológico:**
-- **Query Engine:** SPARQL 1.1 Federado
-- **Data Sources:** DbAcademic + DBpedia
+- **Query Engine:** SPARQL 1.1 (DbAcademic)
+- **Data Sources:** DbAcademic + snapshot semanal do DBpedia
 - **Frontend:** Streamlit + Plotly
-- **Caching:** TTL 1 hora
+- **Caching:** memória (atualizada em segundo plano) + Parquet em disco por versão do dataset (24h)
 - **Processing:** Pandas + NumPy
 
 **📊 Características dos Dados:**
-- ✅ Tempo real via SPARQL
+- ✅ Atualizados em segundo plano, sem bloquear a página
 - ✅ Integração semântica
 - ✅ Análise multidimensional
 - ✅ Mapeamento geográfico
@@ -1075,13 +769,8 @@ st.sidebar.markdown("""
 
 # Sidebar - Estatísticas em tempo real
 st.sidebar.markdown("---")
-st.sidebar.markdown("### 📊 Status do Sistema")
-
-col1, col2 = st.sidebar.columns(2)
-with col1:
-    st.metric("🔄 Cache", "Ativo", "1h TTL")
-with col2:
-    st.metric("📡 SPARQL", "Online", "Federado")
+with perfil.secao("Painel de telemetria"):
+    telemetria.mostrar_painel()
 
 # Rodapé aprimorado
 st.markdown("---")
@@ -1092,4 +781,6 @@ st.markdown("""
         Dados em tempo real do <strong>DbAcademic</strong> integrados ao <strong>DBpedia</strong>
     </p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+perfil.mostrar_relatorio(page)
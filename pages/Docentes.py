@@ -3,10 +3,11 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import datadotworld as dw
 import numpy as np
-import shutil
-import os
+
+from dados import aquecedor, cache, docentes, formatacao, perfil, telemetria
+
+pd.set_option('mode.copy_on_write', True)
 
 # Configuração da página
 st.set_page_config(
@@ -15,229 +16,72 @@ st.set_page_config(
     layout="wide"
 )
 
-# Funções para executar consultas SPARQL
-@st.cache_data(ttl=3600)
-def get_docentes_por_estado():
-    """Consulta docentes por estado"""
-    try:
-        ds = dw.load_dataset('dbacademic/dbacademic', force_update=True)
-        
-        sparql_query = """
-        prefix CCSO: <https://w3id.org/ccso/ccso#>
-        PREFIX dbp: <http://dbpedia.org/property/>
-        PREFIX dbo: <http://dbpedia.org/ontology/>
-        prefix foaf: <http://xmlns.com/foaf/0.1/>
-        prefix owl: <http://www.w3.org/2002/07/owl#>
+# Garante o aquecimento do cache mesmo quando a página é aberta diretamente
+aquecedor.iniciar_em_segundo_plano()
+telemetria.iniciar_servidor_metricas()
 
-        SELECT ?Estado (count (DISTINCT ?s) as ?Docentes)  where {
+# Perfil de tempo do rerun, ligado com ?perfil=1 ou DBACADEMIC_PERFIL=1
+perfil.iniciar('Docentes')
 
-            ?s a CCSO:Professor.
-            ?s CCSO:worksFor ?url_pt.
-            ?url_pt owl:sameAs ?url_eng.
-
-            service <http://dbpedia.org/sparql> {
-                ?url_eng dbo:state ?state.
-                ?state dbp:name ?Estado.
-            }
-        }
-        GROUP BY ?Estado
-        ORDER BY DESC (?Docentes)
-        """
-        
-        results = dw.query('dbacademic/dbacademic', sparql_query, query_type='sparql')
-        return results.dataframe, sparql_query
+# Funções para executar consultas SPARQL
+def get_fatos_docentes():
+    """Consulta a tabela base de docentes por universidade, grau e sexo"""
+    try:
+        return docentes.get_fatos_docentes(), docentes.SPARQL_FATOS_DOCENTES
         
     except Exception as e:
-        # Tenta limpar o cache se erro for de pasta existente
-        if "already exists" in str(e):
-            cache_path = os.path.expanduser("~/.dw/cache/dbacademic/dbacademic")
-            if os.path.exists(cache_path):
-                shutil.rmtree(cache_path)
-                st.warning("Cache local limpo automaticamente. Recarregue a página.")
-        st.error(f"Erro ao consultar docentes por estado: {str(e)}")
+        st.error(f"Erro ao consultar docentes: {str(e)}")
         return pd.DataFrame(), ""
 
-@st.cache_data(ttl=3600)
+def get_docentes_por_estado():
+    """Consulta docentes por estado"""
+    df_fatos, sparql_query = get_fatos_docentes()
+    if df_fatos.empty:
+        return df_fatos, sparql_query
+    return docentes.por_estado(df_fatos), sparql_query
+
 def get_docentes_por_degree():
     """Consulta docentes por grau de formação"""
-    try:
-        ds = dw.load_dataset('dbacademic/dbacademic', force_update=True)
-        
-        sparql_query = """
-        prefix CCSO: <https://w3id.org/ccso/ccso#>
-        PREFIX dbp: <http://dbpedia.org/property/>
-        PREFIX dbo: <http://dbpedia.org/ontology/>
-        prefix foaf: <http://xmlns.com/foaf/0.1/>
-        prefix owl: <http://www.w3.org/2002/07/owl#>
-
-        SELECT ?GrauFormacao (COUNT(DISTINCT ?s) AS ?Docentes) WHERE {
-            ?s a CCSO:Professor.
-            ?s CCSO:hasDegree ?GrauFormacao.
-        }
-        GROUP BY ?GrauFormacao
-        ORDER BY DESC(?Docentes)
-        """
-        
-        results = dw.query('dbacademic/dbacademic', sparql_query, query_type='sparql')
-        return results.dataframe, sparql_query
-        
-    except Exception as e:
-        st.error(f"Erro ao consultar docentes por grau: {str(e)}")
-        return pd.DataFrame(), ""
+    df_fatos, sparql_query = get_fatos_docentes()
+    if df_fatos.empty:
+        return df_fatos, sparql_query
+    return docentes.por_grau(df_fatos), sparql_query
 
-@st.cache_data(ttl=3600)
 def get_docentes_estado_degree():
     """Consulta docentes por estado e grau de formação"""
-    try:
-        ds = dw.load_dataset('dbacademic/dbacademic', force_update=True)
-        
-        sparql_query = """
-        prefix CCSO: <https://w3id.org/ccso/ccso#>
-        PREFIX dbp: <http://dbpedia.org/property/>
-        PREFIX dbo: <http://dbpedia.org/ontology/>
-        prefix foaf: <http://xmlns.com/foaf/0.1/>
-        prefix owl: <http://www.w3.org/2002/07/owl#>
-
-        SELECT ?Estado ?GrauFormacao (COUNT(DISTINCT ?s) AS ?Docentes) WHERE {
-            ?s a CCSO:Professor.
-            ?s CCSO:hasDegree ?GrauFormacao.
-            ?s CCSO:worksFor ?url_pt.
-            ?url_pt owl:sameAs ?url_eng.
+    df_fatos, sparql_query = get_fatos_docentes()
+    if df_fatos.empty:
+        return df_fatos, sparql_query
+    return docentes.por_estado_grau(df_fatos), sparql_query
 
-            SERVICE <http://dbpedia.org/sparql> {
-                ?url_eng dbo:state ?state.
-                ?state dbp:name ?Estado.
-            }
-        }
-        GROUP BY ?Estado ?GrauFormacao
-        ORDER BY ?Estado DESC(?Docentes)
-        """
-        
-        results = dw.query('dbacademic/dbacademic', sparql_query, query_type='sparql')
-        return results.dataframe, sparql_query
-        
-    except Exception as e:
-        st.error(f"Erro ao consultar docentes por estado e grau: {str(e)}")
-        return pd.DataFrame(), ""
-
-@st.cache_data(ttl=3600)
 def get_docentes_por_sexo():
     """Consulta docentes por sexo para filtros"""
-    try:
-        ds = dw.load_dataset('dbacademic/dbacademic', force_update=True)
-        
-        sparql_query = """
-        prefix CCSO: <https://w3id.org/ccso/ccso#>
-        prefix foaf: <http://xmlns.com/foaf/0.1/>
-        PREFIX dbp: <http://dbpedia.org/property/>
-        PREFIX dbo: <http://dbpedia.org/ontology/>
-        prefix owl: <http://www.w3.org/2002/07/owl#>
-
-        SELECT ?Estado ?Sexo (COUNT(DISTINCT ?s) AS ?Docentes) WHERE {
-            ?s a CCSO:Professor.
-            ?s CCSO:worksFor ?url_pt.
-            ?url_pt owl:sameAs ?url_eng.
-            
-            OPTIONAL { ?s foaf:gender ?Sexo . }
-
-            SERVICE <http://dbpedia.org/sparql> {
-                ?url_eng dbo:state ?state.
-                ?state dbp:name ?Estado.
-            }
-        }
-        GROUP BY ?Estado ?Sexo
-        ORDER BY ?Estado DESC(?Docentes)
-        """
-        
-        results = dw.query('dbacademic/dbacademic', sparql_query, query_type='sparql')
-        return results.dataframe, sparql_query
-        
-    except Exception as e:
-        st.error(f"Erro ao consultar docentes por sexo: {str(e)}")
-        return pd.DataFrame(), ""
-
-def format_degree_name(degree_uri):
-    """Formatar nomes de graus acadêmicos"""
-    if pd.isna(degree_uri):
-        return "Não informado"
-    
-    degree_map = {
-        "https://w3id.org/ccso/ccso#Doctorate": "Doutorado",
-        "https://w3id.org/ccso/ccso#Masters": "Mestrado", 
-        "https://w3id.org/ccso/ccso#Bachelors": "Graduação",
-        "https://w3id.org/ccso/ccso#PostDoc": "Pós-Doutorado"
-    }
-    
-    return degree_map.get(degree_uri, degree_uri.split('#')[-1] if '#' in degree_uri else degree_uri)
-
-def process_estado_data(df):
-    """Processar dados de estado"""
-    if df.empty:
-        return df
-    
-    df['Docentes'] = pd.to_numeric(df['Docentes'], errors='coerce')
-    df = df.dropna().reset_index(drop=True)
-    df = df.sort_values('Docentes', ascending=False).reset_index(drop=True)
-    df['Posição'] = range(1, len(df) + 1)
-    df['Percentual'] = (df['Docentes'] / df['Docentes'].sum() * 100).round(2)
-    
-    return df
-
-def process_degree_data(df):
-    """Processar dados de grau de formação"""
-    if df.empty:
-        return df
-    
-    df['Docentes'] = pd.to_numeric(df['Docentes'], errors='coerce')
-    df = df.dropna().reset_index(drop=True)
-    df['GrauFormacao_Formatado'] = df['GrauFormacao'].apply(format_degree_name)
-    df = df.sort_values('Docentes', ascending=False).reset_index(drop=True)
-    df['Percentual'] = (df['Docentes'] / df['Docentes'].sum() * 100).round(2)
-    
-    return df
-
-def process_combined_data(df):
-    """Processar dados combinados estado + grau"""
-    if df.empty:
-        return df
-    
-    df['Docentes'] = pd.to_numeric(df['Docentes'], errors='coerce')
-    df = df.dropna().reset_index(drop=True)
-    df['GrauFormacao_Formatado'] = df['GrauFormacao'].apply(format_degree_name)
-    
-    return df
-
-def process_gender_data(df):
-    """Processar dados de gênero"""
-    if df.empty:
-        return df
-    
-    df['Docentes'] = pd.to_numeric(df['Docentes'], errors='coerce')
-    df = df.dropna(subset=['Docentes']).reset_index(drop=True)
-    
-    # Verificar se a coluna 'Sexo' existe, caso contrário tentar encontrar a coluna correta
-    if 'Sexo' not in df.columns:
-        # Procurar por colunas que possam conter dados de gênero
-        gender_columns = [col for col in df.columns if 'gender' in col.lower() or 'sexo' in col.lower()]
-        if gender_columns:
-            df = df.rename(columns={gender_columns[0]: 'Sexo'})
-        else:
-            # Retornar DataFrame vazio se não encontrar coluna de gênero
-            return pd.DataFrame()
-    
-    # Tratar valores nulos na coluna Sexo como "Sem informação"
-    df['Sexo'] = df['Sexo'].fillna('N')  # N = Não informado
-    
-    # Formatar gênero incluindo a nova categoria
-    df['Sexo_Formatado'] = df['Sexo'].map({
-        'M': 'Masculino', 
-        'F': 'Feminino',
-        'N': 'Sem sexo registrado'
-    })
-    
-    # Garantir que valores não mapeados também sejam tratados
-    df['Sexo_Formatado'] = df['Sexo_Formatado'].fillna('Sem sexo registrado')
-    
+    df_fatos, sparql_query = get_fatos_docentes()
+    if df_fatos.empty:
+        return df_fatos, sparql_query
+    return docentes.por_estado_sexo(df_fatos), sparql_query
+
+def get_docentes_cubo_genero():
+    """Cubo estado × gênero com totais, percentuais e razão F/M"""
+    df_fatos, sparql_query = get_fatos_docentes()
+    if df_fatos.empty:
+        return df_fatos, sparql_query
+    return docentes.cubo_estado_sexo(df_fatos), sparql_query
+
+# Rótulo de cada coluna do cubo de gênero nos gráficos
+ROTULOS_COLUNAS_GENERO = {
+    'Masculino': 'Masculino',
+    'Feminino': 'Feminino',
+    'Sem_sexo_registrado': 'Sem sexo registrado',
+    'Pct_Masculino': 'Masculino',
+    'Pct_Feminino': 'Feminino',
+}
+
+@cache.derivado
+def fatiar_cubo_genero(cubo, colunas, valor):
+    """Colunas do cubo de gênero em formato longo, para os gráficos agrupados"""
+    df = cubo.melt(id_vars=['Estado'], value_vars=list(colunas), var_name='Sexo_Formatado', value_name=valor)
+    df['Sexo_Formatado'] = df['Sexo_Formatado'].map(ROTULOS_COLUNAS_GENERO)
     return df
 
 # Interface principal
@@ -261,26 +105,23 @@ page = st.sidebar.radio(
 
 # Botão para recarregar dados
 if st.sidebar.button("🔄 Recarregar Todos os Dados"):
-    st.cache_data.clear()
-    st.rerun()
+    # Os dados atuais continuam sendo exibidos até a atualização terminar
+    cache.revalidar_todos()
+    st.sidebar.success("✅ Atualização iniciada em segundo plano.")
 
 # === PÁGINA: DOCENTES POR ESTADO ===
 if page == "🗺️ Docentes por Estado":
     st.header("🗺️ Distribuição de Docentes por Estado")
     
     # Carregar dados
-    with st.spinner("📊 Carregando dados por estado..."):
-        df_estado_raw, query_estado = get_docentes_por_estado()
-        df_genero_raw, _ = get_docentes_por_sexo()
+    with st.spinner("📊 Carregando dados por estado..."), perfil.secao("Carga de dados"):
+        df_estado, query_estado = get_docentes_por_estado()
+        df_genero, _ = get_docentes_por_sexo()
     
-    if df_estado_raw.empty:
+    if df_estado.empty:
         st.error("❌ Não foi possível carregar os dados por estado.")
         st.stop()
     
-    # Processar dados
-    df_estado = process_estado_data(df_estado_raw)
-    df_genero = process_gender_data(df_genero_raw)
-    
     # Métricas principais
     col1, col2, col3, col4 = st.columns(4)
     
@@ -297,228 +138,193 @@ if page == "🗺️ Docentes por Estado":
     with col4:
         st.metric("📊 Docentes no Líder", f"{int(estado_lider['Docentes']):,}")
     
-    # Filtro por gênero
-    st.subheader("🔧 Filtros")
+    @st.fragment
+    @perfil.fragmento
+    def estados_por_genero(df_estado, df_genero):
+        """Filtro de gênero, ranking, regiões e tabela dos estados"""
+        # Filtro por gênero
+        st.subheader("🔧 Filtros")
     
-    # Verificar se dados de gênero estão disponíveis e válidos
-    genero_disponivel = not df_genero.empty and 'Sexo' in df_genero.columns
+        # Verificar se dados de gênero estão disponíveis e válidos
+        genero_disponivel = not df_genero.empty and 'Sexo' in df_genero.columns
     
-    if genero_disponivel:
-        col1, col2 = st.columns(2)
+        if genero_disponivel:
+            col1, col2 = st.columns(2)
         
-        with col1:
-            filtro_genero = st.selectbox(
-                "Filtrar por gênero:",
-                ["Todos", "Masculino", "Feminino", "Sem sexo registrado"],
-                help="Filtrar a visualização por gênero dos docentes"
-            )
-            mostrar_apenas_com_dados = False
+            with col1:
+                filtro_genero = st.selectbox(
+                    "Filtrar por gênero:",
+                    ["Todos", "Masculino", "Feminino", "Sem sexo registrado"],
+                    help="Filtrar a visualização por gênero dos docentes"
+                )
+                mostrar_apenas_com_dados = False
         
        
-    else:
-        st.warning("⚠️ Dados de gênero não disponíveis para filtragem")
-        filtro_genero = "Todos"
-        mostrar_apenas_com_dados = True
-    
-    # Remover o slider - usar valor fixo máximo de 27
-    top_n_estados = min(27, len(df_estado))
-    
-    # Aplicar filtro de gênero se disponível
-    if filtro_genero != "Todos" and genero_disponivel:
-        try:
-            # Mapear filtro para código usado na base
-            if filtro_genero == "Masculino":
-                genero_code = "M"
-            elif filtro_genero == "Feminino":
-                genero_code = "F"
-            else:  # "Sem sexo registrado"
-                genero_code = "N"
+        else:
+            st.warning("⚠️ Dados de gênero não disponíveis para filtragem")
+            filtro_genero = "Todos"
+            mostrar_apenas_com_dados = True
+    
+        # Remover o slider - usar valor fixo máximo de 27
+        top_n_estados = min(27, len(df_estado))
+    
+        # Aplicar filtro de gênero se disponível
+        if filtro_genero != "Todos" and genero_disponivel:
+            try:
+                # Mapear filtro para código usado na base
+                if filtro_genero == "Masculino":
+                    genero_code = "M"
+                elif filtro_genero == "Feminino":
+                    genero_code = "F"
+                else:  # "Sem sexo registrado"
+                    genero_code = "N"
             
-            # Filtrar dados por gênero
-            df_genero_filtrado = df_genero[df_genero['Sexo'] == genero_code]
+                # Filtrar dados por gênero
+                df_genero_filtrado = df_genero[df_genero['Sexo'] == genero_code]
             
-            if not df_genero_filtrado.empty:
-                # Agrupar por estado
-                df_genero_agrupado = df_genero_filtrado.groupby('Estado')['Docentes'].sum().reset_index()
+                if not df_genero_filtrado.empty:
+                    # Agrupar por estado
+                    df_genero_agrupado = df_genero_filtrado.groupby(['Estado', 'Região'])['Docentes'].sum().reset_index()
                 
-                if mostrar_apenas_com_dados:
-                    # Mostrar apenas estados com dados de gênero
-                    df_filtrado = df_genero_agrupado.sort_values('Docentes', ascending=False).reset_index(drop=True)
-                    df_filtrado['Posição'] = range(1, len(df_filtrado) + 1)
+                    if mostrar_apenas_com_dados:
+                        # Mostrar apenas estados com dados de gênero
+                        df_filtrado = df_genero_agrupado.sort_values('Docentes', ascending=False).reset_index(drop=True)
+                        df_filtrado['Posição'] = range(1, len(df_filtrado) + 1)
                     
-                    if df_filtrado['Docentes'].sum() > 0:
-                        df_filtrado['Percentual'] = (df_filtrado['Docentes'] / df_filtrado['Docentes'].sum() * 100).round(2)
-                    else:
-                        df_filtrado['Percentual'] = 0
-                    
-                    info_msg = f"📊 Mostrando {len(df_filtrado)} estados com dados de {filtro_genero.lower()}"
-                else:
-                    # Mostrar todos os estados, preenchendo com 0 onde não há dados
-                    df_todos_estados = df_estado[['Estado']].copy()
-                    df_filtrado = df_todos_estados.merge(df_genero_agrupado, on='Estado', how='left')
-                    df_filtrado['Docentes'] = df_filtrado['Docentes'].fillna(0)
-                    df_filtrado = df_filtrado.sort_values('Docentes', ascending=False).reset_index(drop=True)
-                    df_filtrado['Posição'] = range(1, len(df_filtrado) + 1)
+                        if df_filtrado['Docentes'].sum() > 0:
+                            df_filtrado['Percentual'] = (df_filtrado['Docentes'] / df_filtrado['Docentes'].sum() * 100).round(2)
+                        else:
+                            df_filtrado['Percentual'] = 0
                     
-                    if df_filtrado['Docentes'].sum() > 0:
-                        df_filtrado['Percentual'] = (df_filtrado['Docentes'] / df_filtrado['Docentes'].sum() * 100).round(2)
+                        info_msg = f"📊 Mostrando {len(df_filtrado)} estados com dados de {filtro_genero.lower()}"
                     else:
-                        df_filtrado['Percentual'] = 0
+                        # Mostrar todos os estados, preenchendo com 0 onde não há dados
+                        df_todos_estados = df_estado[['Estado', 'Região']]
+                        df_filtrado = df_todos_estados.merge(df_genero_agrupado, on=['Estado', 'Região'], how='left')
+                        df_filtrado['Docentes'] = df_filtrado['Docentes'].fillna(0)
+                        df_filtrado = df_filtrado.sort_values('Docentes', ascending=False).reset_index(drop=True)
+                        df_filtrado['Posição'] = range(1, len(df_filtrado) + 1)
                     
-                    estados_com_dados = len(df_filtrado[df_filtrado['Docentes'] > 0])
-                    info_msg = f"📊 Mostrando todos os {len(df_filtrado)} estados ({estados_com_dados} com dados de {filtro_genero.lower()})"
-                
-                # Adicionar coluna de região
-                regioes_map = {
-                    'São Paulo': 'Sudeste', 'Rio de Janeiro': 'Sudeste', 'Minas Gerais': 'Sudeste', 'Espírito Santo': 'Sudeste',
-                    'Rio Grande do Sul': 'Sul', 'Paraná': 'Sul', 'Santa Catarina': 'Sul',
-                    'Bahia': 'Nordeste', 'Pernambuco': 'Nordeste', 'Ceará': 'Nordeste', 'Paraíba': 'Nordeste',
-                    'Maranhão': 'Nordeste', 'Alagoas': 'Nordeste', 'Sergipe': 'Nordeste', 'Rio Grande do Norte': 'Nordeste', 'Piaui': 'Nordeste',
-                    'Goiás': 'Centro-Oeste', 'Mato Grosso': 'Centro-Oeste', 'Mato Grosso do Sul': 'Centro-Oeste', 'Distrito Federal': 'Centro-Oeste',
-                    'Amazonas': 'Norte', 'Pará': 'Norte', 'Acre': 'Norte', 'Rondônia': 'Norte', 'Roraima': 'Norte', 'Amapá': 'Norte', 'Tocantins': 'Norte'
-                }
-
-                df_filtrado['Região'] = df_filtrado['Estado'].map(regioes_map)
-                df_filtrado['Região'] = df_filtrado['Região'].fillna('Outros')
+                        if df_filtrado['Docentes'].sum() > 0:
+                            df_filtrado['Percentual'] = (df_filtrado['Docentes'] / df_filtrado['Docentes'].sum() * 100).round(2)
+                        else:
+                            df_filtrado['Percentual'] = 0
+                    
+                        estados_com_dados = len(df_filtrado[df_filtrado['Docentes'] > 0])
+                        info_msg = f"📊 Mostrando todos os {len(df_filtrado)} estados ({estados_com_dados} com dados de {filtro_genero.lower()})"
                 
-                # Mostrar informação
-                st.success(f"✅ Filtro aplicado: {filtro_genero}")
-                st.info(info_msg)
+                    # Mostrar informação
+                    st.success(f"✅ Filtro aplicado: {filtro_genero}")
+                    st.info(info_msg)
                 
-            else:
-                st.warning(f"⚠️ Nenhum dado encontrado para: {filtro_genero}")
-                df_filtrado = df_estado.copy()
+                else:
+                    st.warning(f"⚠️ Nenhum dado encontrado para: {filtro_genero}")
+                    df_filtrado = df_estado
                 
-        except Exception as e:
-            st.error(f"❌ Erro ao aplicar filtro de gênero: {str(e)}")
-            df_filtrado = df_estado.copy()
-    else:
-        df_filtrado = df_estado.copy()
-    
-    # Gráfico principal - Estados
-    st.subheader(f"🏆 Todos os Estados")
-    
-    top_estados = df_filtrado  # Usar todos os estados em vez de head(top_n_estados)
-    
-    fig_estados = px.bar(
-        top_estados,
-        x='Docentes',
-        y='Estado',
-        orientation='h',
-        color='Docentes',
-        color_continuous_scale='viridis',
-        title=f"Todos os Estados por Número de Docentes" + (f" ({filtro_genero})" if filtro_genero != "Todos" else ""),
-        labels={'Docentes': 'Número de Docentes', 'Estado': 'Estado'},
-        text='Docentes'
-    )
+            except Exception as e:
+                st.error(f"❌ Erro ao aplicar filtro de gênero: {str(e)}")
+                df_filtrado = df_estado
+        else:
+            df_filtrado = df_estado
     
-    fig_estados.update_layout(
-        height=max(800, len(top_estados) * 25),  # Ajustar altura para todos os estados
-        yaxis={'categoryorder': 'total ascending'},
-        showlegend=False
-    )
-    fig_estados.update_traces(texttemplate='%{text}', textposition='outside')
-    
-    st.plotly_chart(fig_estados, use_container_width=True)
-    
-    # Análise regional
-    st.subheader("🌎 Análise por Região")
-    
-    # Mapeamento de estados para regiões (simplificado)
-    regioes_map = {
-        'São Paulo': 'Sudeste', 'Rio de Janeiro': 'Sudeste', 'Minas Gerais': 'Sudeste', 'Espírito Santo': 'Sudeste',
-        'Rio Grande do Sul': 'Sul', 'Paraná': 'Sul', 'Santa Catarina': 'Sul',
-        'Bahia': 'Nordeste', 'Pernambuco': 'Nordeste', 'Ceará': 'Nordeste', 'Paraíba': 'Nordeste',
-        'Maranhão': 'Nordeste', 'Alagoas': 'Nordeste', 'Sergipe': 'Nordeste', 'Rio Grande do Norte': 'Nordeste', 'Piauí': 'Nordeste',
-        'Goiás': 'Centro-Oeste', 'Mato Grosso': 'Centro-Oeste', 'Mato Grosso do Sul': 'Centro-Oeste', 'Distrito Federal': 'Centro-Oeste',
-        'Amazonas': 'Norte', 'Pará': 'Norte', 'Acre': 'Norte', 'Rondônia': 'Norte', 'Roraima': 'Norte', 'Amapá': 'Norte', 'Tocantins': 'Norte'
-    }
-    
-    if not df_filtrado.empty:
-        df_filtrado['Região'] = df_filtrado['Estado'].map(regioes_map)
-        df_filtrado['Região'] = df_filtrado['Região'].fillna('Outros')
-        
-        regiao_stats = df_filtrado.groupby('Região').agg({
-            'Docentes': ['sum', 'count', 'mean']
-        }).round(1)
+        # Gráfico principal - Estados
+        st.subheader(f"🏆 Todos os Estados")
+    
+        top_estados = df_filtrado  # Usar todos os estados em vez de head(top_n_estados)
+    
+        fig_estados = px.bar(
+            top_estados,
+            x='Docentes',
+            y='Estado',
+            orientation='h',
+            color='Docentes',
+            color_continuous_scale='viridis',
+            title=f"Todos os Estados por Número de Docentes" + (f" ({filtro_genero})" if filtro_genero != "Todos" else ""),
+            labels={'Docentes': 'Número de Docentes', 'Estado': 'Estado'},
+            text='Docentes'
+        )
+    
+        fig_estados.update_layout(
+            height=max(800, len(top_estados) * 25),  # Ajustar altura para todos os estados
+            yaxis={'categoryorder': 'total ascending'},
+            showlegend=False
+        )
+        fig_estados.update_traces(texttemplate='%{text}', textposition='outside')
+    
+        perfil.grafico(fig_estados, use_container_width=True)
+    
+        # Análise regional
+        st.subheader("🌎 Análise por Região")
+    
+        if not df_filtrado.empty:
+            regiao_stats = df_filtrado.groupby('Região').agg({
+                'Docentes': ['sum', 'count', 'mean']
+            }).round(1)
         
-        regiao_stats.columns = ['Total Docentes', 'Qtd Estados', 'Média por Estado']
-        regiao_stats = regiao_stats.reset_index().sort_values('Total Docentes', ascending=False)
+            regiao_stats.columns = ['Total Docentes', 'Qtd Estados', 'Média por Estado']
+            regiao_stats = regiao_stats.reset_index().sort_values('Total Docentes', ascending=False)
         
-        col1, col2 = st.columns(2)
+            col1, col2 = st.columns(2)
         
-        with col1:
-            # Gráfico de pizza por região
-            fig_regiao_pie = px.pie(
-                regiao_stats,
-                values='Total Docentes',
-                names='Região',
-                title="Distribuição de Docentes por Região",
-                color_discrete_sequence=px.colors.qualitative.Set3
-            )
-            st.plotly_chart(fig_regiao_pie, use_container_width=True)
+            with col1:
+                # Gráfico de pizza por região
+                fig_regiao_pie = px.pie(
+                    regiao_stats,
+                    values='Total Docentes',
+                    names='Região',
+                    title="Distribuição de Docentes por Região",
+                    color_discrete_sequence=px.colors.qualitative.Set3
+                )
+                perfil.grafico(fig_regiao_pie, use_container_width=True)
         
-        with col2:
-            # Tabela de estatísticas regionais
-            st.markdown("**📊 Estatísticas por Região**")
-            regiao_display = regiao_stats.copy()
-            regiao_display['Total Docentes'] = regiao_display['Total Docentes'].apply(lambda x: f"{int(x):,}")
-            regiao_display['Média por Estado'] = regiao_display['Média por Estado'].apply(lambda x: f"{x:.0f}")
-            
-            st.dataframe(
-                regiao_display,
-                column_config={
-                    'Região': '🌎 Região',
-                    'Total Docentes': '👥 Total',
-                    'Qtd Estados': '🗺️ Estados',
-                    'Média por Estado': '📊 Média'
-                },
-                hide_index=True,
-                use_container_width=True
-            )
-    
-    # Tabela detalhada dos estados
-    st.subheader("📋 Ranking Detalhado dos Estados")
-    
-    display_estados = df_filtrado[['Posição', 'Estado', 'Docentes', 'Percentual']].copy()
-    if 'Região' in df_filtrado.columns:
-        display_estados = df_filtrado[['Posição', 'Estado', 'Região', 'Docentes', 'Percentual']].copy()
-    
-    display_estados['Docentes'] = display_estados['Docentes'].apply(lambda x: f"{int(x):,}")
-    display_estados['Percentual'] = display_estados['Percentual'].apply(lambda x: f"{x:.2f}%")
+            with col2:
+                # Tabela de estatísticas regionais
+                st.markdown("**📊 Estatísticas por Região**")
+                perfil.tabela(
+                    regiao_stats,
+                    column_config={
+                        'Região': '🌎 Região',
+                        'Total Docentes': formatacao.coluna_inteiro('👥 Total'),
+                        'Qtd Estados': '🗺️ Estados',
+                        'Média por Estado': formatacao.coluna_decimal('📊 Média', casas=0)
+                    },
+                    hide_index=True,
+                    use_container_width=True
+                )
     
-    column_config = {
-        'Posição': st.column_config.NumberColumn('🏆 Pos.', width="small"),
-        'Estado': st.column_config.TextColumn('🗺️ Estado'),
-        'Docentes': st.column_config.TextColumn('👥 Docentes', width="medium"),
-        'Percentual': st.column_config.TextColumn('📊 %', width="small")
-    }
+        # Tabela detalhada dos estados
+        st.subheader("📋 Ranking Detalhado dos Estados")
     
-    if 'Região' in display_estados.columns:
-        column_config['Região'] = st.column_config.TextColumn('🌎 Região', width="medium")
+        colunas_estados = ['Posição', 'Estado', 'Docentes', 'Percentual']
+        if 'Região' in df_filtrado.columns:
+            colunas_estados = ['Posição', 'Estado', 'Região', 'Docentes', 'Percentual']
     
-    st.dataframe(
-        display_estados,
-        column_config=column_config,
-        hide_index=True,
-        use_container_width=True
-    )
+        formatacao.mostrar_tabela(
+            df_filtrado,
+            colunas_estados,
+            column_config={
+                'Posição': st.column_config.NumberColumn('🏆 Pos.', width="small"),
+                'Estado': st.column_config.TextColumn('🗺️ Estado'),
+                'Região': st.column_config.TextColumn('🌎 Região', width="medium"),
+                'Docentes': formatacao.coluna_inteiro('👥 Docentes', width="medium"),
+                'Percentual': formatacao.coluna_percentual('📊 %', width="small")
+            }
+        )
+
+    estados_por_genero(df_estado, df_genero)
 
 # === PÁGINA: DOCENTES POR FORMAÇÃO ===
 elif page == "🎓 Docentes por Formação":
     st.header("🎓 Distribuição de Docentes por Grau de Formação")
     
     # Carregar dados
-    with st.spinner("📊 Carregando dados por formação..."):
-        df_degree_raw, query_degree = get_docentes_por_degree()
+    with st.spinner("📊 Carregando dados por formação..."), perfil.secao("Carga de dados"):
+        df_degree, query_degree = get_docentes_por_degree()
     
-    if df_degree_raw.empty:
+    if df_degree.empty:
         st.error("❌ Não foi possível carregar os dados por formação.")
         st.stop()
     
-    # Processar dados
-    df_degree = process_degree_data(df_degree_raw)
-    
     # Métricas principais
     col1, col2, col3, col4 = st.columns(4)
     
@@ -554,7 +360,7 @@ elif page == "🎓 Docentes por Formação":
         )
         fig_degree_bar.update_layout(xaxis_tickangle=-45, showlegend=False)
         fig_degree_bar.update_traces(texttemplate='%{text}', textposition='outside')
-        st.plotly_chart(fig_degree_bar, use_container_width=True)
+        perfil.grafico(fig_degree_bar, use_container_width=True)
     
     with col2:
         # Gráfico de pizza
@@ -565,36 +371,22 @@ elif page == "🎓 Docentes por Formação":
             title="Proporção por Grau de Formação",
             color_discrete_sequence=px.colors.qualitative.Pastel
         )
-        st.plotly_chart(fig_degree_pie, use_container_width=True)
+        perfil.grafico(fig_degree_pie, use_container_width=True)
     
     # Análise detalhada - REMOVIDO "Concentração Acadêmica"
     st.subheader("📈 Análise Detalhada")
     
     st.markdown("**📊 Estatísticas de Distribuição**")
     
-    total_docentes = df_degree['Docentes'].sum()
-    stats_formacao = []
-    
-    for i, row in df_degree.iterrows():
-        stats_formacao.append({
-            'Formação': row['GrauFormacao_Formatado'],
-            'Docentes': f"{int(row['Docentes']):,}",
-            'Percentual': f"{row['Percentual']:.2f}%",
-            'Posição': i + 1
-        })
-    
-    stats_df = pd.DataFrame(stats_formacao)
-    
-    st.dataframe(
-        stats_df,
+    formatacao.mostrar_tabela(
+        df_degree,
+        ['GrauFormacao_Formatado', 'Docentes', 'Percentual', 'Posição'],
         column_config={
             'Posição': st.column_config.NumberColumn('🏆 Pos.', width="small"),
-            'Formação': st.column_config.TextColumn('🎓 Formação'),
-            'Docentes': st.column_config.TextColumn('👥 Docentes', width="medium"),
-            'Percentual': st.column_config.TextColumn('📊 %', width="small")
-        },
-        hide_index=True,
-        use_container_width=True
+            'GrauFormacao_Formatado': st.column_config.TextColumn('🎓 Formação'),
+            'Docentes': formatacao.coluna_inteiro('👥 Docentes', width="medium"),
+            'Percentual': formatacao.coluna_percentual('📊 %', width="small")
+        }
     )
     
     # REMOVIDO "Insights sobre Formação Acadêmica"
@@ -604,16 +396,13 @@ elif page == "📊 Análise Combinada":
     st.header("📊 Análise Combinada: Estado × Grau de Formação")
     
     # Carregar dados
-    with st.spinner("📊 Carregando dados combinados..."):
-        df_combined_raw, query_combined = get_docentes_estado_degree()
+    with st.spinner("📊 Carregando dados combinados..."), perfil.secao("Carga de dados"):
+        df_combined, query_combined = get_docentes_estado_degree()
     
-    if df_combined_raw.empty:
+    if df_combined.empty:
         st.error("❌ Não foi possível carregar os dados combinados.")
         st.stop()
     
-    # Processar dados
-    df_combined = process_combined_data(df_combined_raw)
-    
     # Métricas principais
     col1, col2, col3, col4 = st.columns(4)
     
@@ -629,176 +418,167 @@ elif page == "📊 Análise Combinada":
     with col4:
         st.metric("👥 Total Docentes", f"{int(df_combined['Docentes'].sum()):,}")
     
-    # Filtros
-    st.subheader("🔧 Filtros Interativos")
+    @st.fragment
+    @perfil.fragmento
+    def analise_combinada(df_combined):
+        """Filtros de estado, formação e mínimo, com as análises filtradas"""
+        # Filtros
+        st.subheader("🔧 Filtros Interativos")
     
-    col1, col2, col3 = st.columns(3)
+        col1, col2, col3 = st.columns(3)
     
-    with col1:
-        estados_disponiveis = ['Todos'] + sorted(df_combined['Estado'].unique().tolist())
-        filtro_estado = st.selectbox("Filtrar por Estado:", estados_disponiveis)
+        with col1:
+            estados_disponiveis = ['Todos'] + sorted(df_combined['Estado'].unique().tolist())
+            filtro_estado = st.selectbox("Filtrar por Estado:", estados_disponiveis)
     
-    with col2:
-        formacoes_disponiveis = ['Todos'] + sorted(df_combined['GrauFormacao_Formatado'].unique().tolist())
-        filtro_formacao = st.selectbox("Filtrar por Formação:", formacoes_disponiveis)
+        with col2:
+            formacoes_disponiveis = ['Todos'] + sorted(df_combined['GrauFormacao_Formatado'].unique().tolist())
+            filtro_formacao = st.selectbox("Filtrar por Formação:", formacoes_disponiveis)
     
-    with col3:
-        min_docentes = st.number_input("Mínimo de docentes:", min_value=0, value=0)
+        with col3:
+            min_docentes = st.number_input("Mínimo de docentes:", min_value=0, value=0)
     
-    # Aplicar filtros
-    df_filtrado = df_combined.copy()
+        # Aplicar filtros
+        df_filtrado = df_combined
     
-    if filtro_estado != 'Todos':
-        df_filtrado = df_filtrado[df_filtrado['Estado'] == filtro_estado]
+        if filtro_estado != 'Todos':
+            df_filtrado = df_filtrado[df_filtrado['Estado'] == filtro_estado]
     
-    if filtro_formacao != 'Todos':
-        df_filtrado = df_filtrado[df_filtrado['GrauFormacao_Formatado'] == filtro_formacao]
+        if filtro_formacao != 'Todos':
+            df_filtrado = df_filtrado[df_filtrado['GrauFormacao_Formatado'] == filtro_formacao]
     
-    if min_docentes > 0:
-        df_filtrado = df_filtrado[df_filtrado['Docentes'] >= min_docentes]
+        if min_docentes > 0:
+            df_filtrado = df_filtrado[df_filtrado['Docentes'] >= min_docentes]
     
-    st.info(f"📊 Mostrando {len(df_filtrado)} combinações de {len(df_combined)} totais")
+        st.info(f"📊 Mostrando {len(df_filtrado)} combinações de {len(df_combined)} totais")
     
-    if not df_filtrado.empty:
-        # REMOVIDO "Heatmap Estado × Formação"
+        if not df_filtrado.empty:
+            # REMOVIDO "Heatmap Estado × Formação"
         
-        # Análises específicas baseadas nos filtros
-        if filtro_estado != 'Todos':
-            st.subheader(f"📍 Análise Específica: {filtro_estado}")
+            # Análises específicas baseadas nos filtros
+            if filtro_estado != 'Todos':
+                st.subheader(f"📍 Análise Específica: {filtro_estado}")
             
-            estado_data = df_combined[df_combined['Estado'] == filtro_estado].sort_values('Docentes', ascending=False)
+                estado_data = df_combined[df_combined['Estado'] == filtro_estado].sort_values('Docentes', ascending=False)
             
-            col1, col2 = st.columns(2)
+                col1, col2 = st.columns(2)
             
-            with col1:
-                # Gráfico de barras para o estado específico
-                fig_estado_spec = px.bar(
-                    estado_data,
-                    x='GrauFormacao_Formatado',
-                    y='Docentes',
-                    color='Docentes',
-                    title=f"Docentes por Formação em {filtro_estado}",
-                    color_continuous_scale='plasma'
-                )
-                fig_estado_spec.update_layout(xaxis_tickangle=-45)
-                st.plotly_chart(fig_estado_spec, use_container_width=True)
+                with col1:
+                    # Gráfico de barras para o estado específico
+                    fig_estado_spec = px.bar(
+                        estado_data,
+                        x='GrauFormacao_Formatado',
+                        y='Docentes',
+                        color='Docentes',
+                        title=f"Docentes por Formação em {filtro_estado}",
+                        color_continuous_scale='plasma'
+                    )
+                    fig_estado_spec.update_layout(xaxis_tickangle=-45)
+                    perfil.grafico(fig_estado_spec, use_container_width=True)
             
-            with col2:
-                # Tabela detalhada do estado
-                estado_display = estado_data[['GrauFormacao_Formatado', 'Docentes']].copy()
-                estado_display['Percentual'] = (estado_display['Docentes'] / estado_display['Docentes'].sum() * 100).round(2)
-                estado_display['Docentes'] = estado_display['Docentes'].apply(lambda x: f"{int(x):,}")
-                estado_display['Percentual'] = estado_display['Percentual'].apply(lambda x: f"{x:.2f}%")
+                with col2:
+                    # Tabela detalhada do estado
+                    estado_display = estado_data.assign(
+                        Percentual=(estado_data['Docentes'] / estado_data['Docentes'].sum() * 100).round(2)
+                    )
                 
-                st.dataframe(
-                    estado_display,
-                    column_config={
-                        'GrauFormacao_Formatado': '🎓 Formação',
-                        'Docentes': '👥 Docentes',
-                        'Percentual': '📊 %'
-                    },
-                    hide_index=True,
-                    use_container_width=True
-                )
-        
-        elif filtro_formacao != 'Todos':
-            st.subheader(f"🎓 Análise Específica: {filtro_formacao}")
+                    formatacao.mostrar_tabela(
+                        estado_display,
+                        ['GrauFormacao_Formatado', 'Docentes', 'Percentual'],
+                        column_config={
+                            'GrauFormacao_Formatado': '🎓 Formação',
+                            'Docentes': formatacao.coluna_inteiro('👥 Docentes'),
+                            'Percentual': formatacao.coluna_percentual('📊 %')
+                        }
+                    )
+        
+            elif filtro_formacao != 'Todos':
+                st.subheader(f"🎓 Análise Específica: {filtro_formacao}")
             
-            formacao_data = df_combined[df_combined['GrauFormacao_Formatado'] == filtro_formacao].sort_values('Docentes', ascending=False)
+                formacao_data = df_combined[df_combined['GrauFormacao_Formatado'] == filtro_formacao].sort_values('Docentes', ascending=False)
             
-            col1, col2 = st.columns(2)
+                col1, col2 = st.columns(2)
             
-            with col1:
-                # Gráfico para formação específica - Top 15
-                top_15_formacao = formacao_data.head(15)
-                fig_formacao_spec = px.bar(
-                    top_15_formacao,
-                    x='Docentes',
-                    y='Estado',
-                    orientation='h',
-                    color='Docentes',
-                    title=f"Top 15 Estados com {filtro_formacao}",
-                    color_continuous_scale='viridis'
-                )
-                fig_formacao_spec.update_layout(yaxis={'categoryorder': 'total ascending'})
-                st.plotly_chart(fig_formacao_spec, use_container_width=True)
+                with col1:
+                    # Gráfico para formação específica - Top 15
+                    top_15_formacao = formacao_data.head(15)
+                    fig_formacao_spec = px.bar(
+                        top_15_formacao,
+                        x='Docentes',
+                        y='Estado',
+                        orientation='h',
+                        color='Docentes',
+                        title=f"Top 15 Estados com {filtro_formacao}",
+                        color_continuous_scale='viridis'
+                    )
+                    fig_formacao_spec.update_layout(yaxis={'categoryorder': 'total ascending'})
+                    perfil.grafico(fig_formacao_spec, use_container_width=True)
             
-            with col2:
-                # Tabela detalhada da formação
-                formacao_display = formacao_data.head(15)[['Estado', 'Docentes']].copy()
-                formacao_display['Percentual'] = (formacao_display['Docentes'] / formacao_display['Docentes'].sum() * 100).round(2)
-                formacao_display['Posição'] = range(1, len(formacao_display) + 1)
-                formacao_display['Docentes'] = formacao_display['Docentes'].apply(lambda x: f"{int(x):,}")
-                formacao_display['Percentual'] = formacao_display['Percentual'].apply(lambda x: f"{x:.2f}%")
+                with col2:
+                    # Tabela detalhada da formação
+                    formacao_display = top_15_formacao.assign(
+                        Percentual=(top_15_formacao['Docentes'] / top_15_formacao['Docentes'].sum() * 100).round(2),
+                        Posição=range(1, len(top_15_formacao) + 1)
+                    )
                 
-                st.dataframe(
-                    formacao_display[['Posição', 'Estado', 'Docentes', 'Percentual']],
-                    column_config={
-                        'Posição': '🏆 Pos.',
-                        'Estado': '🗺️ Estado',
-                        'Docentes': '👥 Docentes',
-                        'Percentual': '📊 %'
-                    },
-                    hide_index=True,
-                    use_container_width=True
-                )
-        
-        # Tabela geral filtrada
-        st.subheader("📋 Dados Detalhados (Filtrados)")
-        
-        # Preparar dados para exibição
-        df_display = df_filtrado.copy()
-        df_display = df_display.sort_values('Docentes', ascending=False).head(50)  # Limitar a 50 registros
-        df_display['Docentes'] = df_display['Docentes'].apply(lambda x: f"{int(x):,}")
-        
-        st.dataframe(
-            df_display[['Estado', 'GrauFormacao_Formatado', 'Docentes']],
-            column_config={
-                'Estado': '🗺️ Estado',
-                'GrauFormacao_Formatado': '🎓 Formação',
-                'Docentes': '👥 Docentes'
-            },
-            hide_index=True,
-            use_container_width=True,
-            height=400
-        )
+                    formatacao.mostrar_tabela(
+                        formacao_display,
+                        ['Posição', 'Estado', 'Docentes', 'Percentual'],
+                        column_config={
+                            'Posição': '🏆 Pos.',
+                            'Estado': '🗺️ Estado',
+                            'Docentes': formatacao.coluna_inteiro('👥 Docentes'),
+                            'Percentual': formatacao.coluna_percentual('📊 %')
+                        }
+                    )
+        
+            # Tabela geral filtrada
+            st.subheader("📋 Dados Detalhados (Filtrados)")
+        
+            formatacao.mostrar_tabela(
+                df_filtrado.nlargest(50, 'Docentes'),  # Limitar a 50 registros
+                ['Estado', 'GrauFormacao_Formatado', 'Docentes'],
+                column_config={
+                    'Estado': '🗺️ Estado',
+                    'GrauFormacao_Formatado': '🎓 Formação',
+                    'Docentes': formatacao.coluna_inteiro('👥 Docentes')
+                },
+                height=400
+            )
         
-        # REMOVIDO "Estatísticas dos Dados Filtrados"
+            # REMOVIDO "Estatísticas dos Dados Filtrados"
     
-    else:
-        st.warning("⚠️ Nenhum dado encontrado com os filtros aplicados.")
+        else:
+            st.warning("⚠️ Nenhum dado encontrado com os filtros aplicados.")
+
+    analise_combinada(df_combined)
 
 # === PÁGINA: ANÁLISE POR GÊNERO ===
 elif page == "⚖️ Análise por Gênero":
     st.header("⚖️ Análise de Docentes por Gênero e Estado")
     
     # Carregar dados
-    with st.spinner("📊 Carregando dados por gênero..."):
-        df_genero_raw, query_genero = get_docentes_por_sexo()
-        df_estado_raw, _ = get_docentes_por_estado()
+    with st.spinner("📊 Carregando dados por gênero..."), perfil.secao("Carga de dados"):
+        df_genero, query_genero = get_docentes_por_sexo()
+        cubo_genero, _ = get_docentes_cubo_genero()
     
-    if df_genero_raw.empty:
+    if df_genero.empty:
         st.error("❌ Não foi possível carregar os dados por gênero.")
         st.stop()
     
-    # Processar dados
-    df_genero = process_gender_data(df_genero_raw)
-    df_estado = process_estado_data(df_estado_raw)
-    
-    # Análise geral por gênero
-    genero_total = df_genero.groupby('Sexo_Formatado')['Docentes'].sum().reset_index()
-    genero_total['Percentual'] = (genero_total['Docentes'] / genero_total['Docentes'].sum() * 100).round(2)
+    # Análise geral por gênero: totais das colunas do cubo
+    masculino_total, feminino_total, sem_sexo_total = cubo_genero[docentes.COLUNAS_SEXO].to_numpy().sum(axis=0)
+    total_docentes_genero = masculino_total + feminino_total + sem_sexo_total
+    genero_total = pd.DataFrame({
+        'Sexo_Formatado': ['Masculino', 'Feminino', 'Sem sexo registrado'],
+        'Docentes': [masculino_total, feminino_total, sem_sexo_total]
+    })
     
     # Métricas principais
     st.subheader("📊 Visão Geral por Gênero")
     
     col1, col2, col3, col4 = st.columns(4)
     
-    total_docentes_genero = genero_total['Docentes'].sum()
-    masculino_total = genero_total[genero_total['Sexo_Formatado'] == 'Masculino']['Docentes'].sum()
-    feminino_total = genero_total[genero_total['Sexo_Formatado'] == 'Feminino']['Docentes'].sum()
-    sem_sexo_total = genero_total[genero_total['Sexo_Formatado'] == 'Sem sexo registrado']['Docentes'].sum()
-    
     with col1:
         st.metric("👥 Total Geral", f"{int(total_docentes_genero):,}")
     
@@ -849,7 +629,7 @@ elif page == "⚖️ Análise por Gênero":
             color_discrete_map=cores_customizadas,
             hole=0.4
         )
-        st.plotly_chart(fig_genero_pie, use_container_width=True)
+        perfil.grafico(fig_genero_pie, use_container_width=True)
     
     with col2:
         # Gráfico de barras geral
@@ -864,149 +644,106 @@ elif page == "⚖️ Análise por Gênero":
         )
         fig_genero_bar.update_traces(texttemplate='%{text}', textposition='outside')
         fig_genero_bar.update_layout(showlegend=False)
-        st.plotly_chart(fig_genero_bar, use_container_width=True)
-    
-    # Análise por estado e gênero - REMOVIDO slider
-    st.subheader("🗺️ Distribuição por Estado e Gênero")
-    
-    # Filtros - REMOVIDO slider, manter apenas 27 estados
-    analise_tipo = st.selectbox(
-        "Tipo de análise:",
-        ["Absolutos", "Percentual por Estado", "Razão F/M", "Incluir Sem Registro"]
-    )
-    
-    # Preparar dados para análise por estado
-    pivot_genero = df_genero.pivot_table(
-        index='Estado',
-        columns='Sexo_Formatado',
-        values='Docentes',
-        fill_value=0
-    ).reset_index()
-    
-    # Adicionar colunas calculadas
-    pivot_genero['Masculino'] = pivot_genero.get('Masculino', 0)
-    pivot_genero['Feminino'] = pivot_genero.get('Feminino', 0)
-    pivot_genero['Sem_sexo_registrado'] = pivot_genero.get('Sem sexo registrado', 0)
-    
-    pivot_genero['Total'] = pivot_genero['Masculino'] + pivot_genero['Feminino'] + pivot_genero['Sem_sexo_registrado']
-    pivot_genero['Total_com_genero'] = pivot_genero['Masculino'] + pivot_genero['Feminino']
-    
-    # Calcular percentuais
-    pivot_genero['Pct_Feminino'] = (pivot_genero['Feminino'] / pivot_genero['Total'] * 100).round(2)
-    pivot_genero['Pct_Masculino'] = (pivot_genero['Masculino'] / pivot_genero['Total'] * 100).round(2)
-    pivot_genero['Pct_Sem_registro'] = (pivot_genero['Sem_sexo_registrado'] / pivot_genero['Total'] * 100).round(2)
-    
-    # Calcular razão F/M apenas para quem tem dados de gênero
-    pivot_genero['Razao_F_M'] = (pivot_genero['Feminino'] / pivot_genero['Masculino']).round(3)
-    pivot_genero['Razao_F_M'] = pivot_genero['Razao_F_M'].replace([np.inf, -np.inf], 0).fillna(0)
-    
-    # Selecionar todos os estados em vez de top N
-    top_estados_genero = pivot_genero.sort_values('Total', ascending=False)
-    
-    if analise_tipo == "Absolutos":
-        # Gráfico de barras agrupadas - valores absolutos (apenas M e F)
-        df_plot = df_genero[df_genero['Sexo_Formatado'].isin(['Masculino', 'Feminino'])]
-        
-        fig_genero_estados = px.bar(
-            df_plot,
-            x='Estado',
-            y='Docentes',
-            color='Sexo_Formatado',
-            barmode='group',
-            title=f"Todos os Estados - Docentes por Gênero (Valores Absolutos)",
-            color_discrete_map={'Masculino': '#1f77b4', 'Feminino': '#ff7f0e'}
-        )
-        fig_genero_estados.update_layout(xaxis_tickangle=-45, height=800)
-        st.plotly_chart(fig_genero_estados, use_container_width=True)
-        
-    elif analise_tipo == "Percentual por Estado":
-        # Gráfico de barras empilhadas - percentuais (apenas M e F)
-        df_pct = top_estados_genero.melt(
-            id_vars=['Estado'],
-            value_vars=['Pct_Masculino', 'Pct_Feminino'],
-            var_name='Genero',
-            value_name='Percentual'
+        perfil.grafico(fig_genero_bar, use_container_width=True)
+    
+    @st.fragment
+    @perfil.fragmento
+    def genero_por_estado(cubo_genero):
+        """Tipo de análise e o gráfico de gênero por estado"""
+        # Análise por estado e gênero - REMOVIDO slider
+        st.subheader("🗺️ Distribuição por Estado e Gênero")
+    
+        # Filtros - REMOVIDO slider, manter apenas 27 estados
+        analise_tipo = st.selectbox(
+            "Tipo de análise:",
+            ["Absolutos", "Percentual por Estado", "Razão F/M", "Incluir Sem Registro"]
         )
-        df_pct['Genero'] = df_pct['Genero'].map({
-            'Pct_Masculino': 'Masculino',
-            'Pct_Feminino': 'Feminino'
-        })
-        
-        fig_genero_pct = px.bar(
-            df_pct,
-            x='Estado',
-            y='Percentual',
-            color='Genero',
-            title=f"Todos os Estados - Distribuição Percentual por Gênero",
-            color_discrete_map={'Masculino': '#1f77b4', 'Feminino': '#ff7f0e'},
-            labels={'Percentual': 'Percentual (%)'}
-        )
-        fig_genero_pct.update_layout(xaxis_tickangle=-45, height=800)
-        st.plotly_chart(fig_genero_pct, use_container_width=True)
-        
-    elif analise_tipo == "Razão F/M":
-        # Gráfico de barras - razão feminino/masculino
-        fig_razao = px.bar(
-            top_estados_genero,
-            x='Estado',
-            y='Razao_F_M',
-            color='Razao_F_M',
-            title=f"Todos os Estados - Razão Feminino/Masculino",
-            color_continuous_scale='RdYlBu',
-            labels={'Razao_F_M': 'Razão F/M'}
-        )
-        fig_razao.update_layout(xaxis_tickangle=-45, height=800)
-        fig_razao.add_hline(y=1, line_dash="dash", line_color="red", 
-                           annotation_text="Paridade (1:1)")
-        st.plotly_chart(fig_razao, use_container_width=True)
-        
-    else:  # "Incluir Sem Registro"
-        # Gráfico incluindo todas as categorias (M, F, Sem registro)
-        fig_completo = px.bar(
-            df_genero,
-            x='Estado',
-            y='Docentes',
-            color='Sexo_Formatado',
-            barmode='group',
-            title="Todos os Estados - Docentes por Gênero (Incluindo Sem Registro)",
-            color_discrete_map={
-                'Masculino': '#1f77b4', 
-                'Feminino': '#ff7f0e', 
-                'Sem sexo registrado': '#d62728'
-            }
-        )
-        fig_completo.update_layout(xaxis_tickangle=-45, height=800)
-        st.plotly_chart(fig_completo, use_container_width=True)
+    
+        if analise_tipo == "Absolutos":
+            # Gráfico de barras agrupadas - valores absolutos (apenas M e F)
+            df_plot = fatiar_cubo_genero(cubo_genero, ['Masculino', 'Feminino'], 'Docentes')
+        
+            fig_genero_estados = px.bar(
+                df_plot,
+                x='Estado',
+                y='Docentes',
+                color='Sexo_Formatado',
+                barmode='group',
+                title=f"Todos os Estados - Docentes por Gênero (Valores Absolutos)",
+                color_discrete_map={'Masculino': '#1f77b4', 'Feminino': '#ff7f0e'}
+            )
+            fig_genero_estados.update_layout(xaxis_tickangle=-45, height=800)
+            perfil.grafico(fig_genero_estados, use_container_width=True)
+        
+        elif analise_tipo == "Percentual por Estado":
+            # Gráfico de barras empilhadas - percentuais (apenas M e F)
+            df_pct = fatiar_cubo_genero(cubo_genero, ['Pct_Masculino', 'Pct_Feminino'], 'Percentual')
+        
+            fig_genero_pct = px.bar(
+                df_pct,
+                x='Estado',
+                y='Percentual',
+                color='Sexo_Formatado',
+                title=f"Todos os Estados - Distribuição Percentual por Gênero",
+                color_discrete_map={'Masculino': '#1f77b4', 'Feminino': '#ff7f0e'},
+                labels={'Percentual': 'Percentual (%)'}
+            )
+            fig_genero_pct.update_layout(xaxis_tickangle=-45, height=800)
+            perfil.grafico(fig_genero_pct, use_container_width=True)
+        
+        elif analise_tipo == "Razão F/M":
+            # Gráfico de barras - razão feminino/masculino
+            fig_razao = px.bar(
+                cubo_genero,
+                x='Estado',
+                y='Razao_F_M',
+                color='Razao_F_M',
+                title=f"Todos os Estados - Razão Feminino/Masculino",
+                color_continuous_scale='RdYlBu',
+                labels={'Razao_F_M': 'Razão F/M'}
+            )
+            fig_razao.update_layout(xaxis_tickangle=-45, height=800)
+            fig_razao.add_hline(y=1, line_dash="dash", line_color="red", 
+                               annotation_text="Paridade (1:1)")
+            perfil.grafico(fig_razao, use_container_width=True)
+        
+        else:  # "Incluir Sem Registro"
+            # Gráfico incluindo todas as categorias (M, F, Sem registro)
+            fig_completo = px.bar(
+                fatiar_cubo_genero(cubo_genero, docentes.COLUNAS_SEXO, 'Docentes'),
+                x='Estado',
+                y='Docentes',
+                color='Sexo_Formatado',
+                barmode='group',
+                title="Todos os Estados - Docentes por Gênero (Incluindo Sem Registro)",
+                color_discrete_map={
+                    'Masculino': '#1f77b4', 
+                    'Feminino': '#ff7f0e', 
+                    'Sem sexo registrado': '#d62728'
+                }
+            )
+            fig_completo.update_layout(xaxis_tickangle=-45, height=800)
+            perfil.grafico(fig_completo, use_container_width=True)
+
+    genero_por_estado(cubo_genero)
     
     # Tabela detalhada por estado e gênero - REMOVIDO Razão F/M
     st.subheader("📋 Tabela Detalhada por Estado")
     
-    # Preparar dados para exibição
-    display_genero = top_estados_genero.copy()
-    if 'Masculino' in display_genero.columns and 'Feminino' in display_genero.columns:
-        display_genero['Masculino'] = display_genero['Masculino'].apply(lambda x: f"{int(x):,}")
-        display_genero['Feminino'] = display_genero['Feminino'].apply(lambda x: f"{int(x):,}")
-        display_genero['Sem_sexo_registrado'] = display_genero['Sem_sexo_registrado'].apply(lambda x: f"{int(x):,}")
-        display_genero['Total'] = display_genero['Total'].apply(lambda x: f"{int(x):,}")
-        display_genero['Pct_Feminino'] = display_genero['Pct_Feminino'].apply(lambda x: f"{x:.1f}%")
-        display_genero['Pct_Masculino'] = display_genero['Pct_Masculino'].apply(lambda x: f"{x:.1f}%")
-        display_genero['Pct_Sem_registro'] = display_genero['Pct_Sem_registro'].apply(lambda x: f"{x:.1f}%")
-        
-        st.dataframe(
-            display_genero[['Estado', 'Masculino', 'Feminino', 'Sem_sexo_registrado', 'Total', 'Pct_Masculino', 'Pct_Feminino', 'Pct_Sem_registro']],
-            column_config={
-                'Estado': '🗺️ Estado',
-                'Masculino': '👨 Masculino',
-                'Feminino': '👩 Feminino',
-                'Sem_sexo_registrado': '❓ Sem Registro',
-                'Total': '👥 Total',
-                'Pct_Masculino': '📊 % M',
-                'Pct_Feminino': '📊 % F',
-                'Pct_Sem_registro': '📊 % S/R'
-            },
-            hide_index=True,
-            use_container_width=True
-        )
+    formatacao.mostrar_tabela(
+        cubo_genero,
+        ['Estado', 'Masculino', 'Feminino', 'Sem_sexo_registrado', 'Total', 'Pct_Masculino', 'Pct_Feminino', 'Pct_Sem_registro'],
+        column_config={
+            'Estado': '🗺️ Estado',
+            'Masculino': formatacao.coluna_inteiro('👨 Masculino'),
+            'Feminino': formatacao.coluna_inteiro('👩 Feminino'),
+            'Sem_sexo_registrado': formatacao.coluna_inteiro('❓ Sem Registro'),
+            'Total': formatacao.coluna_inteiro('👥 Total'),
+            'Pct_Masculino': formatacao.coluna_percentual('📊 % M', casas=1),
+            'Pct_Feminino': formatacao.coluna_percentual('📊 % F', casas=1),
+            'Pct_Sem_registro': formatacao.coluna_percentual('📊 % S/R', casas=1)
+        }
+    )
     
     # REMOVIDO "Insights sobre Paridade de Gênero"
 
@@ -1060,17 +797,21 @@ st.sidebar.markdown("---")
 st.sidebar.markdown("### ℹ️ Informações Técnicas")
 st.sidebar.markdown("""
 **🔧 Tecnologias:**
-- SPARQL 1.1 (Consultas Federadas)
-- DbAcademic + DBpedia
+- SPARQL 1.1 no DbAcademic
+- Snapshot semanal de universidades do DBpedia
 - Streamlit + Plotly
-- Cache de 1 hora
+- Cache em memória atualizado em segundo plano
+- Cache em disco (Parquet) por versão do dataset, até 24h
 
 **📊 Dados:**
-- Atualizados em tempo real
+- Atualizados em segundo plano, sem bloquear a página
 - Integração semântica
 - Análise multidimensional
 """)
 
+with perfil.secao("Painel de telemetria"):
+    telemetria.mostrar_painel()
+
 # Rodapé
 st.markdown("---")
 st.markdown("""
@@ -1080,4 +821,6 @@ st.markdown("""
         Dados em tempo real do <strong>DbAcademic</strong> integrados ao <strong>DBpedia</strong>
     </p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+perfil.mostrar_relatorio(page)
@@ -0,0 +1,3 @@
+import pandas as pd
+
+pd.set_option('mode.copy_on_write', True)
@@ -0,0 +1,70 @@
+"""O índice de trigramas encontra as mesmas linhas que a busca de substring linha a linha"""
+
+import random
+
+import numpy as np
+import pandas as pd
+
+from dados.busca import IndiceBusca
+from dados.texto import sem_acentos
+
+PALAVRAS = [
+    'Engenharia', 'Computação', 'COMPUTACAO', 'Ciência', 'ciencia', 'Informática', 'Sistemas',
+    'Informação', 'Produção', 'Elétrica', 'Mecânica', 'São', 'João', 'Paraná', 'Pará', 'Ceará',
+    'Química', 'Física', 'Música', 'Administração', 'de', 'da', 'e', 'A', 'aaa', 'Ação', 'ção',
+]
+
+
+def normalizados(textos):
+    return [sem_acentos(t) if pd.notna(t) else None for t in textos]
+
+
+def bruta(linhas, consulta):
+    """Busca de referência sobre as linhas já normalizadas (consulta vazia: toda linha com texto)"""
+    consulta = sem_acentos(consulta)
+    return np.array([t is not None and consulta in t for t in linhas], dtype=bool)
+
+
+def textos_aleatorios(aleatorio, quantidade):
+    textos = [' '.join(aleatorio.choices(PALAVRAS, k=aleatorio.randint(1, 5))) for _ in range(quantidade)]
+    # Nulos e repetições, como na coluna de uma tabela
+    textos += [None, float('nan'), pd.NA] + aleatorio.sample(textos, quantidade // 4)
+    aleatorio.shuffle(textos)
+    return pd.Series(textos, dtype=object)
+
+
+def consultas_aleatorias(aleatorio, textos, quantidade):
+    validos = [t for t in textos if isinstance(t, str)]
+    consultas = ['', ' ', 'a', 'ç', 'Ç', 'ã', 'ca', 'çã', 'xyz', 'zz', 'ção', 'CAO', 'são joão', 'para']
+    for _ in range(quantidade):
+        texto = aleatorio.choice(validos)
+        inicio = aleatorio.randint(0, len(texto) - 1)
+        trecho = texto[inicio:inicio + aleatorio.randint(1, 12)]
+        # Mesma consulta com outra caixa ou sem acentos
+        consultas.append(aleatorio.choice([trecho, trecho.upper(), trecho.lower(), sem_acentos(trecho)]))
+    return consultas
+
+
+def test_indice_igual_a_busca_bruta():
+    aleatorio = random.Random(7)
+    textos = textos_aleatorios(aleatorio, 3000)
+    indice = IndiceBusca(textos)
+    linhas = normalizados(textos)
+
+    for consulta in consultas_aleatorias(aleatorio, textos, 500):
+        np.testing.assert_array_equal(indice.contem(consulta), bruta(linhas, consulta), err_msg=repr(consulta))
+
+
+def test_poucos_valores_e_consultas_mais_longas_que_os_textos():
+    textos = pd.Series(['Pará', 'PARANÁ', None, 'ab', 'Pará'])
+    indice = IndiceBusca(textos)
+
+    for consulta in ['pa', 'para', 'PARA', 'paraná', 'paranaense', 'b', 'ab', 'abc']:
+        np.testing.assert_array_equal(indice.contem(consulta), bruta(normalizados(textos), consulta),
+                                      err_msg=consulta)
+
+
+def test_mascara_compartilhada_e_somente_leitura():
+    indice = IndiceBusca(pd.Series(['Medicina', 'Direito']))
+    assert indice.contem('med') is indice.contem('med')
+    assert not indice.contem('med').flags.writeable
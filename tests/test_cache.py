@@ -0,0 +1,99 @@
+"""Cache em disco: validade por versão e por TTL, remoção das entradas menos usadas"""
+
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from dados import cache
+
+CONSULTA = 'SELECT ?s WHERE { ?s ?p ?o }'
+
+
+@pytest.fixture(autouse=True)
+def diretorio(monkeypatch, tmp_path):
+    monkeypatch.setattr(cache, 'DIRETORIO_CONSULTAS', str(tmp_path))
+    return tmp_path
+
+
+def tabela(linhas=1):
+    return pd.DataFrame({'s': [f'http://exemplo/{i}' for i in range(linhas)]})
+
+
+def envelhecer(caminho, segundos, acesso=None):
+    """Recua a criação (mtime) e, se dado, o último acesso (atime) da entrada"""
+    agora = time.time()
+    os.utime(caminho, (agora - (acesso if acesso is not None else segundos), agora - segundos))
+
+
+def test_grava_e_le_pela_consulta_normalizada_e_versao():
+    cache.gravar(CONSULTA, 'v1', tabela(3))
+
+    lido = cache.ler('SELECT ?s\n  WHERE {  ?s ?p ?o }', 'v1')
+    pd.testing.assert_frame_equal(lido, tabela(3))
+    assert cache.ler(CONSULTA, 'v2') is None
+
+
+def test_entrada_mais_velha_que_o_ttl_expira_e_sai_do_disco(monkeypatch):
+    monkeypatch.setattr(cache, 'TTL', 60)
+    cache.gravar(CONSULTA, 'v1', tabela())
+    caminho = cache._caminho(CONSULTA, 'v1')
+
+    envelhecer(caminho, 30)
+    assert cache.ler(CONSULTA, 'v1') is not None
+
+    envelhecer(caminho, 61)
+    assert cache.ler(CONSULTA, 'v1') is None
+    assert not os.path.exists(caminho)
+
+
+def test_leitura_marca_o_acesso_sem_mudar_a_criacao():
+    cache.gravar(CONSULTA, 'v1', tabela())
+    caminho = cache._caminho(CONSULTA, 'v1')
+    envelhecer(caminho, 100)
+    criado_em = os.path.getmtime(caminho)
+
+    cache.ler(CONSULTA, 'v1')
+    assert os.path.getmtime(caminho) == criado_em
+    assert os.path.getatime(caminho) > time.time() - 5
+
+
+def test_ignorando_disco_nao_le_a_entrada():
+    cache.gravar(CONSULTA, 'v1', tabela())
+    with cache.ignorando_disco():
+        assert cache.ler(CONSULTA, 'v1') is None
+    assert cache.ler(CONSULTA, 'v1') is not None
+
+
+def test_acima_do_limite_remove_as_menos_acessadas(monkeypatch):
+    consultas = [f'{CONSULTA} LIMIT {i}' for i in range(4)]
+    for consulta in consultas:
+        cache.gravar(consulta, 'v1', tabela(50))
+    caminhos = [cache._caminho(consulta, 'v1') for consulta in consultas]
+    tamanho = os.path.getsize(caminhos[0])
+
+    # Acessos do mais antigo ao mais recente: 2, 0, 3, 1
+    for caminho, acesso in zip(caminhos, [300, 100, 400, 200]):
+        envelhecer(caminho, 10, acesso=acesso)
+
+    monkeypatch.setattr(cache, 'TAMANHO_MAXIMO', 2 * tamanho + tamanho // 2)
+    cache._remover_excedente()
+
+    assert [os.path.exists(c) for c in caminhos] == [False, True, False, True]
+
+
+def test_gravar_aplica_o_limite_e_mantem_a_entrada_nova(monkeypatch):
+    cache.gravar(f'{CONSULTA} LIMIT 1', 'v1', tabela(50))
+    antiga = cache._caminho(f'{CONSULTA} LIMIT 1', 'v1')
+    envelhecer(antiga, 10, acesso=100)
+    monkeypatch.setattr(cache, 'TAMANHO_MAXIMO', os.path.getsize(antiga) + os.path.getsize(antiga) // 2)
+
+    cache.gravar(CONSULTA, 'v1', tabela(50))
+    assert not os.path.exists(antiga)
+    assert cache.ler(CONSULTA, 'v1') is not None
+
+
+def test_gravacao_nao_deixa_temporarios(diretorio):
+    cache.gravar(CONSULTA, 'v1', tabela())
+    assert [p.suffix for p in diretorio.iterdir()] == ['.parquet']
@@ -0,0 +1,91 @@
+"""As agregações de docentes contam cada docente uma vez por grupo, como COUNT(DISTINCT ?s)"""
+
+import random
+
+import pandas as pd
+import pytest
+
+from dados import cache, dbpedia, docentes
+from dados.rotulos import ROTULOS_GRAU, ROTULOS_SEXO
+
+UNIVERSIDADES = pd.DataFrame({
+    'url_pt': ['http://ufma', 'http://uema', 'http://ufpi', 'http://usp'],
+    'Universidade': ['UFMA', 'UEMA', 'UFPI', 'USP'],
+    'Estado': ['Maranhão', 'Maranhão', 'Piauí', 'São Paulo'],
+    'UF': ['MA', 'MA', 'PI', 'SP'],
+    'Região': ['Nordeste', 'Nordeste', 'Nordeste', 'Sudeste'],
+})
+ESTADO = dict(zip(UNIVERSIDADES['url_pt'], UNIVERSIDADES['Estado']))
+
+
+def professores_aleatorios(quantidade):
+    """Vínculos de cada docente: às vezes nenhum, às vezes vários"""
+    aleatorio = random.Random(3)
+    tamanhos = [0, 1, 1, 1, 1, 2]
+    return [
+        (
+            set(aleatorio.sample(list(ESTADO), aleatorio.choice(tamanhos))),
+            set(aleatorio.sample(list(ROTULOS_GRAU), aleatorio.choice(tamanhos))),
+            set(aleatorio.sample(['M', 'F'], aleatorio.choice([0, 1, 1, 1]))),
+        )
+        for _ in range(quantidade)
+    ]
+
+
+def resposta(professores):
+    """O que a consulta de fatos devolve: docentes por combinação"""
+    linhas = pd.DataFrame([
+        {'Universidades': ' '.join(sorted(u)), 'Graus': ' '.join(sorted(g)), 'Sexos': ' '.join(sorted(s))}
+        for u, g, s in professores
+    ])
+    return linhas.value_counts().rename('Docentes').reset_index()
+
+
+def contar(professores, chaves):
+    """Contagem de referência: docentes distintos por grupo"""
+    contagem = {}
+    for numero, professor in enumerate(professores):
+        for grupo in set(chaves(*professor)):
+            contagem.setdefault(grupo, set()).add(numero)
+    return {grupo: len(membros) for grupo, membros in contagem.items()}
+
+
+@pytest.fixture
+def professores(monkeypatch):
+    professores = professores_aleatorios(2000)
+    monkeypatch.setattr(docentes, 'executar_consulta', lambda *args, **kwargs: resposta(professores))
+    monkeypatch.setattr(docentes, 'get_universidades', lambda: UNIVERSIDADES)
+    monkeypatch.setattr(dbpedia, 'get_universidades', lambda: UNIVERSIDADES)
+    cache.limpar_memoria()
+    yield professores
+    cache.limpar_memoria()
+
+
+def test_por_estado(professores):
+    df = docentes.por_estado(docentes.get_fatos_docentes())
+    esperado = contar(professores, lambda u, g, s: (ESTADO[x] for x in u))
+    assert dict(zip(df['Estado'], df['Docentes'])) == esperado
+
+
+def test_por_grau(professores):
+    df = docentes.por_grau(docentes.get_fatos_docentes())
+    esperado = contar(professores, lambda u, g, s: g)
+    assert dict(zip(df['GrauFormacao'], df['Docentes'])) == esperado
+
+
+def test_por_estado_grau(professores):
+    df = docentes.por_estado_grau(docentes.get_fatos_docentes())
+    esperado = contar(professores, lambda u, g, s: ((ESTADO[x], y) for x in u for y in g))
+    assert dict(zip(zip(df['Estado'], df['GrauFormacao']), df['Docentes'])) == esperado
+
+
+def test_por_estado_sexo_e_cubo(professores):
+    fatos = docentes.get_fatos_docentes()
+    esperado = contar(professores, lambda u, g, s: ((ESTADO[x], y) for x in u for y in (s or {'N'})))
+
+    df = docentes.por_estado_sexo(fatos)
+    assert dict(zip(zip(df['Estado'], df['Sexo']), df['Docentes'])) == esperado
+
+    cubo = docentes.cubo_estado_sexo(fatos).set_index('Estado')
+    for (estado, sexo), quantidade in esperado.items():
+        assert cubo.loc[estado, docentes.COLUNAS_SEXO[list(ROTULOS_SEXO).index(sexo)]] == quantidade
@@ -0,0 +1,75 @@
+"""Quem segura uma carga não pode esperar pelo pool que está esperando por ela"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dados import cache, executor
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Pool pequeno e descartável; ao fim, cancela o que tiver ficado na fila"""
+    pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='teste')
+    monkeypatch.setattr(executor, '_pool', pool)
+    cache.limpar_memoria()
+    yield pool
+    # Destrava a carga se o teste falhar com o processo travado
+    pool.shutdown(wait=False, cancel_futures=True)
+    cache.limpar_memoria()
+
+
+def test_primeira_carga_nao_espera_pelo_pool_ocupado(pool):
+    dentro = threading.Event()
+    pronto = threading.Event()
+
+    @cache.servir_e_revalidar
+    def tabela():
+        dentro.set()
+        pronto.wait(5)
+        return executor.executar_em_paralelo([lambda: 1, lambda: 2])
+
+    carga = threading.Thread(target=tabela, daemon=True)
+    carga.start()
+    assert dentro.wait(5)
+
+    # Outras sessões pedem a mesma tabela pelo pool e ocupam todas as threads
+    esperando = [pool.submit(executor._preparar(tabela)) for _ in range(2)]
+    time.sleep(0.2)
+    pronto.set()
+
+    carga.join(5)
+    assert not carga.is_alive()
+    assert [f.result(5) for f in esperando] == [[1, 2], [1, 2]]
+
+
+def test_snapshot_do_dbpedia_nao_espera_pelo_pool_ocupado(pool, monkeypatch):
+    from dados import dbpedia
+
+    dentro = threading.Event()
+    pronto = threading.Event()
+
+    def construir():
+        dentro.set()
+        pronto.wait(5)
+        return executor.executar_em_paralelo([lambda: 1, lambda: 2])
+
+    monkeypatch.setattr(dbpedia, 'construir_snapshot', construir)
+    monkeypatch.setattr(dbpedia, '_universidades', None)
+    monkeypatch.setattr(dbpedia, '_salvar', lambda df, caminho: None)
+    monkeypatch.setattr(dbpedia, 'construir_dimensao', lambda df: df)
+    monkeypatch.setattr(dbpedia, 'ARQUIVO_UNIVERSIDADES', '/nao/existe.csv')
+
+    carga = threading.Thread(target=dbpedia.get_universidades, daemon=True)
+    carga.start()
+    assert dentro.wait(5)
+
+    esperando = [pool.submit(executor._preparar(dbpedia.get_universidades)) for _ in range(2)]
+    time.sleep(0.2)
+    pronto.set()
+
+    carga.join(5)
+    assert not carga.is_alive()
+    assert [f.result(5) for f in esperando] == [[1, 2], [1, 2]]
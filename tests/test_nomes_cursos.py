@@ -0,0 +1,86 @@
+"""Chaves canônicas, nomes de exibição e famílias dos cursos"""
+
+import pandas as pd
+import pytest
+
+from dados import nomes_cursos
+from dados.nomes_cursos import canonizar, chave_curso, familias
+
+
+@pytest.fixture(autouse=True)
+def tabela_temporaria(monkeypatch, tmp_path):
+    """Tabela de chaves em disco vazia, em pasta temporária"""
+    monkeypatch.setattr(nomes_cursos, 'ARQUIVO_CHAVES', str(tmp_path / 'nomes_cursos.parquet'))
+    monkeypatch.setattr(nomes_cursos, '_chaves', None)
+
+
+@pytest.mark.parametrize('nome', [
+    'ENGENHARIA DE COMPUTAÇÃO',
+    'Engenharia da Computação',
+    'ENG. COMPUTACAO',
+    '  engenharia  de   computação ',
+    'Eng. de Comp.',
+])
+def test_grafias_do_mesmo_curso_tem_a_mesma_chave(nome):
+    assert chave_curso(nome) == 'engenharia computacao'
+
+
+def test_cursos_diferentes_tem_chaves_diferentes():
+    assert chave_curso('Engenharia Civil') != chave_curso('Engenharia de Computação')
+    assert chave_curso('Ciência da Computação') != chave_curso('Engenharia de Computação')
+
+
+def test_canonizar_mantem_nulos_nas_duas_colunas():
+    serie = pd.Series(['Medicina', None, 'MEDICINA', float('nan')], index=[10, 11, 12, 13])
+    chave, nome = canonizar(serie)
+
+    assert chave.index.equals(serie.index) and nome.index.equals(serie.index)
+    assert chave.isna().tolist() == [False, True, False, True]
+    assert nome.isna().tolist() == [False, True, False, True]
+    assert chave[10] == chave[12] == 'medicina'
+
+
+def test_nome_de_exibicao_e_a_grafia_mais_frequente():
+    serie = pd.Series([
+        'ENG. COMPUTACAO',
+        'Engenharia de Computação', 'Engenharia de Computação',
+        'ENGENHARIA DE COMPUTAÇÃO',
+        'Direito', 'DIREITO', 'DIREITO',
+    ])
+    _, nome = canonizar(serie)
+
+    assert set(nome[:4]) == {'Engenharia de Computação'}
+    assert set(nome[4:]) == {'DIREITO'}
+
+
+def test_empate_fica_com_a_grafia_que_aparece_primeiro():
+    _, nome = canonizar(pd.Series(['Engenharia da Computação', 'ENG. COMPUTACAO']))
+    assert nome.tolist() == ['Engenharia da Computação', 'Engenharia da Computação']
+
+
+def test_chaves_calculadas_sao_reaproveitadas_do_disco(monkeypatch):
+    canonizar(pd.Series(['Medicina']))
+    monkeypatch.setattr(nomes_cursos, '_chaves', None)
+    monkeypatch.setattr(nomes_cursos, 'chave_curso', lambda nome: pytest.fail(f'recalculou {nome}'))
+
+    chave, _ = canonizar(pd.Series(['Medicina']))
+    assert chave.tolist() == ['medicina']
+
+
+def test_familias_por_trecho_de_chave():
+    chaves = [chave_curso(n) for n in [
+        'Engenharia de Computação', 'Engenharia Civil', 'Ciência da Computação',
+        'Sistemas de Informação', 'Medicina', 'Engenharia de Software',
+    ]]
+    tabela = familias(chaves)
+
+    assert tabela.index.tolist() == chaves
+    assert tabela['Engenharia'].tolist() == [True, True, False, False, False, True]
+    assert tabela['Engenharia de Computação'].tolist() == [True, False, False, False, False, False]
+    assert tabela['Computação'].tolist() == [True, False, True, True, False, True]
+
+
+def test_familia_exige_palavras_inteiras():
+    # 'computacional' não é 'computacao'; 'informatica' vale só como palavra inteira
+    tabela = familias([chave_curso('Física Computacional'), chave_curso('Bioinformática')])
+    assert not tabela['Computação'].any()
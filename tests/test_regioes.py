@@ -0,0 +1,54 @@
+"""O classificador por regex dá a mesma região que a varredura de palavras-chave original"""
+
+import itertools
+import random
+
+import pandas as pd
+
+from dados.regioes import NAO_IDENTIFICADO, PALAVRAS_POR_REGIAO, ClassificadorRegiao
+
+PALAVRAS = [p for palavras in PALAVRAS_POR_REGIAO.values() for p in palavras]
+
+
+def varredura(nome):
+    """Classificação original: primeira região com alguma palavra contida no nome"""
+    if pd.isna(nome):
+        return NAO_IDENTIFICADO
+    minusculo = nome.lower()
+    for regiao, palavras in PALAVRAS_POR_REGIAO.items():
+        if any(palavra in minusculo for palavra in palavras):
+            return regiao
+    return NAO_IDENTIFICADO
+
+
+def conferir(nomes):
+    nomes = pd.Series(nomes, dtype=object)
+    obtido = ClassificadorRegiao(PALAVRAS_POR_REGIAO).classificar_serie(nomes)
+    esperado = nomes.map(varredura)
+    divergentes = nomes[obtido != esperado]
+    assert divergentes.empty, list(zip(divergentes, obtido[divergentes.index], esperado[divergentes.index]))
+
+
+def test_cada_palavra_sozinha_e_no_meio_de_um_nome():
+    conferir(PALAVRAS + [f'Universidade {p.upper()} - Campus Sede' for p in PALAVRAS])
+
+
+def test_pares_de_palavras_de_regioes_diferentes_respeitam_a_prioridade():
+    # Nomes que casam com duas regiões: vence a primeira de PALAVRAS_POR_REGIAO
+    conferir([f'{a} {b}' for a, b in itertools.permutations(PALAVRAS, 2)])
+
+
+def test_trechos_aleatorios_de_palavras():
+    aleatorio = random.Random(11)
+    nomes = []
+    for _ in range(5000):
+        partes = []
+        for palavra in aleatorio.sample(PALAVRAS, aleatorio.randint(1, 3)):
+            inicio = aleatorio.randint(0, len(palavra) - 1)
+            partes.append(palavra[inicio:aleatorio.randint(inicio + 1, len(palavra))])
+        nomes.append(aleatorio.choice(['', ' ', '-']).join(partes))
+    conferir(nomes)
+
+
+def test_nulos_e_nomes_sem_palavra_chave():
+    conferir([None, float('nan'), '', 'Instituto Tecnológico de Aeronáutica', 'MIT'])
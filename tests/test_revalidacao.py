@@ -0,0 +1,143 @@
+"""Atualizações forçadas precisam chegar ao endpoint, inclusive pelo pool de consultas"""
+
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from dados import aquecedor, cache, cursos, dataset, dbpedia, docentes, offline
+from dados.executor import executar_em_paralelo
+
+UNIVERSIDADES = pd.DataFrame({
+    'url_pt': ['http://ufma'], 'Universidade': ['UFMA'], 'Estado': ['Maranhão'],
+    'UF': ['MA'], 'Região': ['Nordeste'],
+})
+
+
+@pytest.fixture
+def endpoint(monkeypatch, tmp_path):
+    """Endpoint falso que conta as consultas; cache em disco em pasta temporária"""
+    chamadas = []
+
+    def consultar(url, sparql_query):
+        chamadas.append(sparql_query)
+        return pd.DataFrame({'Universidades': ['http://ufma'], 'Graus': ['Doutorado'],
+                             'Sexos': ['F'], 'Docentes': [len(chamadas)]})
+
+    monkeypatch.setattr(cache, 'DIRETORIO_CONSULTAS', str(tmp_path))
+    monkeypatch.setattr(offline, 'ativo', lambda: False)
+    monkeypatch.setattr(dataset, 'endpoint_sparql', lambda: 'http://endpoint.local/sparql')
+    monkeypatch.setattr(dataset, 'consultar_endpoint', consultar)
+    monkeypatch.setattr(docentes, 'get_universidades', lambda: UNIVERSIDADES)
+    monkeypatch.setattr(dbpedia, 'get_universidades', lambda: UNIVERSIDADES)
+    cache.limpar_memoria()
+    yield chamadas
+    cache.limpar_memoria()
+
+
+@pytest.fixture
+def data_world(monkeypatch, tmp_path):
+    """data.world falso com versão controlada pelo teste; conta as consultas"""
+    chamadas = []
+    versao = ['2026-01-01']
+
+    def query(dataset_id, sparql_query, query_type):
+        chamadas.append(sparql_query)
+        df = pd.DataFrame({'Universidades': ['http://ufma'], 'Graus': ['Doutorado'],
+                           'Sexos': ['F'], 'Docentes': [len(chamadas)]})
+        return SimpleNamespace(dataframe=df, raw_data=df.to_dict('split'))
+
+    monkeypatch.setattr(cache, 'DIRETORIO_CONSULTAS', str(tmp_path))
+    monkeypatch.setattr(offline, 'ativo', lambda: False)
+    monkeypatch.setattr(dataset, 'endpoint_sparql', lambda: '')
+    monkeypatch.setattr(dataset, 'versao_dataset', lambda: versao[0])
+    monkeypatch.setattr(aquecedor, 'versao_dataset', lambda: versao[0])
+    monkeypatch.setattr(dataset, 'garantir_dataset', lambda: None)
+    monkeypatch.setattr(dataset.dw, 'query', query)
+    monkeypatch.setattr(docentes, 'get_universidades', lambda: UNIVERSIDADES)
+    monkeypatch.setattr(dbpedia, 'get_universidades', lambda: UNIVERSIDADES)
+    cache.limpar_memoria()
+    yield SimpleNamespace(chamadas=chamadas, versao=versao)
+    cache.limpar_memoria()
+
+
+@pytest.fixture
+def aquecedor_so_docentes(monkeypatch):
+    """Aquecedor reduzido à tabela de fatos dos docentes"""
+    monkeypatch.setattr(aquecedor, '_tarefas', lambda: [])
+    monkeypatch.setattr(aquecedor, 'get_universidades', lambda: UNIVERSIDADES)
+    monkeypatch.setattr(cursos, 'get_fatos_cursos', lambda: None)
+    monkeypatch.setattr(aquecedor, '_versao_aquecida', None)
+
+
+def test_pool_herda_ignorando_disco(endpoint):
+    consulta = 'SELECT ?s WHERE { ?s ?p ?o }'
+    dataset.executar_consulta(consulta)
+    assert len(endpoint) == 1
+
+    with cache.ignorando_disco():
+        executar_em_paralelo([lambda: dataset.executar_consulta(consulta), lambda: None])
+    assert len(endpoint) == 2
+
+
+def test_recarga_forcada_dos_fatos_consulta_o_endpoint(endpoint):
+    docentes.get_fatos_docentes()
+    assert len(endpoint) == 1
+
+    # Mesmo caminho de cache._revalidar, dos botões de recarga e do --forcar
+    with cache.ignorando_disco():
+        df = docentes.get_fatos_docentes.__wrapped__()
+    assert len(endpoint) == 2
+    assert df['Docentes'].tolist() == [2]
+
+
+def test_revalidar_todos_esperando_atualiza_antes_da_idade_maxima(endpoint):
+    primeira = docentes.get_fatos_docentes()
+    assert len(endpoint) == 1
+
+    cache.revalidar_todos(esperar=True)
+    assert len(endpoint) == 2
+    assert docentes.get_fatos_docentes() is not primeira
+
+
+def test_aquecedor_no_endpoint_sempre_revalida_no_endpoint(endpoint, aquecedor_so_docentes):
+    aquecedor.aquecer()
+    assert len(endpoint) == 1
+
+    aquecedor.aquecer(revalidar=True)
+    assert len(endpoint) == 2
+
+
+def test_aquecedor_no_data_world_so_ignora_o_disco_com_versao_nova(data_world, aquecedor_so_docentes):
+    aquecedor.aquecer()
+    assert len(data_world.chamadas) == 1
+
+    # Mesma versão: a tabela é recarregada do disco, sem consultar o data.world
+    primeira = docentes.get_fatos_docentes()
+    aquecedor.aquecer(revalidar=True)
+    assert len(data_world.chamadas) == 1
+    assert docentes.get_fatos_docentes() is not primeira
+
+    data_world.versao[0] = '2026-02-01'
+    aquecedor.aquecer(revalidar=True)
+    assert len(data_world.chamadas) == 2
+    assert docentes.get_fatos_docentes()['Docentes'].tolist() == [2]
+
+
+def test_falha_nos_metadados_nao_repete_a_verificacao(monkeypatch):
+    verificacoes = []
+
+    class ClienteForaDoAr:
+        def get_dataset(self, dataset_id):
+            verificacoes.append(dataset_id)
+            raise ConnectionError('data.world fora do ar')
+
+    monkeypatch.setattr(offline, 'ativo', lambda: False)
+    monkeypatch.setattr(dataset, 'endpoint_sparql', lambda: '')
+    monkeypatch.setattr(dataset.dw, 'api_client', ClienteForaDoAr)
+    monkeypatch.setattr(dataset, '_versao_remota', None)
+    monkeypatch.setattr(dataset, '_ultima_verificacao', None)
+
+    assert dataset.versao_dataset() is None
+    assert dataset.versao_dataset() is None
+    assert len(verificacoes) == 1
@@ -0,0 +1,31 @@
+"""As respostas sintéticas dos benchmarks são estáveis e cobrem todas as consultas"""
+
+import json
+
+import pandas as pd
+
+from benchmarks import sinteticas
+from benchmarks.endpoint import Respostas
+from dados.dataset import ler_resultados_json
+from dados.dbpedia import TAMANHO_LOTE
+
+
+def test_mesma_semente_gera_as_mesmas_respostas(tmp_path):
+    primeiro = sinteticas.gerar(tmp_path / 'a', universidades=TAMANHO_LOTE + 10, cursos=500)
+    segundo = sinteticas.gerar(tmp_path / 'b', universidades=TAMANHO_LOTE + 10, cursos=500)
+    assert primeiro == segundo
+    for item in primeiro:
+        pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / 'a' / item['arquivo']),
+                                      pd.read_parquet(tmp_path / 'b' / item['arquivo']))
+
+
+def test_lotes_do_dbpedia_cobrem_todas_as_universidades(tmp_path):
+    indice = sinteticas.gerar(tmp_path, universidades=TAMANHO_LOTE + 10, cursos=500)
+    respostas = Respostas(tmp_path)
+
+    lotes = [item for item in indice if 'dbpedia.org/property' in item['consulta']]
+    assert len(lotes) == 2
+    urls = pd.concat([
+        ler_resultados_json(json.loads(respostas.responder(item['consulta'])))['url_eng'] for item in lotes
+    ])
+    assert urls.is_unique and len(urls) == TAMANHO_LOTE + 10